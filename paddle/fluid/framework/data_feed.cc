@@ -1327,6 +1327,200 @@ bool MultiSlotInMemoryDataFeed::ParseOneInstance(Record* instance) {
   return false;
 }
 
+#ifdef _LINUX
+// Reads records of MultiSlotBinaryDataFeed and
+// MultiSlotBinaryInMemoryDataFeed, see the format in data_feed.h.
+class MultiSlotBinaryReader {
+ public:
+  bool ReadRecord(FILE* fp) {
+    uint32_t record_bytes = 0;
+    if (fread_unlocked(&record_bytes, sizeof(record_bytes), 1, fp) != 1) {
+      return false;
+    }
+    buffer_.resize(record_bytes);
+    size_t read_bytes = fread_unlocked(buffer_.data(), 1, record_bytes, fp);
+    PADDLE_ENFORCE_EQ(
+        read_bytes,
+        static_cast<size_t>(record_bytes),
+        platform::errors::InvalidArgument(
+            "The binary record is truncated, expect %d bytes but got %d "
+            "bytes, please check the output of data generator.",
+            record_bytes,
+            read_bytes));
+    pos_ = 0;
+    return true;
+  }
+
+  // Returns the address of feasigns of the next slot, and sets the type and
+  // number of them.
+  const char* ReadSlot(char* type, uint32_t* num) {
+    PADDLE_ENFORCE_LE(
+        pos_ + kSlotHeaderBytes,
+        buffer_.size(),
+        platform::errors::InvalidArgument(
+            "The binary record has less slots than the data feed, please "
+            "check use_var of dataset and the output of data generator."));
+    *type = buffer_[pos_];
+    memcpy(num, &buffer_[pos_ + 1], sizeof(uint32_t));
+    PADDLE_ENFORCE_EQ(
+        *type == 'u' || *type == 'f',
+        true,
+        platform::errors::InvalidArgument(
+            "The feasign type of binary record should be 'u' or 'f', but "
+            "got %d.",
+            static_cast<int>(*type)));
+    PADDLE_ENFORCE_NE(
+        *num,
+        0,
+        platform::errors::InvalidArgument(
+            "The number of ids can not be zero, you need padding "
+            "it in data generator."));
+    size_t feasign_bytes = *type == 'f' ? sizeof(float) : sizeof(uint64_t);
+    size_t end = pos_ + kSlotHeaderBytes + feasign_bytes * (*num);
+    PADDLE_ENFORCE_LE(
+        end,
+        buffer_.size(),
+        platform::errors::InvalidArgument(
+            "The binary record is broken, the slot has %d feasigns but the "
+            "record has only %d bytes left.",
+            *num,
+            buffer_.size() - pos_ - kSlotHeaderBytes));
+    const char* feasigns = &buffer_[pos_ + kSlotHeaderBytes];
+    pos_ = end;
+    return feasigns;
+  }
+
+  void CheckFinished() const {
+    PADDLE_ENFORCE_EQ(
+        pos_,
+        buffer_.size(),
+        platform::errors::InvalidArgument(
+            "The binary record has more slots than the data feed, please "
+            "check use_var of dataset and the output of data generator."));
+  }
+
+ private:
+  static constexpr size_t kSlotHeaderBytes = 1 + sizeof(uint32_t);
+  std::vector<char> buffer_;
+  size_t pos_ = 0;
+};
+
+// Reads the j-th feasign of type in feasigns as T, feasigns may be unaligned
+template <typename T>
+inline T ReadBinaryFeasign(const char* feasigns, char type, uint32_t j) {
+  if (type == 'f') {
+    float feasign;
+    memcpy(&feasign, feasigns + j * sizeof(float), sizeof(float));
+    return static_cast<T>(feasign);
+  }
+  uint64_t feasign;
+  memcpy(&feasign, feasigns + j * sizeof(uint64_t), sizeof(uint64_t));
+  return static_cast<T>(feasign);
+}
+#endif
+
+bool MultiSlotBinaryDataFeed::ParseOneInstanceFromPipe(
+    std::vector<MultiSlotType>* instance) {
+#ifdef _LINUX
+  thread_local MultiSlotBinaryReader reader;
+
+  if (!reader.ReadRecord(fp_.get())) {
+    return false;
+  }
+  instance->resize(use_slots_.size());
+  for (size_t i = 0; i < use_slots_index_.size(); ++i) {
+    int idx = use_slots_index_[i];
+    char type;
+    uint32_t num;
+    const char* feasigns = reader.ReadSlot(&type, &num);
+    if (idx == -1) {
+      continue;
+    }
+    auto& slot = (*instance)[idx];
+    slot.Init(all_slots_type_[i]);
+    if (all_slots_type_[i][0] == 'f') {  // float
+      if (type == 'f') {
+        slot.CopyValues(reinterpret_cast<const float*>(feasigns), num);
+      } else {
+        for (uint32_t j = 0; j < num; ++j) {
+          slot.AddValue(ReadBinaryFeasign<float>(feasigns, type, j));
+        }
+      }
+    } else if (all_slots_type_[i][0] == 'u') {  // uint64
+      if (type == 'u') {
+        slot.CopyValues(reinterpret_cast<const uint64_t*>(feasigns), num);
+      } else {
+        for (uint32_t j = 0; j < num; ++j) {
+          slot.AddValue(ReadBinaryFeasign<uint64_t>(feasigns, type, j));
+        }
+      }
+    }
+  }
+  reader.CheckFinished();
+  return true;
+#else
+  return false;
+#endif
+}
+
+bool MultiSlotBinaryInMemoryDataFeed::ParseOneInstanceFromPipe(
+    Record* instance) {
+#ifdef _LINUX
+  PADDLE_ENFORCE_EQ(
+      parse_ins_id_ || parse_content_ || parse_logkey_,
+      false,
+      platform::errors::Unimplemented(
+          "MultiSlotBinaryInMemoryDataFeed does not support parsing ins_id, "
+          "content or logkey, please use MultiSlotInMemoryDataFeed."));
+  thread_local MultiSlotBinaryReader reader;
+
+  if (!reader.ReadRecord(fp_.get())) {
+    return false;
+  }
+  for (size_t i = 0; i < use_slots_index_.size(); ++i) {
+    int idx = use_slots_index_[i];
+    char type;
+    uint32_t num;
+    const char* feasigns = reader.ReadSlot(&type, &num);
+    if (idx == -1) {
+      continue;
+    }
+    if (all_slots_type_[i][0] == 'f') {  // float
+      for (uint32_t j = 0; j < num; ++j) {
+        float feasign = ReadBinaryFeasign<float>(feasigns, type, j);
+        // if float feasign is equal to zero, ignore it
+        // except when slot is dense
+        if (fabs(feasign) < 1e-6 && !use_slots_is_dense_[idx]) {
+          continue;
+        }
+        FeatureFeasign f;
+        f.float_feasign_ = feasign;
+        instance->float_feasigns_.push_back(FeatureItem(f, idx));
+      }
+    } else if (all_slots_type_[i][0] == 'u') {  // uint64
+      for (uint32_t j = 0; j < num; ++j) {
+        uint64_t feasign = ReadBinaryFeasign<uint64_t>(feasigns, type, j);
+        // if uint64 feasign is equal to zero, ignore it
+        // except when slot is dense
+        if (feasign == 0 && !use_slots_is_dense_[idx]) {
+          continue;
+        }
+        FeatureFeasign f;
+        f.uint64_feasign_ = feasign;
+        instance->uint64_feasigns_.push_back(FeatureItem(f, idx));
+      }
+    }
+  }
+  reader.CheckFinished();
+  instance->float_feasigns_.shrink_to_fit();
+  instance->uint64_feasigns_.shrink_to_fit();
+  fea_num_ += instance->uint64_feasigns_.size();
+  return true;
+#else
+  return false;
+#endif
+}
+
 void MultiSlotInMemoryDataFeed::PutToFeedVec(const Record* ins_vec, int num) {
 #ifdef _LINUX
   for (size_t i = 0; i < batch_float_feasigns_.size(); ++i) {
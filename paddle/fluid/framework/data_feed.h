@@ -1763,6 +1763,32 @@ class MultiSlotInMemoryDataFeed : public InMemoryDataFeed<Record> {
   virtual void PutToFeedVec(const Record* ins_vec, int num);
 };
 
+// These DataFeeds are used to feed multi-slot type data in binary format,
+// which is written by MultiSlotDataGenerator with "binary" output format and
+// saves parsing feasigns from text. The format of a record is:
+//   record_bytes [type n feasign_0 feasign_1 ... feasign_n]*
+// record_bytes(uint32) is the number of bytes of the slots, type(char) is
+// 'u' for uint64 feasigns and 'f' for float feasigns, n is uint32, and all
+// numbers are in native byte order. Feasigns are converted if the type
+// differs from the type of the slot in DataFeedDesc.
+class MultiSlotBinaryDataFeed : public MultiSlotDataFeed {
+ public:
+  MultiSlotBinaryDataFeed() {}
+  virtual ~MultiSlotBinaryDataFeed() {}
+
+ protected:
+  virtual bool ParseOneInstanceFromPipe(std::vector<MultiSlotType>* instance);
+};
+
+class MultiSlotBinaryInMemoryDataFeed : public MultiSlotInMemoryDataFeed {
+ public:
+  MultiSlotBinaryInMemoryDataFeed() {}
+  virtual ~MultiSlotBinaryInMemoryDataFeed() {}
+
+ protected:
+  virtual bool ParseOneInstanceFromPipe(Record* instance);
+};
+
 class SlotRecordInMemoryDataFeed : public InMemoryDataFeed<SlotRecord> {
  public:
   SlotRecordInMemoryDataFeed() {}
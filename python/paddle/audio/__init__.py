@@ -18,6 +18,7 @@ from . import datasets
 from . import backends
 
 from .backends.backend import info, load, save
+from .backends.wave_backend import stream
 
 __all__ = [
     "functional",
@@ -27,4 +28,5 @@ __all__ = [
     "load",
     "info",
     "save",
+    "stream",
 ]
@@ -12,9 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import wave
 from pathlib import Path
-from typing import Optional, Tuple, Union
+from typing import Iterator, Optional, Tuple, Union
 
 import numpy as np
 
@@ -34,6 +35,15 @@ def _error_message():
     return warn_msg
 
 
+def _to_float32(audio_as_np16, normalize):
+    audio_as_np32 = audio_as_np16.astype(np.float32)
+    if normalize:
+        # dtype = "float32", scaling in place saves a copy of the waveform
+        audio_as_np32 *= 1.0 / (2**15)
+    # else dtype = "int16"
+    return audio_as_np32
+
+
 def info(filepath: str) -> AudioInfo:
     """Get signal information of input audio file.
 
@@ -143,28 +153,134 @@ def load(
     sample_rate = file_.getframerate()
     frames = file_.getnframes()  # audio frame
 
-    audio_content = file_.readframes(frames)
+    # only read the requested frames
+    frame_offset = min(frame_offset, frames)
+    if num_frames == -1:
+        num_frames = frames - frame_offset
+    if frame_offset > 0:
+        file_.setpos(frame_offset)
+    audio_content = file_.readframes(num_frames)
     file_obj.close()
 
     # default_subtype = "PCM_16", only support PCM16 WAV
-    audio_as_np16 = np.frombuffer(audio_content, dtype=np.int16)
-    audio_as_np32 = audio_as_np16.astype(np.float32)
-    if normalize:
-        # dtype = "float32"
-        audio_norm = audio_as_np32 / (2**15)
-    else:
-        # dtype = "int16"
-        audio_norm = audio_as_np32
-
-    waveform = np.reshape(audio_norm, (frames, channels))
-    if num_frames != -1:
-        waveform = waveform[frame_offset : frame_offset + num_frames, :]
+    audio_norm = _to_float32(
+        np.frombuffer(audio_content, dtype=np.int16), normalize
+    )
+    waveform = np.reshape(audio_norm, (-1, channels))
     waveform = paddle.to_tensor(waveform)
     if channels_first:
         waveform = paddle.transpose(waveform, perm=[1, 0])
     return waveform, sample_rate
 
 
+def stream(
+    filepath: Union[str, Path],
+    chunk_size: int,
+    frame_offset: int = 0,
+    num_frames: int = -1,
+    normalize: bool = True,
+    channels_first: bool = True,
+) -> Iterator[paddle.Tensor]:
+    """Load audio data from file chunk by chunk. The samples of a file are memory mapped, and only one chunk of them is converted at a time, so that long audio can be processed with bounded memory.
+
+    Args:
+        chunk_size: number frames of each chunk, the last chunk may be shorter,
+        frame_offset: from 0 to total frames,
+        num_frames: from -1 (means total frames) or number frames which want to read,
+        normalize:
+            if True: return audio which norm to (-1, 1), dtype=float32
+            if False: return audio with raw data, dtype=int16
+
+        channels_first:
+            if True: return audio with shape (channels, time)
+
+    Return:
+        Iterator[paddle.Tensor]: chunks of audio_content, concatenating them along the time axis gives the result of `load`.
+
+    Exampels:
+        .. code-block:: python
+
+            import paddle
+
+            sample_rate = 16000
+            wav_duration = 0.5
+            num_channels = 1
+            num_frames = sample_rate * wav_duration
+            wav_data = paddle.linspace(-1.0, 1.0, num_frames) * 0.1
+            waveform = wav_data.tile([num_channels, 1])
+            filepath = "./test.wav"
+
+            paddle.audio.save(filepath, waveform, sample_rate)
+            for chunk in paddle.audio.stream(filepath, chunk_size=1600):
+                print(chunk.shape) # [1, 1600]
+    """
+    if chunk_size <= 0:
+        raise ValueError(
+            "chunk_size should be positive, but got {}".format(chunk_size)
+        )
+    if hasattr(filepath, 'read'):
+        file_obj = filepath
+    else:
+        file_obj = open(filepath, 'rb')
+
+    try:
+        file_ = wave.open(file_obj)
+    except wave.Error:
+        file_obj.seek(0)
+        file_obj.close()
+        err_msg = _error_message()
+        raise NotImplementedError(err_msg)
+
+    channels = file_.getnchannels()
+    if file_.getsampwidth() != 2:
+        file_obj.close()
+        raise NotImplementedError(_error_message())
+
+    frames = file_.getnframes()  # audio frame
+    frame_offset = min(frame_offset, frames)
+    end = frames if num_frames == -1 else min(frames, frame_offset + num_frames)
+
+    mapped = not hasattr(filepath, 'read')
+    if not mapped:
+        # file objects can not be mapped, read them chunk by chunk
+        if frame_offset > 0:
+            file_.setpos(frame_offset)
+    else:
+        # wave.open stops at the start of the data chunk
+        data_offset = file_obj.tell()
+        file_obj.close()
+        frames = min(
+            frames, (os.path.getsize(filepath) - data_offset) // (2 * channels)
+        )
+        end = min(end, frames)
+        if end <= frame_offset:
+            return
+        samples = np.memmap(
+            filepath,
+            dtype=np.int16,
+            mode='r',
+            offset=data_offset,
+            shape=(frames, channels),
+        )
+
+    try:
+        for start in range(frame_offset, end, chunk_size):
+            stop = min(start + chunk_size, end)
+            if mapped:
+                audio_as_np16 = samples[start:stop]
+            else:
+                audio_as_np16 = np.frombuffer(
+                    file_.readframes(stop - start), dtype=np.int16
+                ).reshape((-1, channels))
+            waveform = paddle.to_tensor(_to_float32(audio_as_np16, normalize))
+            if channels_first:
+                waveform = paddle.transpose(waveform, perm=[1, 0])
+            yield waveform
+    finally:
+        if not mapped:
+            file_obj.close()
+
+
 def save(
     filepath: str,
     src: paddle.Tensor,
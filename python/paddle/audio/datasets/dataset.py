@@ -11,9 +11,18 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
+import numpy as np
+
 import paddle
+from paddle.dataset import array_cache
 
 from ..features import MFCC, LogMelSpectrogram, MelSpectrogram, Spectrogram
 
@@ -25,6 +34,25 @@ feat_funcs = {
     'spectrogram': Spectrogram,
 }
 
+# NOTE: [ feature cache of audio datasets ]
+# Extracting features of a waveform costs much more than reading it, and it is
+# repeated for every sample in every epoch. With `cache_features=True` the
+# features of the whole dataset are extracted once and saved into an array
+# cache (see NOTE: [ array cache of datasets ]) keyed by feat_type and
+# feat_config, later datasets map the cache and only slice it.
+# Features are extracted in batches of waveforms sorted by length, so the
+# padding inside a batch is small. Each waveform is first padded by its own
+# `pad_mode` for the n_fft // 2 samples the frames near its end look at, then
+# by zeros to the longest one in the batch, so the frames kept for it are the
+# same as the ones extracted from it alone.
+# Files are processed in chunks of _CACHE_CHUNK_SIZE, the features of a chunk
+# are appended into a temporary file next to the cache, which is mapped and
+# copied into the cache at last, so only the waveforms and features of one
+# chunk are held in memory.
+_CACHE_BATCH_SIZE = 32
+_CACHE_CHUNK_SIZE = 1024
+_CACHE_NUM_WORKERS = min(8, os.cpu_count() or 1)
+
 
 class AudioClassificationDataset(paddle.io.Dataset):
     """
@@ -37,6 +65,7 @@ class AudioClassificationDataset(paddle.io.Dataset):
         labels: List[int],
         feat_type: str = 'raw',
         sample_rate: int = None,
+        cache_features: bool = False,
         **kwargs,
     ):
         """
@@ -45,6 +74,9 @@ class AudioClassificationDataset(paddle.io.Dataset):
             labels (:obj:`List[int]`): Labels of audio files.
             feat_type (:obj:`str`, `optional`, defaults to `raw`):
                 It identifies the feature type that user wants to extrace of an audio file.
+            cache_features (:obj:`bool`, `optional`, defaults to `False`):
+                Whether to extract features of all audio files once and read them from a
+                memory mapped cache, see NOTE: [ feature cache of audio datasets ].
         """
         super().__init__()
 
@@ -62,6 +94,150 @@ class AudioClassificationDataset(paddle.io.Dataset):
             kwargs  # Pass keyword arguments to customize feature config
         )
 
+        self._feats = None
+        self._feat_offsets = None
+        if cache_features:
+            arrays = array_cache.cached_arrays(
+                'audio', self.files, self._cache_key(), self._extract_features
+            )
+            self._feats = arrays['feats']
+            self._feat_offsets = arrays['offsets']
+            if self.sample_rate is None and len(arrays['sample_rates']) > 0:
+                self.sample_rate = int(arrays['sample_rates'][-1])
+
+    def _cache_key(self):
+        config = json.dumps(
+            [self.feat_type, self.sample_rate, self.feat_config],
+            sort_keys=True,
+            default=str,
+        )
+        return '{}-{}'.format(
+            self.feat_type,
+            hashlib.sha1(config.encode('utf-8')).hexdigest()[:16],
+        )
+
+    def _load_waveform(self, file):
+        waveform, sample_rate = paddle.audio.load(file)
+        waveform = waveform.numpy()
+        if waveform.ndim == 2:
+            if waveform.shape[0] != 1:
+                raise ValueError(
+                    "cache_features only supports mono audio, but got {} "
+                    "channels in {}".format(waveform.shape[0], file)
+                )
+            waveform = waveform[0]  # 1D input
+        return waveform.astype('float32'), sample_rate
+
+    def _feature_extractor(self, sample_rate):
+        feat_func = feat_funcs[self.feat_type]
+        if self.feat_type != 'spectrogram':
+            return feat_func(sr=sample_rate, **self.feat_config)
+        return feat_func(**self.feat_config)
+
+    def _frame_config(self):
+        params = inspect.signature(feat_funcs[self.feat_type]).parameters
+        config = {name: param.default for name, param in params.items()}
+        config.update(self.feat_config)
+        n_fft = config['n_fft']
+        hop_length = config['hop_length'] or n_fft // 4
+        return n_fft, hop_length, config['center'], config['pad_mode']
+
+    def _extract_features(self):
+        dirname = os.path.dirname(
+            array_cache.get_cache_path('audio', self.files, self._cache_key())
+        )
+        try:
+            os.makedirs(dirname, exist_ok=True)
+        except OSError:
+            dirname = None
+        lengths = []
+        sample_rates = []
+        feat_shape = None
+        with tempfile.TemporaryFile(dir=dirname) as feat_file:
+            with ThreadPoolExecutor(_CACHE_NUM_WORKERS) as executor:
+                for start in range(0, len(self.files), _CACHE_CHUNK_SIZE):
+                    files = self.files[start : start + _CACHE_CHUNK_SIZE]
+                    records = list(executor.map(self._load_waveform, files))
+                    waveforms = [waveform for waveform, _ in records]
+                    rates = np.array(
+                        [rate for _, rate in records], dtype='int64'
+                    )
+                    if self.feat_type == 'raw':
+                        feats = waveforms
+                    else:
+                        feats = self._extract_batched(waveforms, rates)
+                    for feat in feats:
+                        feat = np.ascontiguousarray(feat, dtype='float32')
+                        feat_file.write(feat.data)
+                        lengths.append(len(feat))
+                        feat_shape = feat.shape[1:]
+                    sample_rates.append(rates)
+            feat_file.flush()
+            if sum(lengths) > 0:
+                # the map keeps its own handle of the file after it is closed
+                feats = np.memmap(
+                    feat_file,
+                    dtype='float32',
+                    mode='r',
+                    shape=(sum(lengths),) + feat_shape,
+                )
+            else:
+                feats = np.zeros([0], dtype='float32')
+        offsets = np.zeros([len(lengths) + 1], dtype='int64')
+        np.cumsum(lengths, out=offsets[1:])
+        return {
+            'feats': feats,
+            'offsets': offsets,
+            'sample_rates': np.concatenate(sample_rates)
+            if sample_rates
+            else np.zeros([0], dtype='int64'),
+        }
+
+    def _extract_batched(self, waveforms, sample_rates):
+        n_fft, hop_length, center, pad_mode = self._frame_config()
+        # top_db clips by the maximum of the whole batch
+        batch_size = (
+            1
+            if self.feat_config.get('top_db') is not None
+            else _CACHE_BATCH_SIZE
+        )
+        lengths = np.array([len(w) for w in waveforms], dtype='int64')
+        order = np.lexsort((lengths, sample_rates))
+        feats = [None] * len(waveforms)
+        extractors = {}
+        start = 0
+        while start < len(order):
+            # a batch never mixes sample rates
+            end = min(start + batch_size, len(order))
+            rate = sample_rates[order[start]]
+            end = start + int(
+                np.count_nonzero(sample_rates[order[start:end]] == rate)
+            )
+            indices = order[start:end]
+            if rate not in extractors:
+                extractors[rate] = self._feature_extractor(int(rate))
+
+            padded = []
+            for i in indices:
+                waveform = waveforms[i]
+                if center:
+                    waveform = np.pad(waveform, [0, n_fft // 2], mode=pad_mode)
+                padded.append(waveform)
+            max_length = max(len(w) for w in padded)
+            batch = np.zeros([len(indices), max_length], dtype='float32')
+            for row, waveform in enumerate(padded):
+                batch[row, : len(waveform)] = waveform
+
+            outputs = extractors[rate](paddle.to_tensor(batch)).numpy()
+            for row, i in enumerate(indices):
+                length = lengths[i] + 2 * (n_fft // 2) if center else lengths[i]
+                num_frames = 1 + (length - n_fft) // hop_length
+                # (num_frames, feat_dim) so that the feature of a sample is
+                # contiguous in the cache
+                feats[i] = outputs[row, :, :num_frames].T
+            start = end
+        return feats
+
     def _get_data(self, input_file: str):
         raise NotImplementedError
 
@@ -91,6 +267,11 @@ class AudioClassificationDataset(paddle.io.Dataset):
         return record
 
     def __getitem__(self, idx):
+        if self._feats is not None:
+            feat = self._feats[
+                self._feat_offsets[idx] : self._feat_offsets[idx + 1]
+            ]
+            return paddle.to_tensor(np.array(feat.T)), self.labels[idx]
         record = self._convert_to_record(idx)
         return record['feat'], record['label']
 
@@ -22,6 +22,104 @@ from ..functional import compute_fbank_matrix, create_dct, power_to_db
 from ..functional.window import get_window
 
 
+# NOTE: [ streaming feature extraction ]
+# `forward` of the feature layers takes whole waveforms, which does not fit
+# hour-long audio. `forward_stream` takes the waveforms chunk by chunk and
+# returns the features of the frames completed by each chunk, the samples of
+# an incomplete frame are carried to the next chunk. The center padding is
+# built from the first samples of the stream and, when `is_last` is True, the
+# last samples, so concatenating the features of all chunks gives the result
+# of `forward`. Chunks completing no frame give None.
+class _STFTStream:
+    def __init__(self, n_fft, hop_length, center, pad_mode):
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.pad_length = n_fft // 2 if center else 0
+        self.pad_mode = pad_mode
+        self.started = not center
+        # raw samples before the left padding is built
+        self.head = None
+        # padded samples from the start of the next frame
+        self.buffer = None
+        # padded samples to drop before the next frame, when hop > n_fft
+        self.skip = 0
+        # last raw samples to build the right padding
+        self.tail = None
+
+    def _pad(self, x, pad):
+        return paddle.nn.functional.pad(
+            x.unsqueeze(-1), pad=pad, mode=self.pad_mode, data_format="NLC"
+        ).squeeze(-1)
+
+    def push(self, x, is_last):
+        """
+        Returns padded samples of the frames completed by `x`, or None.
+        """
+        pieces = []
+        if x is not None and self.pad_length > 0:
+            tail = x if self.tail is None else paddle.concat([self.tail, x], -1)
+            self.tail = tail[:, -(self.pad_length + 1) :]
+
+        if not self.started:
+            if x is not None:
+                x = (
+                    x
+                    if self.head is None
+                    else paddle.concat([self.head, x], -1)
+                )
+            else:
+                x = self.head
+            self.head = None
+            if x is None:
+                return None
+            if x.shape[-1] <= self.pad_length and not is_last:
+                self.head = x
+                return None
+            if is_last:
+                # the whole stream is in one piece
+                x = self._pad(x, [self.pad_length, 0])
+            else:
+                left = self._pad(
+                    x[:, : self.pad_length + 1], [self.pad_length, 0]
+                )
+                x = paddle.concat([left[:, : self.pad_length], x], -1)
+            self.started = True
+        if x is not None:
+            pieces.append(x)
+        if is_last and self.pad_length > 0 and self.tail is not None:
+            right = self._pad(self.tail, [0, self.pad_length])
+            pieces.append(right[:, -self.pad_length :])
+        if is_last:
+            self.tail = None
+
+        if self.buffer is not None:
+            pieces.insert(0, self.buffer)
+        if not pieces:
+            return None
+        x = pieces[0] if len(pieces) == 1 else paddle.concat(pieces, -1)
+        self.buffer = None
+
+        length = x.shape[-1]
+        if self.skip >= length:
+            self.skip -= length
+            return None
+        if self.skip > 0:
+            x = x[:, self.skip :]
+            length -= self.skip
+            self.skip = 0
+        if length < self.n_fft:
+            self.buffer = x
+            return None
+
+        num_frames = 1 + (length - self.n_fft) // self.hop_length
+        consumed = num_frames * self.hop_length
+        if consumed < length:
+            self.buffer = x[:, consumed:]
+        else:
+            self.skip = consumed - length
+        return x[:, : (num_frames - 1) * self.hop_length + self.n_fft]
+
+
 class Spectrogram(nn.Layer):
     """Compute spectrogram of given signals, typically audio waveforms.
     The spectorgram is defined as the complex norm of the short-time Fourier transformation.
@@ -90,6 +188,13 @@ class Spectrogram(nn.Layer):
             pad_mode=pad_mode,
         )
         self.register_buffer('fft_window', self.fft_window)
+        self._stream_config = (
+            n_fft,
+            n_fft // 4 if hop_length is None else hop_length,
+            center,
+            pad_mode,
+        )
+        self._stream = None
 
     def forward(self, x: Tensor) -> Tensor:
         """
@@ -103,6 +208,31 @@ class Spectrogram(nn.Layer):
         spectrogram = paddle.pow(paddle.abs(stft), self.power)
         return spectrogram
 
+    def forward_stream(
+        self, x: Optional[Tensor], is_last: bool = False
+    ) -> Optional[Tensor]:
+        """
+        Args:
+            x (Optional[Tensor]): Tensor of a chunk of waveforms with shape `(N, T)`, it can be None to finish the stream.
+            is_last (bool, optional): Whether `x` is the last chunk of the stream. Defaults to False.
+
+        Returns:
+            Optional[Tensor]: Spectrograms of the frames completed by `x` with shape `(N, n_fft//2 + 1, num_frames)`, see NOTE: [ streaming feature extraction ].
+        """
+        if self._stream is None:
+            self._stream = _STFTStream(*self._stream_config)
+        x = self._stream.push(x, is_last)
+        if is_last:
+            self._stream = None
+        if x is None:
+            return None
+        stft = self._stft(x, center=False)
+        return paddle.pow(paddle.abs(stft), self.power)
+
+    def reset_stream(self) -> None:
+        """Drops the samples carried by `forward_stream`."""
+        self._stream = None
+
 
 class MelSpectrogram(nn.Layer):
     """Compute the melspectrogram of given signals, typically audio waveforms. It is computed by multiplying spectrogram with Mel filter bank matrix.
@@ -203,6 +333,26 @@ class MelSpectrogram(nn.Layer):
         mel_feature = paddle.matmul(self.fbank_matrix, spect_feature)
         return mel_feature
 
+    def forward_stream(
+        self, x: Optional[Tensor], is_last: bool = False
+    ) -> Optional[Tensor]:
+        """
+        Args:
+            x (Optional[Tensor]): Tensor of a chunk of waveforms with shape `(N, T)`, it can be None to finish the stream.
+            is_last (bool, optional): Whether `x` is the last chunk of the stream. Defaults to False.
+
+        Returns:
+            Optional[Tensor]: Mel spectrograms of the frames completed by `x` with shape `(N, n_mels, num_frames)`, see NOTE: [ streaming feature extraction ].
+        """
+        spect_feature = self._spectrogram.forward_stream(x, is_last)
+        if spect_feature is None:
+            return None
+        return paddle.matmul(self.fbank_matrix, spect_feature)
+
+    def reset_stream(self) -> None:
+        """Drops the samples carried by `forward_stream`."""
+        self._spectrogram.reset_stream()
+
 
 class LogMelSpectrogram(nn.Layer):
     """Compute log-mel-spectrogram feature of given signals, typically audio waveforms.
@@ -306,6 +456,31 @@ class LogMelSpectrogram(nn.Layer):
         )
         return log_mel_feature
 
+    def forward_stream(
+        self, x: Optional[Tensor], is_last: bool = False
+    ) -> Optional[Tensor]:
+        """
+        Args:
+            x (Optional[Tensor]): Tensor of a chunk of waveforms with shape `(N, T)`, it can be None to finish the stream.
+            is_last (bool, optional): Whether `x` is the last chunk of the stream. Defaults to False.
+
+        Returns:
+            Optional[Tensor]: Log mel spectrograms of the frames completed by `x` with shape `(N, n_mels, num_frames)`, see NOTE: [ streaming feature extraction ].
+        """
+        if self.top_db is not None:
+            # the threshold depends on the peak of the whole spectrogram
+            raise ValueError("forward_stream does not support top_db.")
+        mel_feature = self._melspectrogram.forward_stream(x, is_last)
+        if mel_feature is None:
+            return None
+        return power_to_db(
+            mel_feature, ref_value=self.ref_value, amin=self.amin, top_db=None
+        )
+
+    def reset_stream(self) -> None:
+        """Drops the samples carried by `forward_stream`."""
+        self._melspectrogram.reset_stream()
+
 
 class MFCC(nn.Layer):
     """Compute mel frequency cepstral coefficients(MFCCs) feature of given waveforms.
@@ -412,3 +587,25 @@ class MFCC(nn.Layer):
             (0, 2, 1)
         )  # (B, n_mels, L)
         return mfcc
+
+    def forward_stream(
+        self, x: Optional[Tensor], is_last: bool = False
+    ) -> Optional[Tensor]:
+        """
+        Args:
+            x (Optional[Tensor]): Tensor of a chunk of waveforms with shape `(N, T)`, it can be None to finish the stream.
+            is_last (bool, optional): Whether `x` is the last chunk of the stream. Defaults to False.
+
+        Returns:
+            Optional[Tensor]: Mel frequency cepstral coefficients of the frames completed by `x` with shape `(N, n_mfcc, num_frames)`, see NOTE: [ streaming feature extraction ].
+        """
+        log_mel_feature = self._log_melspectrogram.forward_stream(x, is_last)
+        if log_mel_feature is None:
+            return None
+        return paddle.matmul(
+            log_mel_feature.transpose((0, 2, 1)), self.dct_matrix
+        ).transpose((0, 2, 1))
+
+    def reset_stream(self) -> None:
+        """Drops the samples carried by `forward_stream`."""
+        self._log_melspectrogram.reset_stream()
@@ -12,12 +12,56 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # Modified from librosa(https://github.com/librosa/librosa)
+import functools
+import inspect
 import math
 from typing import Optional, Union
 
 import paddle
 from paddle import Tensor
 
+# NOTE: [ cache of constant matrices ]
+# The filterbank, DCT and window matrices only depend on their arguments, but
+# building them launches tens of small ops, which dominates constructing a
+# feature layer or calling the functional API per request. In dynamic mode
+# their values are kept in a bounded LRU cache keyed by the bound arguments,
+# and shared by all layers and calls. A new tensor is created from the cached
+# value on every call, since layers convert their buffers in place, e.g. by
+# `Layer.to`.
+_MATRIX_CACHE_SIZE = 64
+
+
+def _cached_matrix(func):
+    signature = inspect.signature(func)
+
+    @functools.lru_cache(maxsize=_MATRIX_CACHE_SIZE)
+    def cached_func(*args):
+        value = func(*args).numpy()
+        if value.dtype.kind != 'f':
+            # e.g. bfloat16 is returned as uint16 by numpy
+            return None
+        value.flags.writeable = False
+        return value
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not paddle.in_dynamic_mode():
+            return func(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        try:
+            value = cached_func(*bound.args)
+        except TypeError:
+            # unhashable arguments
+            value = None
+        if value is None:
+            return func(*args, **kwargs)
+        return paddle.to_tensor(value)
+
+    wrapper.cache_info = cached_func.cache_info
+    wrapper.cache_clear = cached_func.cache_clear
+    return wrapper
+
 
 def hz_to_mel(
     freq: Union[Tensor, float], htk: bool = False
@@ -183,6 +227,7 @@ def fft_frequencies(sr: int, n_fft: int, dtype: str = 'float32') -> Tensor:
     return paddle.linspace(0, float(sr) / 2, int(1 + n_fft // 2), dtype=dtype)
 
 
+@_cached_matrix
 def compute_fbank_matrix(
     sr: int,
     n_fft: int,
@@ -221,9 +266,6 @@ def compute_fbank_matrix(
     if f_max is None:
         f_max = float(sr) / 2
 
-    # Initialize the weights
-    weights = paddle.zeros((n_mels, int(1 + n_fft // 2)), dtype=dtype)
-
     # Center freqs of each FFT bin
     fftfreqs = fft_frequencies(sr=sr, n_fft=n_fft, dtype=dtype)
 
@@ -236,15 +278,14 @@ def compute_fbank_matrix(
     ramps = mel_f.unsqueeze(1) - fftfreqs.unsqueeze(0)
     # ramps = np.subtract.outer(mel_f, fftfreqs)
 
-    for i in range(n_mels):
-        # lower and upper slopes for all bins
-        lower = -ramps[i] / fdiff[i]
-        upper = ramps[i + 2] / fdiff[i + 1]
+    # lower and upper slopes for all bins of all mels
+    lower = -ramps[:n_mels] / fdiff[:n_mels].unsqueeze(1)
+    upper = ramps[2 : n_mels + 2] / fdiff[1 : n_mels + 1].unsqueeze(1)
 
-        # .. then intersect them with each other and zero
-        weights[i] = paddle.maximum(
-            paddle.zeros_like(lower), paddle.minimum(lower, upper)
-        )
+    # .. then intersect them with each other and zero
+    weights = paddle.maximum(
+        paddle.zeros_like(lower), paddle.minimum(lower, upper)
+    )
 
     # Slaney-style mel is scaled to be approx constant energy per channel
     if norm == 'slaney':
@@ -300,6 +341,7 @@ def power_to_db(
     return log_spec
 
 
+@_cached_matrix
 def create_dct(
     n_mfcc: int,
     n_mels: int,
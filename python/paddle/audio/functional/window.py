@@ -16,6 +16,8 @@ from typing import List, Tuple, Union
 import paddle
 from paddle import Tensor
 
+from .functional import _cached_matrix
+
 
 class WindowFunctionRegister:
     def __init__(self):
@@ -325,6 +327,7 @@ def _cosine(M: int, sym: bool = True, dtype: str = 'float64') -> Tensor:
     return _truncate(w, needs_trunc)
 
 
+@_cached_matrix
 def get_window(
     window: Union[str, Tuple[str, float]],
     win_length: int,
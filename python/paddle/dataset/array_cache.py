@@ -0,0 +1,241 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import warnings
+
+import numpy as np
+
+from paddle.dataset.common import DATA_HOME
+
+__all__ = []
+
+# NOTE: [ array cache of datasets ]
+# Built-in datasets parse their source files (gzip, tar, pickle) on every
+# construction. An array cache converts the parsed arrays of a dataset once
+# into a single binary file, which is opened by numpy.memmap after that, so
+# constructing the dataset costs O(1) and DataLoader workers share the pages
+# of the file instead of holding their own copies. The layout of the file is:
+#   | magic | header length (uint64) | header (json) | aligned arrays |
+# The header records dtype, shape and offset (relative to the end of header)
+# of each array, and the size and mtime of source files, the cache is rebuilt
+# if any source file changes.
+# Variable length records like encoded images are packed into a uint8 array
+# and an offsets array by `pack_bytes`.
+_CACHE_MAGIC = b'PDARRAY\x01'
+_CACHE_VERSION = 1
+_CACHE_ALIGNMENT = 64
+_HEADER_LENGTH_FORMAT = '<Q'
+
+
+def _align_offset(offset):
+    return (
+        (offset + _CACHE_ALIGNMENT - 1) // _CACHE_ALIGNMENT * _CACHE_ALIGNMENT
+    )
+
+
+def _source_signature(sources):
+    signature = []
+    for source in sources:
+        stat = os.stat(source)
+        signature.append(
+            [os.path.abspath(source), stat.st_size, stat.st_mtime_ns]
+        )
+    return signature
+
+
+def get_cache_path(module_name, sources, key):
+    """
+    Returns the path of the cache of `sources` in DATA_HOME/module_name.
+    """
+    sources_hash = hashlib.sha1(
+        repr([os.path.abspath(s) for s in sources]).encode('utf-8')
+    ).hexdigest()[:16]
+    return os.path.join(
+        DATA_HOME,
+        module_name,
+        'cache',
+        '{}-{}.pdarray'.format(key, sources_hash),
+    )
+
+
+class _CachedArray(np.memmap):
+    """
+    A memmap of an array in cache file, which is pickled by its path instead
+    of its data, so that processes receiving it map the same pages.
+    """
+
+    _cache_source = None
+
+    def __array_finalize__(self, obj):
+        super().__array_finalize__(obj)
+        # views of the array are pickled by data
+        self._cache_source = None
+
+    def __reduce__(self):
+        if self._cache_source is not None:
+            return (_open_array, self._cache_source)
+        return np.asarray(self).__reduce__()
+
+
+def _data_offset(header_length):
+    prefix_length = len(_CACHE_MAGIC) + struct.calcsize(_HEADER_LENGTH_FORMAT)
+    return _align_offset(prefix_length + header_length)
+
+
+def _read_header(path):
+    with open(path, 'rb') as f:
+        magic = f.read(len(_CACHE_MAGIC))
+        if magic != _CACHE_MAGIC:
+            raise ValueError("{} is not an array cache file.".format(path))
+        (header_length,) = struct.unpack(
+            _HEADER_LENGTH_FORMAT,
+            f.read(struct.calcsize(_HEADER_LENGTH_FORMAT)),
+        )
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    return header, _data_offset(header_length)
+
+
+def _map_array(path, name, meta, data_offset):
+    shape = tuple(meta['shape'])
+    if 0 in shape:
+        # an empty file region can not be mapped
+        return np.empty(shape, dtype=meta['dtype'])
+    array = _CachedArray(
+        path,
+        dtype=meta['dtype'],
+        mode='r',
+        offset=data_offset + meta['offset'],
+        shape=shape,
+    )
+    array._cache_source = (path, name)
+    return array
+
+
+def _open_array(path, name):
+    header, data_offset = _read_header(path)
+    return _map_array(path, name, header['arrays'][name], data_offset)
+
+
+def load_arrays(path, sources=None):
+    """
+    Maps the arrays in cache file `path`. Returns None if the file does not
+    exist, is broken or is stale for `sources`.
+    """
+    if not os.path.isfile(path):
+        return None
+    try:
+        header, data_offset = _read_header(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if header.get('version') != _CACHE_VERSION:
+        return None
+    if sources is not None and header['sources'] != _source_signature(sources):
+        return None
+    return {
+        name: _map_array(path, name, meta, data_offset)
+        for name, meta in header['arrays'].items()
+    }
+
+
+def save_arrays(path, arrays, sources=()):
+    """
+    Saves a dict of numpy arrays into cache file `path`, see
+    NOTE: [ array cache of datasets ].
+    """
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+    header = {
+        'version': _CACHE_VERSION,
+        'sources': _source_signature(sources),
+        'arrays': {},
+    }
+    offset = 0
+    for name, array in arrays.items():
+        header['arrays'][name] = {
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': offset,
+        }
+        offset = _align_offset(offset + array.nbytes)
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_offset = _data_offset(len(header_bytes))
+
+    dirname = os.path.dirname(path)
+    os.makedirs(dirname, exist_ok=True)
+    # write into a temporary file and rename, so that processes building
+    # the same cache never read a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_CACHE_MAGIC)
+            f.write(struct.pack(_HEADER_LENGTH_FORMAT, len(header_bytes)))
+            f.write(header_bytes)
+            for name, array in arrays.items():
+                offset = data_offset + header['arrays'][name]['offset']
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(array.reshape([-1]).view(np.uint8).data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def cached_arrays(module_name, sources, key, build_fn):
+    """
+    Returns the arrays of `sources` mapped from cache, the cache is built by
+    `build_fn` which returns a dict of numpy arrays if it is missing or
+    stale. If the cache can not be written, the built arrays are returned.
+
+    Args:
+        module_name(str): the directory name of dataset in DATA_HOME.
+        sources(list[str]): paths of source files of the dataset.
+        key(str): distinguishes caches of the same sources, like mode.
+        build_fn(Callable): parses sources into a dict of numpy arrays.
+    """
+    path = get_cache_path(module_name, sources, key)
+    arrays = load_arrays(path, sources)
+    if arrays is not None:
+        return arrays
+    arrays = build_fn()
+    try:
+        save_arrays(path, arrays, sources)
+    except OSError as e:
+        warnings.warn(
+            "Failed to write dataset cache into {}: {}".format(path, e)
+        )
+        return arrays
+    return load_arrays(path) or arrays
+
+
+def pack_bytes(records):
+    """
+    Packs a list of bytes into a uint8 array and an int64 offsets array of
+    length len(records) + 1.
+    """
+    lengths = np.array([len(r) for r in records], dtype='int64')
+    offsets = np.zeros([len(records) + 1], dtype='int64')
+    np.cumsum(lengths, out=offsets[1:])
+    data = np.frombuffer(b''.join(records), dtype=np.uint8)
+    return data, offsets
+
+
+def unpack_bytes(data, offsets, idx):
+    """
+    Returns the bytes of record `idx` packed by `pack_bytes`.
+    """
+    return data[offsets[idx] : offsets[idx + 1]].tobytes()
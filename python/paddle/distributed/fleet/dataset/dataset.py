@@ -536,7 +536,9 @@ class InMemoryDataset(DatasetBase):
             fs_ugi(str): fs ugi. default is "".
             pipe_command(str): pipe command of current dataset. A pipe command is a UNIX pipeline command that can be used only. default is "cat"
             download_cmd(str): customized download command. default is "cat"
-            data_feed_type(str): data feed type used in c++ code. default is "MultiSlotInMemoryDataFeed".
+            data_feed_type(str): data feed type used in c++ code. default is "MultiSlotInMemoryDataFeed",
+                                 use "MultiSlotBinaryInMemoryDataFeed" for the binary output format of
+                                 MultiSlotDataGenerator.
             queue_num(int): Dataset output queue num, training threads get data from queues. default is -1, which is set same as thread number in c++.
 
         Examples:
@@ -595,7 +597,9 @@ class InMemoryDataset(DatasetBase):
         if self.use_ps_gpu:
             data_feed_type = "SlotRecordInMemoryDataFeed"
         else:
-            data_feed_type = "MultiSlotInMemoryDataFeed"
+            data_feed_type = kwargs.get(
+                "data_feed_type", "MultiSlotInMemoryDataFeed"
+            )
         self._set_feed_type(data_feed_type)
 
         super().init(
@@ -1297,7 +1301,15 @@ class QueueDataset(DatasetBase):
         :api_attr: Static Graph
 
         should be called only once in user's python scripts to initialize setings of dataset instance
+
+        Args:
+            kwargs: Keyword arguments of init of DatasetBase, and:
+
+            data_feed_type(str): data feed type used in c++ code. default is "MultiSlotDataFeed",
+                                 use "MultiSlotBinaryDataFeed" for the binary output format of
+                                 MultiSlotDataGenerator.
         """
+        self.proto_desc.name = kwargs.pop("data_feed_type", "MultiSlotDataFeed")
         super().init(**kwargs)
 
     def _prepare_to_run(self):
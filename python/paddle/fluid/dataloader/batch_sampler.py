@@ -18,7 +18,7 @@ import math
 from .sampler import Sampler, SequenceSampler, RandomSampler
 from .dataset import Dataset, IterableDataset
 
-__all__ = ["BatchSampler", "DistributedBatchSampler"]
+__all__ = ["BatchSampler", "DistributedBatchSampler", "BucketBatchSampler"]
 
 
 class BatchSampler(Sampler):
@@ -364,3 +364,249 @@ class DistributedBatchSampler(BatchSampler):
                     sampler.set_epoch(epoch)
         """
         self.epoch = epoch
+
+
+class BucketBatchSampler(BatchSampler):
+    """
+    Batch sampler that groups samples of similar lengths into mini-batches,
+    so that variable-length samples like sentences and utterances are
+    padded less in a mini-batch.
+
+    In each epoch, sample indices are split into buckets of
+    :attr:`bucket_size` samples, samples in a bucket are sorted by length
+    and split into mini-batches, then mini-batches of all buckets are
+    shuffled if :attr:`shuffle` is True. A mini-batch holds at most
+    :attr:`batch_size` samples, and if :attr:`max_tokens` is set, the
+    padded size of a mini-batch, i.e. the number of samples times the
+    longest length, is at most :attr:`max_tokens`. A sample longer than
+    :attr:`max_tokens` makes a mini-batch by itself.
+
+    In distributed training, all processes generate the same mini-batches
+    with the seed of epoch and each process takes an exclusive subset of
+    them like :ref:`api_paddle_io_DistributedBatchSampler`.
+
+    Args:
+        dataset(Dataset): this could be an instance of subclass of :ref:`api_paddle_io_Dataset`
+                     or other python object which implemented
+                     `__len__` for BucketBatchSampler to get indices of samples.
+        lengths(list|numpy.ndarray|Callable): lengths of samples, or a
+            function which takes a sample of :attr:`dataset` and returns its
+            length, the function is called on all samples once when the
+            sampler is created.
+        batch_size(int, optional): max sample number of each mini-batch. If
+            None, mini-batches are only limited by :attr:`max_tokens`.
+            Default None.
+        max_tokens(int, optional): max padded size of each mini-batch.
+            If None, each mini-batch has :attr:`batch_size` samples.
+            At least one of :attr:`batch_size` and :attr:`max_tokens` should
+            be set. Default None.
+        bucket_size(int, optional): sample number of each bucket. Larger
+            buckets group lengths better but make mini-batches less random.
+            If None, all samples are in one bucket. Default None.
+        num_replicas(int, optional): porcess number in distributed training.
+            If :attr:`num_replicas` is None, :attr:`num_replicas` will be
+            retrieved from :ref:`api_paddle_distributed_ParallelEnv` .
+            Default None.
+        rank(int, optional): the rank of the current process among :attr:`num_replicas`
+            processes. If :attr:`rank` is None, :attr:`rank` is retrieved from
+            :ref:`api_paddle_distributed_ParallelEnv`. Default None.
+        shuffle(bool, optional): whther to shuffle samples before splitting
+            them into buckets, and mini-batches after generating them.
+            Default False.
+        drop_last(bool, optional): whether to drop the last mini-batch of
+            each bucket if it has less than :attr:`batch_size` samples, and
+            the mini-batches which can not be divided evenly among
+            :attr:`num_replicas` processes, instead of repeating mini-batches
+            to fill them. Default False.
+
+    Returns:
+        BucketBatchSampler, return an iterable object for indices iterating.
+
+    Examples:
+        .. code-block:: python
+
+            import numpy as np
+
+            from paddle.io import Dataset, BucketBatchSampler
+
+            class RandomDataset(Dataset):
+                def __init__(self, num_samples):
+                    self.lengths = np.random.randint(1, 100, [num_samples])
+
+                def __getitem__(self, idx):
+                    words = np.random.randint(0, 1000, [self.lengths[idx]])
+                    label = np.random.randint(0, 2, (1, )).astype('int64')
+                    return words, label
+
+                def __len__(self):
+                    return len(self.lengths)
+
+            dataset = RandomDataset(1000)
+            sampler = BucketBatchSampler(
+                dataset, dataset.lengths, max_tokens=1024, shuffle=True)
+
+            for epoch in range(2):
+                sampler.set_epoch(epoch)
+                for batch_indices in sampler:
+                    # do something
+                    break
+    """
+
+    def __init__(
+        self,
+        dataset,
+        lengths,
+        batch_size=None,
+        max_tokens=None,
+        bucket_size=None,
+        num_replicas=None,
+        rank=None,
+        shuffle=False,
+        drop_last=False,
+    ):
+        assert not isinstance(
+            dataset, IterableDataset
+        ), "dataset should not be a paddle.io.IterableDataset"
+        self.dataset = dataset
+
+        assert (
+            batch_size is not None or max_tokens is not None
+        ), "either batch_size or max_tokens should be set"
+        assert batch_size is None or (
+            isinstance(batch_size, int) and batch_size > 0
+        ), "batch_size should be a positive integer"
+        self.batch_size = batch_size
+        assert max_tokens is None or (
+            isinstance(max_tokens, int) and max_tokens > 0
+        ), "max_tokens should be a positive integer"
+        self.max_tokens = max_tokens
+        assert bucket_size is None or (
+            isinstance(bucket_size, int) and bucket_size > 0
+        ), "bucket_size should be a positive integer"
+        self.bucket_size = bucket_size
+        assert isinstance(shuffle, bool), "shuffle should be a boolean value"
+        self.shuffle = shuffle
+        assert isinstance(
+            drop_last, bool
+        ), "drop_last should be a boolean number"
+        self.drop_last = drop_last
+
+        if callable(lengths):
+            lengths = [lengths(dataset[i]) for i in range(len(dataset))]
+        self.lengths = np.asarray(lengths, dtype='int64')
+        assert self.lengths.shape == (
+            len(dataset),
+        ), "lengths should have the same number of samples as dataset"
+
+        from paddle.distributed import ParallelEnv
+
+        if num_replicas is not None:
+            assert (
+                isinstance(num_replicas, int) and num_replicas > 0
+            ), "num_replicas should be a positive integer"
+            self.nranks = num_replicas
+        else:
+            self.nranks = ParallelEnv().nranks
+
+        if rank is not None:
+            assert (
+                isinstance(rank, int) and rank >= 0
+            ), "rank should be a non-negative integer"
+            self.local_rank = rank
+        else:
+            self.local_rank = ParallelEnv().local_rank
+
+        self.epoch = 0
+        self._batches_cache = None
+
+    def _split_bucket(self, indices):
+        # indices are sorted by length, so the padded size of a mini-batch
+        # is the number of samples times the length of the last sample
+        if self.max_tokens is None:
+            batches = [
+                indices[i : i + self.batch_size].tolist()
+                for i in range(0, len(indices), self.batch_size)
+            ]
+        else:
+            batches = []
+            start = 0
+            for end, length in enumerate(self.lengths[indices].tolist()):
+                if end > start and (
+                    (end - start + 1) * length > self.max_tokens
+                    or end - start == self.batch_size
+                ):
+                    batches.append(indices[start:end].tolist())
+                    start = end
+            if start < len(indices):
+                batches.append(indices[start:].tolist())
+        # only the remainder of the bucket is dropped, mini-batches cut
+        # short by max_tokens are kept
+        if (
+            self.drop_last
+            and self.batch_size is not None
+            and batches
+            and len(batches[-1]) < self.batch_size
+        ):
+            batches.pop()
+        return batches
+
+    def _get_batches(self):
+        if (
+            self._batches_cache is not None
+            and self._batches_cache[0] == self.epoch
+        ):
+            return self._batches_cache[1]
+
+        rng = np.random.RandomState(self.epoch)
+        num_samples = len(self.lengths)
+        if self.shuffle:
+            indices = rng.permutation(num_samples)
+        else:
+            indices = np.arange(num_samples)
+        bucket_size = self.bucket_size or max(num_samples, 1)
+
+        batches = []
+        for start in range(0, num_samples, bucket_size):
+            bucket = indices[start : start + bucket_size]
+            # a stable sort keeps the shuffled order of samples with the
+            # same length
+            order = np.argsort(self.lengths[bucket], kind='stable')
+            batches.extend(self._split_bucket(bucket[order]))
+
+        if self.shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+
+        # every process should get the same number of mini-batches
+        if self.nranks > 1:
+            remainder = len(batches) % self.nranks
+            if self.drop_last:
+                batches = batches[: len(batches) - remainder]
+            elif remainder > 0:
+                total = len(batches) + self.nranks - remainder
+                batches = [batches[i % len(batches)] for i in range(total)]
+            batches = batches[self.local_rank :: self.nranks]
+
+        self._batches_cache = (self.epoch, batches)
+        return batches
+
+    def __iter__(self):
+        batches = self._get_batches()
+        if self.shuffle:
+            self.epoch += 1
+        yield from batches
+
+    def __len__(self):
+        return len(self._get_batches())
+
+    def set_epoch(self, epoch):
+        """
+        Sets the epoch number. When :attr:`shuffle=True`, this number is used
+        as seeds of random numbers. By default, users may not set this, all
+        replicas (workers) use a different random ordering for each epoch.
+        If set same number at each epoch, this sampler will yield the same
+        ordering at all epoches.
+
+        Arguments:
+            epoch (int): Epoch number.
+        """
+        self.epoch = epoch
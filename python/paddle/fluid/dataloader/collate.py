@@ -14,6 +14,7 @@
 
 import paddle
 import numbers
+import operator
 import numpy as np
 from ..framework import _non_static_mode
 from .. import core, layers
@@ -79,6 +80,195 @@ def default_collate_fn(batch):
     )
 
 
+class _SchemaMismatch(Exception):
+    pass
+
+
+def _sample_schema(sample):
+    """
+    Get the structure of a sample as a hashable nested tuple, nodes are
+    checked in the same order as default_collate_fn, return None if
+    sample contains data types default_collate_fn cannot handle.
+    """
+    if isinstance(sample, np.ndarray):
+        return ('array', sample.shape, sample.dtype.str)
+    elif isinstance(sample, (paddle.Tensor, core.eager.Tensor)):
+        return ('tensor',)
+    elif isinstance(sample, numbers.Number):
+        return ('number', type(sample))
+    elif isinstance(sample, (str, bytes)):
+        return ('str',)
+    elif isinstance(sample, Mapping):
+        fields = []
+        for key in sample:
+            field = _sample_schema(sample[key])
+            if field is None:
+                return None
+            fields.append((key, field))
+        return ('map', tuple(fields))
+    elif isinstance(sample, Sequence):
+        fields = []
+        for field in sample:
+            field = _sample_schema(field)
+            if field is None:
+                return None
+            fields.append(field)
+        return ('seq', tuple(fields))
+    return None
+
+
+def _path_getter(path):
+    if len(path) == 1:
+        return operator.itemgetter(path[0])
+
+    def _get(sample):
+        for key in path:
+            sample = sample[key]
+        return sample
+
+    return _get
+
+
+class _CollatePlan:
+    """
+    Flat collate plan compiled from a sample schema, collates each leaf
+    field of all samples in one pass, and restores the nested structure
+    from the schema.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        # (getter, kind, info) of each leaf field
+        self.leaves = []
+        # (getter, field number) of each sequence node, samples should
+        # have same field number as default_collate_fn checks
+        self.sequences = []
+        self._compile(schema, ())
+
+    def _compile(self, schema, path):
+        kind = schema[0]
+        if kind == 'map':
+            for key, field in schema[1]:
+                self._compile(field, path + (key,))
+        elif kind == 'seq':
+            if len(path) > 0:
+                self.sequences.append((_path_getter(path), len(schema[1])))
+            for i, field in enumerate(schema[1]):
+                self._compile(field, path + (i,))
+        else:
+            getter = _path_getter(path) if len(path) > 0 else None
+            self.leaves.append((getter, kind, schema[1:]))
+
+    def restore(self, schema, fields):
+        kind = schema[0]
+        if kind == 'map':
+            return {
+                key: self.restore(field, fields) for key, field in schema[1]
+            }
+        elif kind == 'seq':
+            return [self.restore(field, fields) for field in schema[1]]
+        return next(fields)
+
+
+class _CollateEngine:
+    """
+    Structure cached implement of :code:`default_collate_fn`.
+
+    The schema(nesting, dtypes and shapes) of samples is inferred from the
+    first sample of a batch and compiled as a flat collate plan, the plan
+    is reused while samples in following batches have the same schema, and
+    numpy array fields are written into preallocated output buffers
+    directly. Batches not matching the cached schema are collated by
+    :code:`default_collate_fn`.
+
+    Args:
+        reuse_buffer(bool): whether to reuse output buffers across batches,
+            should only be set when collated batch data is always copied
+            out before collating next batch. Default False.
+    """
+
+    def __init__(self, reuse_buffer=False):
+        self._reuse_buffer = reuse_buffer
+        self._plan = None
+        self._buffers = {}
+
+    def _get_buffer(self, idx, shape, dtype):
+        if self._reuse_buffer:
+            # buffers of larger batch size can be reused by smaller
+            # batches, e.g. the last batch
+            buffer = self._buffers.get(idx)
+            if (
+                buffer is None
+                or buffer.shape[1:] != shape[1:]
+                or buffer.shape[0] < shape[0]
+            ):
+                buffer = np.empty(shape, dtype=dtype)
+                self._buffers[idx] = buffer
+            return buffer[: shape[0]]
+        return np.empty(shape, dtype=dtype)
+
+    def _collate_leaf(self, idx, values, kind, info):
+        if kind == 'array':
+            shape, dtype = info
+            dtype = np.dtype(dtype)
+            out = self._get_buffer(idx, (len(values),) + shape, dtype)
+            for i, value in enumerate(values):
+                if (
+                    type(value) is not np.ndarray
+                    or value.shape != shape
+                    or value.dtype != dtype
+                ):
+                    raise _SchemaMismatch()
+                out[i] = value
+            return out
+        elif kind == 'number':
+            number_type = info[0]
+            if not all(type(value) is number_type for value in values):
+                raise _SchemaMismatch()
+            return np.array(values)
+        elif kind == 'tensor':
+            return paddle.stack(values, axis=0)
+        return values
+
+    def _collate(self, plan, batch):
+        num_samples = len(batch)
+        for getter, field_num in plan.sequences:
+            if not all(len(getter(sample)) == field_num for sample in batch):
+                raise _SchemaMismatch()
+
+        fields = []
+        for idx, (getter, kind, info) in enumerate(plan.leaves):
+            values = batch if getter is None else [getter(s) for s in batch]
+            if len(values) != num_samples:
+                raise _SchemaMismatch()
+            fields.append(self._collate_leaf(idx, values, kind, info))
+        return plan.restore(plan.schema, iter(fields))
+
+    def __call__(self, batch):
+        if len(batch) == 0:
+            return default_collate_fn(batch)
+
+        sample = batch[0]
+        # top-level sequence samples should have same field number
+        if isinstance(sample, Sequence) and not isinstance(
+            sample, (str, bytes)
+        ):
+            if not all(len(s) == len(sample) for s in batch):
+                return default_collate_fn(batch)
+
+        schema = _sample_schema(sample)
+        if schema is None:
+            return default_collate_fn(batch)
+        if self._plan is None or self._plan.schema != schema:
+            self._plan = _CollatePlan(schema)
+            self._buffers = {}
+
+        try:
+            return self._collate(self._plan, batch)
+        except (_SchemaMismatch, TypeError, KeyError, IndexError):
+            return default_collate_fn(batch)
+
+
 def default_convert_fn(batch):
     """
     Default batch converting function for :code:`paddle.io.DataLoader`.
@@ -22,7 +22,7 @@ import itertools
 import threading
 import warnings
 import numpy as np
-from collections import namedtuple
+from collections import deque, namedtuple
 from paddle.fluid.framework import (
     _set_expected_place,
     _current_expected_place,
@@ -54,6 +54,7 @@ from .worker import (
     _ResumeIteration,
 )
 from .flat import _flatten_batch, _restore_batch
+from .slab import _SlabBatch, _SlabPool, _use_shm_slab
 from paddle.profiler.timer import benchmark
 
 __all__ = ['get_worker_info']
@@ -168,12 +169,15 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
     def __init__(self, loader):
         super().__init__(loader)
 
+        # NOTE: batch data is copied into LoDTensor before fetching next
+        #       batch in _thread_loop, collate buffers can be reused
         self._dataset_fetcher = _DatasetKind.create_fetcher(
             self._dataset_kind,
             self._dataset,
             self._auto_collate_batch,
             self._collate_fn,
             self._drop_last,
+            reuse_collate_buffer=True,
         )
 
         # NOTE: _structrue_infos used to record the data structure of
@@ -392,6 +396,12 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._task_infos = {}
         self._structure_infos = []
 
+        # NOTE: in out of order mode, batches are output once received,
+        # indices put to each worker of IterableDataset are tracked, and
+        # discarded once the worker is drained, see _get_data
+        self._worker_task_idxs = [set() for _ in range(self._num_workers)]
+        self._drained_workers = deque()
+
         # indices outstand as _outstanding_capacity at first, and
         # blocking_queue capacity is also _outstanding_capacity.
         # _outstanding_capacity here to make sure each indices_queue
@@ -402,6 +412,26 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             self._num_workers, len(self._places)
         )
 
+        # NOTE: in in_order mode, batches loaded ahead of _rcvd_idx are
+        # cached until batch _rcvd_idx is received, reorder_window bounds
+        # the number of outstanding batches instead of prefetch_factor
+        self._in_order = loader.in_order
+        if self._in_order and loader.reorder_window is not None:
+            self._outstanding_capacity = max(
+                loader.reorder_window, len(self._places)
+            )
+
+        # NOTE: [ work stealing ] by default indices are put to workers in
+        # round-robin order, a slow batch blocks indices queued behind it
+        # in the same worker. If batches can be output out of order or in
+        # a reorder window, indices of map-style dataset are put into one
+        # task queue shared by all workers, idle workers take the next
+        # indices from it. Indices of IterableDataset are still put to
+        # each worker, for each worker iterates its own dataset copy
+        self._work_stealing = self._dataset_kind == _DatasetKind.MAP and (
+            not self._in_order or loader.reorder_window is not None
+        )
+
         # see _try_put_indices
         self._thread_lock = threading.Lock()
 
@@ -430,6 +460,17 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             (self._worker_shm_buffer_size) * 2 * self._num_workers
         )
 
+        # NOTE: shared memory slab transport, see slab.py. Batches may be
+        # held in blocking queue, buffered reader and by users at the same
+        # time, keep twice of outstanding capacity slots, batches will be
+        # sent in default way if all slots are in use
+        self._slab_pool = None
+        if self._use_shared_memory and _use_shm_slab():
+            self._slab_pool = _SlabPool(2 * self._outstanding_capacity)
+        # slots assigned with indices which are not received yet, slots
+        # of indices discarded by drained workers are released by us
+        self._task_slots = {}
+
         # init workers and indices queues and put 2 indices in each indices queue
         self._init_workers()
         for _ in range(self._outstanding_capacity):
@@ -455,8 +496,20 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._workers_done_event = multiprocessing.Event()
         self._thread_done_event = threading.Event()
 
+        # NOTE: control messages(_ResumeIteration, None) are put for each
+        # worker, in work stealing mode each worker takes one None from
+        # the shared queue and exits, _ResumeIteration only resets fetcher
+        # of map-style dataset, and workers reply each one, so it's fine
+        # that a worker takes more than one of them
+        task_queue = None
+        if self._work_stealing:
+            task_queue = multiprocessing.Queue()
+
         for i in range(self._num_workers):
-            indices_queue = multiprocessing.Queue()
+            if task_queue is not None:
+                indices_queue = task_queue
+            else:
+                indices_queue = multiprocessing.Queue()
             self._indices_queues.append(indices_queue)
             worker = multiprocessing.Process(
                 target=_worker_loop,
@@ -562,6 +615,13 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._batches_outstanding = 0
         self._task_infos = {}
         self._structure_infos = []
+        self._worker_task_idxs = [set() for _ in range(self._num_workers)]
+        self._drained_workers.clear()
+        # indices left here are skipped by drained workers, all workers
+        # have resumed, no slab will be written any more
+        for slot in self._task_slots.values():
+            self._slab_pool.release(slot)
+        self._task_slots = {}
 
         # set all worker status available
         self._worker_status = [True] * self._num_workers
@@ -598,6 +658,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     for q in self._indices_queues:
                         q.cancel_join_thread()
                         q.close()
+                    if self._slab_pool is not None:
+                        self._slab_pool.close()
             finally:
                 core._erase_process_pids(id(self))
                 self._shutdown = True
@@ -657,12 +719,26 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             # in _send_idx but will not increase _rcvd_idx, so we check
             # whether the worker is still alive here to skip the discarded
             # batch indices and increase _rcvd_idx
-            if self._dataset_kind == _DatasetKind.ITER:
+            if self._dataset_kind == _DatasetKind.ITER and not self._in_order:
+                # NOTE: batches are output once received in out of order
+                #       mode, discard indices left to drained workers only
+                while self._drained_workers:
+                    worker_id = self._drained_workers.popleft()
+                    for idx in self._worker_task_idxs[worker_id]:
+                        del self._task_infos[idx]
+                        self._release_task_slot(idx)
+                        self._batches_outstanding -= 1
+                    self._worker_task_idxs[worker_id].clear()
+                if len(self._task_infos) == 0 and not self._persistent_workers:
+                    if self._batches_outstanding < len(self._places):
+                        return None
+            elif self._dataset_kind == _DatasetKind.ITER:
                 while self._rcvd_idx < self._send_idx:
                     info = self._task_infos[self._rcvd_idx]
                     if len(info) == 3 or self._worker_status[info[0]]:
                         break
                     del self._task_infos[self._rcvd_idx]
+                    self._release_task_slot(self._rcvd_idx)
                     self._rcvd_idx += 1
                     self._batches_outstanding -= 1
                 else:
@@ -746,6 +822,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     else:
                         self._shutdown_worker(data.worker_id)
                         self._batches_outstanding -= 1
+                    if not self._in_order:
+                        self._drained_workers.append(data.worker_id)
                     self._try_put_indices()
                     continue
 
@@ -762,8 +840,19 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._exit_thread_unexpectedly()
                     batch.reraise()
 
-                if idx == self._rcvd_idx:
-                    del self._task_infos[idx]
+                # wrap fields written in shared memory slabs without copy,
+                # the slot is released after the batch freed
+                self._task_slots.pop(idx, None)
+                if isinstance(batch, _SlabBatch):
+                    batch = self._slab_pool.wrap(batch)
+                    # slab pool is closed on shutting down, drop the batch
+                    if batch is None:
+                        continue
+
+                if idx == self._rcvd_idx or not self._in_order:
+                    worker_idx = self._task_infos.pop(idx)[0]
+                    if self._dataset_kind == _DatasetKind.ITER:
+                        self._worker_task_idxs[worker_idx].discard(idx)
                     self._structure_infos.append(structure)
                     return batch
                 else:
@@ -796,11 +885,34 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             else:
                 return
 
-            self._indices_queues[worker_idx].put((self._send_idx, indices))
-            self._task_infos[self._send_idx] = (worker_idx,)
+            slab = None
+            if self._slab_pool is not None:
+                slab = self._slab_pool.acquire()
+            if slab is not None:
+                self._indices_queues[worker_idx].put(
+                    (self._send_idx, indices, slab)
+                )
+                self._task_slots[self._send_idx] = slab[0]
+            else:
+                self._indices_queues[worker_idx].put((self._send_idx, indices))
+            # NOTE: the worker to load the indices is not fixed in work
+            #       stealing mode
+            if self._work_stealing:
+                self._task_infos[self._send_idx] = (None,)
+            else:
+                self._task_infos[self._send_idx] = (worker_idx,)
+            if self._dataset_kind == _DatasetKind.ITER and not self._in_order:
+                self._worker_task_idxs[worker_idx].add(self._send_idx)
             self._batches_outstanding += 1
             self._send_idx += 1
 
+    def _release_task_slot(self, idx):
+        # NOTE: a drained worker skips the indices left in its indices
+        #       queue without writing slabs, release the slot here
+        slot = self._task_slots.pop(idx, None)
+        if slot is not None:
+            self._slab_pool.release(slot)
+
     def __del__(self):
         self._try_shutdown_all()
 
@@ -13,7 +13,9 @@
 # limitations under the License.
 
 import paddle
+import numpy as np
 from .. import framework
+from .collate import default_collate_fn
 
 __all__ = [
     "Dataset",
@@ -40,6 +42,17 @@ class Dataset:
     :code:`__len__`: return dataset sample number. This method is required
     by some implements of :code:`paddle.io.BatchSampler`
 
+    Subclasses can optionally implement following method:
+
+    :code:`__getitems__`: get a batch of samples from dataset with a given
+    list of indices, and return batched data in the same format as
+    :code:`paddle.io.DataLoader` collates samples by default, e.g. a list
+    of fields stacked in axis 0. If implemented, :code:`paddle.io.DataLoader`
+    with default :attr:`collate_fn` will get each batch by calling this
+    method once instead of calling :code:`__getitem__` for each sample,
+    which is useful for datasets whose samples can be fetched by indexing
+    arrays in batch.
+
     see :code:`paddle.io.DataLoader`.
 
     Examples:
@@ -289,10 +302,21 @@ class TensorDataset(Dataset):
     def __getitem__(self, index):
         return tuple(tensor[index] for tensor in self.tensors)
 
+    def __getitems__(self, indices):
+        return [_gather_batch(tensor, indices) for tensor in self.tensors]
+
     def __len__(self):
         return self.tensors[0].shape[0]
 
 
+def _gather_batch(data, indices):
+    # fetch samples at indices from array-like data in the 1st dimension
+    # by one fancy indexing call
+    if isinstance(data, np.ndarray):
+        return data[np.asarray(indices, dtype='int64')]
+    return paddle.gather(data, paddle.to_tensor(indices, dtype='int64'))
+
+
 def to_list(value):
     if value is None:
         return value
@@ -460,6 +484,12 @@ class Subset(Dataset):
     def __getitem__(self, idx):
         return self.dataset[self.indices[idx]]
 
+    def __getitems__(self, indices):
+        indices = [self.indices[idx] for idx in indices]
+        if hasattr(self.dataset, '__getitems__'):
+            return self.dataset.__getitems__(indices)
+        return default_collate_fn([self.dataset[idx] for idx in indices])
+
     def __len__(self):
         return len(self.indices)
 
@@ -14,18 +14,32 @@
 
 import logging
 from ..log_helper import get_logger
+from .collate import default_collate_fn, _CollateEngine
 from collections.abc import Sequence, Mapping
 
 _WARNING_TO_LOG = True
 
 
 class _DatasetFetcher:
-    def __init__(self, dataset, auto_collate_batch, collate_fn, drop_last):
+    def __init__(
+        self,
+        dataset,
+        auto_collate_batch,
+        collate_fn,
+        drop_last,
+        reuse_collate_buffer=False,
+    ):
         self.dataset = dataset
         self.auto_collate_batch = auto_collate_batch
         self.collate_fn = collate_fn
         self.drop_last = drop_last
 
+        # NOTE: default_collate_fn is performed by a structure cached
+        #       collate engine, reuse_collate_buffer should only be set
+        #       if batch data is copied out before fetching next batch
+        if auto_collate_batch and collate_fn is default_collate_fn:
+            self.collate_fn = _CollateEngine(reuse_collate_buffer)
+
     # NOTE: fetch function here perform the whole pipeline of dataset
     #       reading and data trasforms of a batch in each calling, this
     #       may take a long time inside, if DataLoader is exit outside,
@@ -81,8 +95,21 @@ class _DatasetFetcher:
 
 
 class _IterableDatasetFetcher(_DatasetFetcher):
-    def __init__(self, dataset, auto_collate_batch, collate_fn, drop_last):
-        super().__init__(dataset, auto_collate_batch, collate_fn, drop_last)
+    def __init__(
+        self,
+        dataset,
+        auto_collate_batch,
+        collate_fn,
+        drop_last,
+        reuse_collate_buffer=False,
+    ):
+        super().__init__(
+            dataset,
+            auto_collate_batch,
+            collate_fn,
+            drop_last,
+            reuse_collate_buffer,
+        )
         self.dataset_iter = iter(dataset)
 
     def fetch(self, batch_indices, done_event=None):
@@ -116,10 +143,37 @@ class _IterableDatasetFetcher(_DatasetFetcher):
 
 
 class _MapDatasetFetcher(_DatasetFetcher):
-    def __init__(self, dataset, auto_collate_batch, collate_fn, drop_last):
-        super().__init__(dataset, auto_collate_batch, collate_fn, drop_last)
+    def __init__(
+        self,
+        dataset,
+        auto_collate_batch,
+        collate_fn,
+        drop_last,
+        reuse_collate_buffer=False,
+    ):
+        super().__init__(
+            dataset,
+            auto_collate_batch,
+            collate_fn,
+            drop_last,
+            reuse_collate_buffer,
+        )
+        # NOTE: dataset may implement __getitems__ to get a batch of
+        #       samples in one call, it returns batched data in the
+        #       same format as default_collate_fn outputs, so it can
+        #       only be used with default_collate_fn, user defined
+        #       collate_fn should be called with sample list
+        self._use_getitems = (
+            hasattr(dataset, '__getitems__')
+            and collate_fn is default_collate_fn
+        )
 
     def fetch(self, batch_indices, done_event=None):
+        if self.auto_collate_batch and self._use_getitems:
+            if done_event is not None and done_event.is_set():
+                return None
+            return self.dataset.__getitems__(list(batch_indices))
+
         if self.auto_collate_batch:
             data = []
             for idx in batch_indices:
@@ -0,0 +1,273 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import os
+import queue
+import weakref
+from collections import namedtuple
+
+import numpy as np
+
+from .. import core
+
+__all__ = []
+
+# NOTE: [ shared memory slab transport ]
+# In multi-process mode, each ndarray field of a batch is copied into a
+# new LoDTensor by worker and then sent to main process through the
+# inter-process queue with its batch structure. With slab transport
+# enabled, main process owns a fixed number of batch slots, each slot
+# holds one shared memory segment (slab) per batch field. Worker writes
+# fields into the slabs of the slot assigned with the indices, and only
+# sends shape and dtype of each field back, main process wraps slabs as
+# LoDTensor without copy, and recycles the slot after all tensors of the
+# batch are released.
+_SLAB_FLAG = 'FLAGS_use_shm_slab'
+
+# headroom when allocating a slab, so that batches with a slightly
+# larger field (e.g. variable length fields) can reuse the slab
+_SLAB_HEADROOM_RATIO = 0.25
+
+_SlabField = namedtuple('_SlabField', ['shape', 'dtype'])
+
+
+def _use_shm_slab():
+    return os.environ.get(_SLAB_FLAG, False) in [1, '1', True, 'True', 'true']
+
+
+def _slab_compatible(field):
+    return (
+        isinstance(field, np.ndarray)
+        and field.dtype.kind in 'biuf'
+        and field.nbytes > 0
+    )
+
+
+def _untrack(shm):
+    # NOTE: attaching a segment registers it to the resource tracker of
+    # current process, which will unlink it when the process exits. Slabs
+    # are owned by main process, unregister in workers
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+def _close_segment(shm, unlink=False):
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    try:
+        shm.close()
+    except BufferError:
+        # tensors still hold views of the slab, the mapping will be
+        # released when they are garbage collected
+        pass
+
+
+class _SlabBatch:
+    """
+    Flat batch sent from worker to main process in slab transport mode.
+
+    Args:
+        slot(int): the slot id assigned by main process.
+        fields(list): per field, a :code:`_SlabField` if the field was
+            written into the slab, otherwise the field itself as in the
+            default transport.
+        nbytes(list(int)): per field, the bytes needed to hold the field
+            in a slab, 0 for fields which cannot be held in a slab.
+    """
+
+    def __init__(self, slot, fields, nbytes):
+        self.slot = slot
+        self.fields = fields
+        self.nbytes = nbytes
+
+
+class _SlabWriter:
+    """
+    Worker side of slab transport, attach slabs of the assigned slot
+    and write batch fields into them.
+    """
+
+    def __init__(self):
+        self._segments = {}
+        self._slot_names = {}
+
+    def _attach(self, name):
+        shm = self._segments.get(name)
+        if shm is None:
+            from multiprocessing import shared_memory
+
+            shm = shared_memory.SharedMemory(name=name)
+            _untrack(shm)
+            self._segments[name] = shm
+        return shm
+
+    def _detach_stale(self, slot, names):
+        # slabs of a slot may be reallocated by main process if the
+        # field grows, close the segments attached before
+        stale = set(self._slot_names.get(slot, [])) - set(names)
+        for name in stale:
+            shm = self._segments.pop(name, None)
+            if shm is not None:
+                _close_segment(shm)
+        self._slot_names[slot] = names
+
+    def write(self, slot, names, flat_batch, to_tensor):
+        self._detach_stale(slot, [n for n in names if n is not None])
+
+        fields, nbytes = [], []
+        for i, field in enumerate(flat_batch):
+            if not _slab_compatible(field):
+                nbytes.append(0)
+                fields.append(to_tensor(field))
+                continue
+
+            nbytes.append(field.nbytes)
+            name = names[i] if i < len(names) else None
+            if name is not None:
+                shm = self._attach(name)
+                if shm.size >= field.nbytes:
+                    dst = np.ndarray(field.shape, field.dtype, buffer=shm.buf)
+                    np.copyto(dst, field, casting='no')
+                    del dst
+                    fields.append(_SlabField(field.shape, field.dtype.str))
+                    continue
+            # slab not allocated yet or too small, send the field in
+            # default way, main process will (re)allocate the slab
+            fields.append(to_tensor(field))
+        return _SlabBatch(slot, fields, nbytes)
+
+    def close(self):
+        for shm in self._segments.values():
+            _close_segment(shm)
+        self._segments = {}
+        self._slot_names = {}
+
+
+class _SlabPool:
+    """
+    Main process side of slab transport, owns the batch slots and the
+    slabs of each slot, wraps slabs received from workers as LoDTensor
+    without copy.
+
+    Args:
+        num_slots(int): number of batch slots, a batch will be sent in
+            default way if there is no free slot.
+    """
+
+    def __init__(self, num_slots):
+        self._num_slots = num_slots
+        self._segments = [[] for _ in range(num_slots)]
+        # NOTE: slots are released in weakref finalizer which may be
+        # called in any thread or re-entered during GC, SimpleQueue.put
+        # is reentrant and safe here
+        self._free_slots = queue.SimpleQueue()
+        for slot in range(num_slots):
+            self._free_slots.put(slot)
+        self._closed = False
+
+    def acquire(self):
+        """
+        Get a free slot and the slab names of it, return None if there
+        is no free slot.
+        """
+        if self._closed:
+            return None
+        try:
+            slot = self._free_slots.get_nowait()
+        except queue.Empty:
+            return None
+        names = [
+            s.name if s is not None else None for s in self._segments[slot]
+        ]
+        return slot, names
+
+    def release(self, slot):
+        self._free_slots.put(slot)
+
+    def _grow(self, slot, field_idx, nbytes):
+        from multiprocessing import shared_memory
+
+        segments = self._segments[slot]
+        if len(segments) <= field_idx:
+            segments.extend([None] * (field_idx + 1 - len(segments)))
+        # NOTE: slabs of a slot are only reallocated when the slot is in
+        # use by current batch and the field is not held in the slab, no
+        # tensor refers to the old slab
+        if segments[field_idx] is not None:
+            _close_segment(segments[field_idx], unlink=True)
+        size = nbytes + int(nbytes * _SLAB_HEADROOM_RATIO)
+        segments[field_idx] = shared_memory.SharedMemory(create=True, size=size)
+
+    def wrap(self, batch):
+        """
+        Wrap a :code:`_SlabBatch` from worker as a list of LoDTensor, the
+        slot will be released after all tensors wrapped from slabs freed.
+        Return None if the pool is closed, slabs have been unlinked and
+        the batch is dropped on shutting down.
+        """
+        if self._closed:
+            return None
+        segments = self._segments[batch.slot]
+        tensors, views = [], []
+        for i, field in enumerate(batch.fields):
+            if isinstance(field, _SlabField):
+                view = np.ndarray(
+                    field.shape, np.dtype(field.dtype), buffer=segments[i].buf
+                )
+                tensor = core.LoDTensor()
+                tensor.set(view, core.CPUPlace(), True)
+                views.append(view)
+                tensors.append(tensor)
+            else:
+                if batch.nbytes[i] > 0 and not self._closed:
+                    self._grow(batch.slot, i, batch.nbytes[i])
+                tensors.append(field)
+
+        if len(views) == 0:
+            self.release(batch.slot)
+        else:
+            self._release_on_free(batch.slot, views)
+        return tensors
+
+    def _release_on_free(self, slot, views):
+        # NOTE: LoDTensor set in zero copy mode holds a reference of the
+        # numpy view, views are freed when the tensors are freed. next()
+        # on itertools.count is atomic, only the last finalizer releases
+        counter = itertools.count()
+        num_views = len(views)
+
+        def _on_free():
+            if next(counter) == num_views - 1:
+                self.release(slot)
+
+        for view in views:
+            weakref.finalize(view, _on_free)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for segments in self._segments:
+            for shm in segments:
+                if shm is not None:
+                    _close_segment(shm, unlink=True)
+        self._segments = [[] for _ in range(self._num_slots)]
@@ -27,6 +27,7 @@ from ..multiprocess_utils import (
 )
 from ..framework import _non_static_mode, _in_eager_without_dygraph_check
 from .flat import _flatten_batch
+from .slab import _SlabWriter
 
 import queue
 
@@ -48,15 +49,28 @@ class _DatasetKind:
 
     @staticmethod
     def create_fetcher(
-        kind, dataset, auto_collate_batch, collate_fn, drop_last
+        kind,
+        dataset,
+        auto_collate_batch,
+        collate_fn,
+        drop_last,
+        reuse_collate_buffer=False,
     ):
         if kind == _DatasetKind.MAP:
             return _MapDatasetFetcher(
-                dataset, auto_collate_batch, collate_fn, drop_last
+                dataset,
+                auto_collate_batch,
+                collate_fn,
+                drop_last,
+                reuse_collate_buffer,
             )
         elif kind == _DatasetKind.ITER:
             return _IterableDatasetFetcher(
-                dataset, auto_collate_batch, collate_fn, drop_last
+                dataset,
+                auto_collate_batch,
+                collate_fn,
+                drop_last,
+                reuse_collate_buffer,
             )
         else:
             raise NotImplementedError("unknown Dataset kind {}".format(kind))
@@ -277,6 +291,7 @@ def _worker_loop(
     base_seed,
     shm_cahce_size=0,
 ):
+    slab_writer = None
     try:
         # NOTE: [ mmap files clear ] When the child process exits unexpectedly,
         # some shared memory objects may have been applied for but have not yet
@@ -314,14 +329,23 @@ def _worker_loop(
         try:
             if init_fn is not None:
                 init_fn(worker_id)
+            # NOTE: batch data is copied into LoDTensor synchronously
+            #       in shared memory mode, collate buffers can be reused
             fetcher = _DatasetKind.create_fetcher(
-                dataset_kind, dataset, auto_collate_batch, collate_fn, drop_last
+                dataset_kind,
+                dataset,
+                auto_collate_batch,
+                collate_fn,
+                drop_last,
+                use_shared_memory,
             )
         except:
             init_exception = _WorkerException(worker_id)
 
         iterator_drained = False
         parent_watch_dog = ParentWatchDog()
+        if use_shared_memory:
+            slab_writer = _SlabWriter()
 
         while parent_watch_dog.is_alive():
             try:
@@ -333,7 +357,12 @@ def _worker_loop(
                 out_queue.put((data, None, None))
                 iterator_drained = False
                 fetcher = _DatasetKind.create_fetcher(
-                    dataset_kind, dataset, auto_collate_batch, collate_fn, True
+                    dataset_kind,
+                    dataset,
+                    auto_collate_batch,
+                    collate_fn,
+                    True,
+                    use_shared_memory,
                 )
                 continue
 
@@ -348,7 +377,10 @@ def _worker_loop(
             if done_event.is_set() or iterator_drained:
                 continue
 
-            idx, indices = data
+            # NOTE: a slab slot (slot id, slab names) will be assigned with
+            # indices if slab transport is enabled, see slab.py
+            idx, indices = data[0], data[1]
+            slab = data[2] if len(data) > 2 else None
             try:
                 if init_exception is not None:
                     batch = init_exception
@@ -381,12 +413,18 @@ def _worker_loop(
                         lodtensor.set(arr, core.CPUPlace())
                         return lodtensor
 
-                    tensor_list = [
-                        numpy2lodtensor(b)
-                        if isinstance(b, np.ndarray)
-                        else b.value().get_tensor()
-                        for b in batch
-                    ]
+                    def to_tensor(b):
+                        if isinstance(b, np.ndarray):
+                            return numpy2lodtensor(b)
+                        return b.value().get_tensor()
+
+                    if slab is not None:
+                        slot, names = slab
+                        tensor_list = slab_writer.write(
+                            slot, names, batch, to_tensor
+                        )
+                    else:
+                        tensor_list = [to_tensor(b) for b in batch]
                     out_queue.put((idx, tensor_list, structure))
                 else:
                     out_queue.put((idx, batch, structure))
@@ -397,4 +435,6 @@ def _worker_loop(
         raise
     finally:
         if use_shared_memory:
+            if slab_writer is not None:
+                slab_writer.close()
             _cleanup_mmap()
@@ -400,12 +400,32 @@ class DataLoader:
             as True only when the shared memory space on your machine(e.g.
             space of '/dev/shm' on Linux operating sysytem) is large enough.
             Shared memory will only be enabled in multi-process mode(num_workers
-            > 0). Default True.
+            > 0). If environment variable :code:`FLAGS_use_shm_slab` is set,
+            workers will write numpy fields of batch into reusable shared
+            memory slabs, which will be wrapped as Tensor without copy in main
+            process. Default True.
         timeout(int, optional): the timeout value for getting data form output queue
             of subprocesses. Default 0.
         worker_init_fn(callable, optional): init function which will be called with
             worker id on each subproces starting if not set as None. Default
             None.
+        in_order(bool, optional): whether to output batches in the order of
+            batch indices in multi-process mode. If :attr:`in_order` is False,
+            batches are output as soon as they are loaded by workers, so that
+            a slow batch does not stall the output of others. Default True.
+        reorder_window(int, optional): the number of batches which can be
+            loaded ahead of the next batch to output in multi-process mode when
+            :attr:`in_order` is True, which bounds the memory held by batches
+            waiting for a slow batch. It is ignored with a warning if
+            :attr:`in_order` is False. Default None, which means
+            :attr:`prefetch_factor` times the number of workers.
+
+    .. note::
+        If :attr:`in_order` is False or :attr:`reorder_window` is set, batch
+        indices of map-style dataset are put into a task queue shared by all
+        workers, and each worker takes the next indices once it is idle. Which
+        worker loads a batch is not fixed in this mode, random states of
+        workers may be applied to different batches among runs.
 
     Returns:
         DataLoader: an iterable object for data iterating, each elemnet of the generated data is a Tensor.
@@ -496,6 +516,8 @@ class DataLoader:
         timeout=0,
         worker_init_fn=None,
         persistent_workers=False,
+        in_order=True,
+        reorder_window=None,
     ):
         self.return_list = return_list
         self.collate_fn = collate_fn
@@ -539,6 +561,18 @@ class DataLoader:
         assert timeout >= 0, "timeout should be a non-negative value"
         self.timeout = timeout
 
+        assert (
+            reorder_window is None or reorder_window > 0
+        ), "reorder_window should be None or a positive value"
+        if not in_order and reorder_window is not None:
+            warnings.warn(
+                "reorder_window is only used when in_order is True, "
+                "it is ignored as batches are output out of order"
+            )
+            reorder_window = None
+        self.in_order = in_order
+        self.reorder_window = reorder_window
+
         if isinstance(dataset, IterableDataset):
             self.dataset_kind = _DatasetKind.ITER
             if shuffle:
@@ -0,0 +1,115 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the per-call latency of the filterbank, DCT and window
+# matrices of paddle.audio with and without their cache, run it by:
+#   python benchmark_audio_features.py --sr 16000 --n_fft 512 --n_mels 64
+
+import argparse
+import time
+
+import paddle
+from paddle.audio.features import MFCC, MelSpectrogram
+from paddle.audio.functional import compute_fbank_matrix, create_dct, get_window
+
+
+def timeit(func, repeat, clear_fn=None):
+    costs = []
+    for _ in range(repeat):
+        if clear_fn is not None:
+            clear_fn()
+        start = time.perf_counter()
+        func()
+        costs.append(time.perf_counter() - start)
+    costs.sort()
+    return costs[len(costs) // 2]
+
+
+def clear_all():
+    compute_fbank_matrix.cache_clear()
+    create_dct.cache_clear()
+    get_window.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sr', type=int, default=16000)
+    parser.add_argument('--n_fft', type=int, default=512)
+    parser.add_argument('--n_mels', type=int, default=64)
+    parser.add_argument('--n_mfcc', type=int, default=40)
+    parser.add_argument('--duration', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--device', type=str, default='cpu')
+    args = parser.parse_args()
+    paddle.set_device(args.device)
+
+    waveform = paddle.randn([1, int(args.sr * args.duration)])
+    cases = [
+        (
+            'fbank_matrix',
+            lambda: compute_fbank_matrix(
+                sr=args.sr, n_fft=args.n_fft, n_mels=args.n_mels
+            ),
+        ),
+        ('dct', lambda: create_dct(n_mfcc=args.n_mfcc, n_mels=args.n_mels)),
+        ('window', lambda: get_window('hann', args.n_fft, dtype='float32')),
+        (
+            'MelSpectrogram()',
+            lambda: MelSpectrogram(
+                sr=args.sr, n_fft=args.n_fft, n_mels=args.n_mels
+            ),
+        ),
+        (
+            'MFCC()',
+            lambda: MFCC(
+                sr=args.sr,
+                n_mfcc=args.n_mfcc,
+                n_fft=args.n_fft,
+                n_mels=args.n_mels,
+            ),
+        ),
+        (
+            # a feature layer constructed for every request
+            'request',
+            lambda: MFCC(
+                sr=args.sr,
+                n_mfcc=args.n_mfcc,
+                n_fft=args.n_fft,
+                n_mels=args.n_mels,
+            )(waveform).numpy(),
+        ),
+    ]
+
+    print(
+        'sr: {}, n_fft: {}, n_mels: {}, device: {}'.format(
+            args.sr, args.n_fft, args.n_mels, args.device
+        )
+    )
+    print(
+        '{:<20}{:>12}{:>12}{:>10}'.format('op', 'cold(ms)', 'cached(ms)', 'x')
+    )
+    for name, func in cases:
+        # warm up the kernels
+        func()
+        cold = timeit(func, args.repeat, clear_all)
+        cached = timeit(func, args.repeat)
+        print(
+            '{:<20}{:>12.3f}{:>12.3f}{:>10.1f}'.format(
+                name, cold * 1000, cached * 1000, cold / cached
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
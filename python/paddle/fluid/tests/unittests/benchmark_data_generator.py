@@ -0,0 +1,180 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the text and binary output formats of MultiSlotDataGenerator
+# on synthetic CTR samples, it reports lines/sec of generating records for
+# each sample and for blocks of samples, and of loading them by
+# InMemoryDataset with --load, run it by:
+#   python benchmark_data_generator.py --num_lines 100000 --num_slots 300 --load
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import paddle
+from paddle.distributed.fleet import MultiSlotDataGenerator
+
+FEED_TYPES = {
+    'text': 'MultiSlotInMemoryDataFeed',
+    'binary': 'MultiSlotBinaryInMemoryDataFeed',
+}
+
+
+def synthetic_samples(num_lines, num_slots, max_feasigns, seed):
+    rng = np.random.RandomState(seed)
+    samples = []
+    for _ in range(num_lines):
+        lengths = rng.randint(1, max_feasigns + 1, size=num_slots)
+        feasigns = rng.randint(1, 1 << 40, size=lengths.sum()).tolist()
+        sample = [("label", [int(rng.randint(0, 2))])]
+        start = 0
+        for i, length in enumerate(lengths.tolist()):
+            sample.append(
+                ("slot_{}".format(i), feasigns[start : start + length])
+            )
+            start += length
+        samples.append(sample)
+    return samples
+
+
+def to_blocks(samples, block_size):
+    # columnar arrays returned by generate_block
+    blocks = []
+    for start in range(0, len(samples), block_size):
+        block = samples[start : start + block_size]
+        slots = []
+        for index, (name, _) in enumerate(block[0]):
+            values = [sample[index][1] for sample in block]
+            lengths = [len(v) for v in values]
+            slots.append(
+                (
+                    name,
+                    np.array([v for vs in values for v in vs], dtype='uint64'),
+                    np.concatenate([[0], np.cumsum(lengths)]),
+                )
+            )
+        blocks.append(slots)
+    return blocks
+
+
+def generate(samples, output_format):
+    generator = MultiSlotDataGenerator()
+    if output_format == 'binary':
+        gen = generator._gen_bytes
+    else:
+        gen = generator._gen_str
+    start = time.perf_counter()
+    records = [gen(sample) for sample in samples]
+    return time.perf_counter() - start, records
+
+
+def generate_blocks(blocks, output_format):
+    generator = MultiSlotDataGenerator()
+    if output_format == 'binary':
+        gen = generator._gen_block_bytes
+    else:
+        gen = generator._gen_block_str
+    start = time.perf_counter()
+    records = [gen(block) for block in blocks]
+    return time.perf_counter() - start, records
+
+
+def load(filename, slot_names, feed_type):
+    paddle.enable_static()
+    main_program = paddle.static.Program()
+    with paddle.static.program_guard(main_program):
+        use_var = [
+            paddle.static.data(
+                name=name, shape=[-1, 1], dtype="int64", lod_level=1
+            )
+            for name in slot_names
+        ]
+    dataset = paddle.distributed.InMemoryDataset()
+    dataset.init(
+        batch_size=32,
+        thread_num=1,
+        pipe_command="cat",
+        use_var=use_var,
+        data_feed_type=feed_type,
+    )
+    dataset.set_filelist([filename])
+    start = time.perf_counter()
+    dataset.load_into_memory()
+    cost = time.perf_counter() - start
+    num_lines = dataset.get_memory_data_size()
+    dataset.release_memory()
+    return cost, num_lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num_lines', type=int, default=100000)
+    parser.add_argument('--num_slots', type=int, default=300)
+    parser.add_argument('--max_feasigns', type=int, default=4)
+    parser.add_argument('--block_size', type=int, default=1024)
+    parser.add_argument(
+        '--load',
+        action='store_true',
+        help='also load the records by InMemoryDataset',
+    )
+    args = parser.parse_args()
+
+    samples = synthetic_samples(
+        args.num_lines, args.num_slots, args.max_feasigns, 0
+    )
+    blocks = to_blocks(samples, args.block_size)
+    slot_names = [name for name, _ in samples[0]]
+    print('num_lines: {}, num_slots: {}'.format(args.num_lines, args.num_slots))
+    print(
+        '{:<8}{:>16}{:>16}{:>16}{:>12}'.format(
+            'format', 'generate(l/s)', 'block(l/s)', 'load(l/s)', 'size(MB)'
+        )
+    )
+
+    temp_dir = tempfile.TemporaryDirectory()
+    for output_format, feed_type in FEED_TYPES.items():
+        cost, records = generate(samples, output_format)
+        generate_speed = args.num_lines / cost
+        cost, block_records = generate_blocks(blocks, output_format)
+        block_speed = args.num_lines / cost
+        if output_format == 'binary':
+            assert b''.join(block_records) == b''.join(records)
+        else:
+            assert ''.join(block_records) == ''.join(records)
+
+        filename = os.path.join(temp_dir.name, output_format)
+        mode = 'wb' if output_format == 'binary' else 'w'
+        with open(filename, mode) as f:
+            for record in records:
+                f.write(record)
+        size = os.path.getsize(filename) / (1 << 20)
+
+        load_speed = '-'
+        if args.load:
+            cost, num_lines = load(filename, slot_names, feed_type)
+            assert num_lines == args.num_lines
+            load_speed = '{:.0f}'.format(args.num_lines / cost)
+        print(
+            '{:<8}{:>16.0f}{:>16.0f}{:>16}{:>12.1f}'.format(
+                output_format, generate_speed, block_speed, load_speed, size
+            )
+        )
+    temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
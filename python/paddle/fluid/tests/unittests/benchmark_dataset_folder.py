@@ -0,0 +1,111 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of DatasetFolder loading with and without fused_decode on a
+# directory of generated JPEG images, run it by:
+#   python benchmark_dataset_folder.py --num_images 200 --backend pil
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+import paddle.vision.transforms as T
+from paddle.vision import set_image_backend
+from paddle.vision.datasets import DatasetFolder
+
+
+def make_images(root, num_images, height, width, num_classes=2):
+    rng = np.random.RandomState(0)
+    # smooth images compress like photos, noise would not
+    y, x = np.mgrid[0:height, 0:width]
+    for i in range(num_images):
+        class_dir = os.path.join(root, 'class_{}'.format(i % num_classes))
+        os.makedirs(class_dir, exist_ok=True)
+        phase = rng.randint(0, 256, size=3)
+        image = np.stack(
+            [(x + phase[0]), (y + phase[1]), (x + y + phase[2])], axis=-1
+        )
+        image = (image % 256).astype('uint8')
+        Image.fromarray(image).save(
+            os.path.join(class_dir, '{}.jpg'.format(i)), quality=90
+        )
+
+
+def iterate(dataset, repeat):
+    costs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(len(dataset)):
+            dataset[i]
+        costs.append(time.perf_counter() - start)
+    return min(costs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num_images', type=int, default=200)
+    parser.add_argument('--height', type=int, default=768)
+    parser.add_argument('--width', type=int, default=1024)
+    parser.add_argument('--size', type=int, default=224)
+    parser.add_argument('--backend', default='pil', choices=['pil', 'cv2'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument(
+        '--data_dir',
+        default=None,
+        help='directory of images, generated into a temporary one if unset',
+    )
+    args = parser.parse_args()
+
+    set_image_backend(args.backend)
+    root = args.data_dir
+    if root is None:
+        root = tempfile.mkdtemp()
+        make_images(root, args.num_images, args.height, args.width)
+
+    transforms = {
+        'resize': T.Compose([T.Resize(args.size), T.CenterCrop(args.size)]),
+        'random_resized_crop': T.RandomResizedCrop(args.size),
+    }
+    try:
+        print('backend: {}, size: {}'.format(args.backend, args.size))
+        print(
+            '{:<22}{:>12}{:>12}{:>10}'.format(
+                'transform', 'default(s)', 'fused(s)', 'x'
+            )
+        )
+        for name, transform in transforms.items():
+            default_cost = iterate(
+                DatasetFolder(root, transform=transform), args.repeat
+            )
+            fused_cost = iterate(
+                DatasetFolder(root, transform=transform, fused_decode=True),
+                args.repeat,
+            )
+            print(
+                '{:<22}{:>12.4f}{:>12.4f}{:>10.2f}'.format(
+                    name, default_cost, fused_cost, default_cost / fused_cost
+                )
+            )
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
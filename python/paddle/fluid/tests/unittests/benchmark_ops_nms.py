@@ -0,0 +1,169 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of multi-class paddle.vision.ops.nms against the loop over
+# categories it used before, run it by:
+#   python benchmark_ops_nms.py --device gpu --batch_size 8
+
+import argparse
+import time
+
+import numpy as np
+
+import paddle
+from paddle import _C_ops
+
+
+def nms_category_loop(boxes, iou_threshold, scores, category_idxs, categories):
+    # the implementation which launches NMS for each category
+    mask = paddle.zeros_like(scores, dtype=paddle.int32)
+    for category_id in categories:
+        cur_category_boxes_idxs = paddle.where(category_idxs == category_id)[0]
+        shape = cur_category_boxes_idxs.shape[0]
+        cur_category_boxes_idxs = paddle.reshape(
+            cur_category_boxes_idxs, [shape]
+        )
+        if shape == 0:
+            continue
+        elif shape == 1:
+            mask[cur_category_boxes_idxs] = 1
+            continue
+        cur_category_boxes = boxes[cur_category_boxes_idxs]
+        cur_category_scores = scores[cur_category_boxes_idxs]
+        cur_category_sorted_indices = paddle.argsort(
+            cur_category_scores, descending=True
+        )
+        cur_category_sorted_boxes = cur_category_boxes[
+            cur_category_sorted_indices
+        ]
+        cur_category_keep_boxes_sub_idxs = cur_category_sorted_indices[
+            _C_ops.nms(cur_category_sorted_boxes, iou_threshold)
+        ]
+        updates = paddle.ones_like(
+            cur_category_boxes_idxs[cur_category_keep_boxes_sub_idxs],
+            dtype=paddle.int32,
+        )
+        mask = paddle.scatter(
+            mask,
+            cur_category_boxes_idxs[cur_category_keep_boxes_sub_idxs],
+            updates,
+            overwrite=True,
+        )
+    keep_boxes_idxs = paddle.where(mask)[0]
+    shape = keep_boxes_idxs.shape[0]
+    keep_boxes_idxs = paddle.reshape(keep_boxes_idxs, [shape])
+    sorted_sub_indices = paddle.argsort(
+        scores[keep_boxes_idxs], descending=True
+    )
+    return keep_boxes_idxs[sorted_sub_indices]
+
+
+def gen_image(num_boxes, num_categories):
+    boxes = np.random.rand(num_boxes, 4).astype('float32') * 600
+    boxes[:, 2:] = boxes[:, :2] + np.random.rand(num_boxes, 2) * 200 + 1
+    scores = np.random.rand(num_boxes).astype('float32')
+    category_idxs = np.random.randint(0, num_categories, num_boxes)
+    return boxes, scores, category_idxs
+
+
+def timeit(func, repeat):
+    func()  # warmup
+    paddle.device.synchronize()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = func()
+    paddle.device.synchronize()
+    return (time.perf_counter() - start) / repeat, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--device', type=str, default='cpu')
+    parser.add_argument('--batch_size', type=int, default=8)
+    parser.add_argument('--num_boxes', type=int, default=1000)
+    parser.add_argument('--num_categories', type=int, default=80)
+    parser.add_argument('--iou_threshold', type=float, default=0.5)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    paddle.set_device(args.device)
+
+    categories = list(range(args.num_categories))
+    images = [
+        [
+            paddle.to_tensor(x)
+            for x in gen_image(args.num_boxes, args.num_categories)
+        ]
+        for _ in range(args.batch_size)
+    ]
+
+    def run_loop():
+        return [
+            nms_category_loop(
+                boxes, args.iou_threshold, scores, category_idxs, categories
+            )
+            for boxes, scores, category_idxs in images
+        ]
+
+    def run_batched():
+        return [
+            paddle.vision.ops.nms(
+                boxes, args.iou_threshold, scores, category_idxs
+            )
+            for boxes, scores, category_idxs in images
+        ]
+
+    # all images in one call, categories of each image are distinguished by
+    # image_id * num_categories + category_id
+    batch_boxes = paddle.concat([image[0] for image in images])
+    batch_scores = paddle.concat([image[1] for image in images])
+    batch_category_idxs = paddle.concat(
+        [
+            image[2] + image_id * args.num_categories
+            for image_id, image in enumerate(images)
+        ]
+    )
+
+    def run_one_call():
+        return paddle.vision.ops.nms(
+            batch_boxes, args.iou_threshold, batch_scores, batch_category_idxs
+        )
+
+    loop_cost, loop_out = timeit(run_loop, args.repeat)
+    batched_cost, batched_out = timeit(run_batched, args.repeat)
+    one_call_cost, one_call_out = timeit(run_one_call, args.repeat)
+
+    for expected, out in zip(loop_out, batched_out):
+        np.testing.assert_array_equal(expected.numpy(), out.numpy())
+    assert one_call_out.shape[0] == sum(out.shape[0] for out in loop_out)
+
+    print(
+        'device: {}, batch_size: {}, num_boxes: {}, num_categories: {}'.format(
+            args.device, args.batch_size, args.num_boxes, args.num_categories
+        )
+    )
+    print('loop over categories:  {:.3f} ms'.format(loop_cost * 1000))
+    print(
+        'one call per image:    {:.3f} ms, {:.1f}x'.format(
+            batched_cost * 1000, loop_cost / batched_cost
+        )
+    )
+    print(
+        'one call per batch:    {:.3f} ms, {:.1f}x'.format(
+            one_call_cost * 1000, loop_cost / one_call_cost
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the interval set used by profiler statistic on synthetic
+# traces, run it by:
+#   python benchmark_profiler_statistic.py --num_events 1000000
+
+import argparse
+import time
+
+import numpy as np
+
+from paddle.profiler.statistic_helper import IntervalSet, aggregate_durations
+
+
+def synthetic_trace(num_events, num_streams, seed):
+    # events of each stream are sequential with random gaps, like kernels
+    # launched on a stream
+    rng = np.random.RandomState(seed)
+    durations = rng.randint(1, 1000, size=num_events).astype('int64')
+    gaps = rng.randint(0, 1000 * num_streams, size=num_events).astype('int64')
+    stream_ids = rng.randint(0, num_streams, size=num_events)
+    starts = np.empty(num_events, dtype='int64')
+    for stream_id in range(num_streams):
+        mask = stream_ids == stream_id
+        starts[mask] = np.cumsum(gaps[mask] + durations[mask]) - durations[mask]
+    order = rng.permutation(num_events)
+    return starts[order], starts[order] + durations[order]
+
+
+def python_merge(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def python_intersection(ranges1, ranges2):
+    i, j = 0, 0
+    results = []
+    while i < len(ranges1) and j < len(ranges2):
+        start = max(ranges1[i][0], ranges2[j][0])
+        end = min(ranges1[i][1], ranges2[j][1])
+        if start < end:
+            results.append((start, end))
+        if ranges1[i][1] < ranges2[j][1]:
+            i += 1
+        else:
+            j += 1
+    return results
+
+
+def timeit(func, repeat):
+    costs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        costs.append(time.perf_counter() - start)
+    return min(costs), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num_events', type=int, default=1000000)
+    parser.add_argument('--num_streams', type=int, default=8)
+    parser.add_argument('--num_kernels', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument(
+        '--skip_python',
+        action='store_true',
+        help='skip the pure python reference implementation',
+    )
+    args = parser.parse_args()
+
+    starts1, ends1 = synthetic_trace(args.num_events, args.num_streams, 1)
+    starts2, ends2 = synthetic_trace(args.num_events, args.num_streams, 2)
+    ranges1 = list(zip(starts1.tolist(), ends1.tolist()))
+    ranges2 = list(zip(starts2.tolist(), ends2.tolist()))
+
+    print(
+        'num_events: {}, num_streams: {}'.format(
+            args.num_events, args.num_streams
+        )
+    )
+    print('{:<16}{:>12}{:>12}{:>10}'.format('op', 'numpy(s)', 'python(s)', 'x'))
+
+    def report(name, numpy_cost, python_cost):
+        if python_cost is None:
+            print(
+                '{:<16}{:>12.4f}{:>12}{:>10}'.format(name, numpy_cost, '-', '-')
+            )
+        else:
+            print(
+                '{:<16}{:>12.4f}{:>12.4f}{:>10.1f}'.format(
+                    name, numpy_cost, python_cost, python_cost / numpy_cost
+                )
+            )
+
+    numpy_cost, set1 = timeit(lambda: IntervalSet(starts1, ends1), args.repeat)
+    python_cost, merged1 = (
+        (None, None)
+        if args.skip_python
+        else timeit(lambda: python_merge(ranges1), args.repeat)
+    )
+    if merged1 is not None:
+        assert set1.to_list() == merged1
+    report('merge', numpy_cost, python_cost)
+
+    set2 = IntervalSet(starts2, ends2)
+    merged2 = None if args.skip_python else python_merge(ranges2)
+    numpy_cost, _ = timeit(lambda: set1.union(set2), args.repeat)
+    python_cost = (
+        None
+        if args.skip_python
+        else timeit(lambda: python_merge(merged1 + merged2), args.repeat)[0]
+    )
+    report('union', numpy_cost, python_cost)
+
+    numpy_cost, intersection = timeit(
+        lambda: set1.intersection(set2), args.repeat
+    )
+    if args.skip_python:
+        python_cost = None
+    else:
+        python_cost, expected = timeit(
+            lambda: python_intersection(merged1, merged2), args.repeat
+        )
+        assert intersection.total() == sum(e - s for s, e in expected)
+    report('intersection', numpy_cost, python_cost)
+
+    numpy_cost, _ = timeit(lambda: set1.difference(set2), args.repeat)
+    report('difference', numpy_cost, None)
+
+    names = [
+        'kernel_{}'.format(i)
+        for i in np.random.randint(0, args.num_kernels, size=args.num_events)
+    ]
+    durations = (ends1 - starts1).tolist()
+    numpy_cost, _ = timeit(
+        lambda: aggregate_durations(names, durations), args.repeat
+    )
+    report('aggregate', numpy_cost, None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the throughput of paddle.reader.xmap_readers with thread and
+# process workers on a CPU bound mapper, run it by:
+#   python benchmark_xmap_readers.py --num_samples 2000 --process_num 8
+
+import argparse
+import time
+
+import numpy as np
+
+from paddle.reader import xmap_readers
+
+
+def sample_reader(num_samples, image_size):
+    def reader():
+        rng = np.random.RandomState(0)
+        for _ in range(num_samples):
+            yield rng.randint(0, 256, [image_size, image_size, 3], 'uint8')
+
+    return reader
+
+
+def make_mapper(work):
+    def mapper(image):
+        # python loops hold the GIL like most legacy mappers do
+        total = 0
+        for i in range(work):
+            total += i
+        image = image.astype('float32') / 255.0
+        return image.transpose([2, 0, 1]), total
+
+    return mapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num_samples', type=int, default=2000)
+    parser.add_argument('--image_size', type=int, default=224)
+    parser.add_argument('--work', type=int, default=100000)
+    parser.add_argument('--process_num', type=int, default=8)
+    parser.add_argument('--buffer_size', type=int, default=64)
+    args = parser.parse_args()
+
+    reader = sample_reader(args.num_samples, args.image_size)
+    mapper = make_mapper(args.work)
+    print(
+        'num_samples: {}, image_size: {}, process_num: {}'.format(
+            args.num_samples, args.image_size, args.process_num
+        )
+    )
+    print(
+        '{:<10}{:<8}{:>12}{:>16}'.format(
+            'backend', 'order', 'cost(s)', 'samples/s'
+        )
+    )
+    for order in [False, True]:
+        for use_process in [False, True]:
+            decorated = xmap_readers(
+                mapper,
+                reader,
+                args.process_num,
+                args.buffer_size,
+                order,
+                use_process,
+            )
+            start = time.perf_counter()
+            num = sum(1 for _ in decorated())
+            cost = time.perf_counter() - start
+            assert num == args.num_samples
+            print(
+                '{:<10}{:<8}{:>12.3f}{:>16.1f}'.format(
+                    'process' if use_process else 'thread',
+                    str(order),
+                    cost,
+                    num / cost,
+                )
+            )
+
+
+if __name__ == '__main__':
+    main()
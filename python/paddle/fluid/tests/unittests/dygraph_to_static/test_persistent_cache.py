@@ -0,0 +1,192 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.jit.dy2static.persistent_cache import (
+    PERSISTENT_CACHE_DIR_ENV_NAME,
+    get_persistent_cache,
+)
+from paddle.jit.dy2static.program_translator import ConcreteProgram
+from paddle.static import InputSpec
+
+
+class SimpleNet(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.linear = paddle.nn.Linear(8, 4)
+
+    @paddle.jit.to_static
+    def forward(self, x):
+        out = self.linear(x)
+        if paddle.mean(out) > 0:
+            out = out * 2
+        return out, {'mean': paddle.mean(out)}
+
+
+SCALE = 2.0
+
+
+def scale(x):
+    return x * SCALE
+
+
+class ResidualNet(paddle.nn.Layer):
+    def __init__(self, use_residual):
+        super().__init__()
+        self.linear = paddle.nn.Linear(8, 8)
+        self.use_residual = use_residual
+
+    @paddle.jit.to_static
+    def forward(self, x):
+        out = scale(self.linear(x))
+        if self.use_residual:
+            out = out + x
+        return out
+
+
+def create_net(net_class=SimpleNet, *args):
+    # parameters with the same names as in a new process
+    with paddle.utils.unique_name.guard():
+        return net_class(*args)
+
+
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.environ[PERSISTENT_CACHE_DIR_ENV_NAME] = self.temp_dir.name
+
+    def tearDown(self):
+        os.environ.pop(PERSISTENT_CACHE_DIR_ENV_NAME, None)
+        self.temp_dir.cleanup()
+
+    def cache_files(self, kind):
+        return [
+            f
+            for f in os.listdir(self.temp_dir.name)
+            if f.startswith(kind + '-')
+        ]
+
+    def test_disabled(self):
+        os.environ.pop(PERSISTENT_CACHE_DIR_ENV_NAME, None)
+        self.assertIsNone(get_persistent_cache())
+
+    def test_reuse_program(self):
+        x = paddle.randn([3, 8])
+        net = create_net()
+        out, info = net(x)
+        self.assertEqual(len(self.cache_files('program')), 1)
+
+        new_net = create_net()
+        new_net.set_state_dict(net.state_dict())
+        # the program is loaded from cache without building
+        with mock.patch.object(
+            ConcreteProgram,
+            'from_func_spec',
+            side_effect=RuntimeError('program should be loaded from cache'),
+        ):
+            new_out, new_info = new_net(x)
+        np.testing.assert_allclose(new_out.numpy(), out.numpy(), rtol=1e-05)
+        np.testing.assert_allclose(
+            new_info['mean'].numpy(), info['mean'].numpy(), rtol=1e-05
+        )
+
+        # the loaded program can be trained
+        loss = paddle.mean(new_out)
+        loss.backward()
+        self.assertIsNotNone(new_net.linear.weight.grad)
+
+    def test_input_spec_variants(self):
+        net = create_net()
+        net(paddle.randn([3, 8]))
+        net.forward.get_concrete_program(InputSpec([None, 8], 'float32'))
+        self.assertEqual(len(self.cache_files('program')), 2)
+
+    def test_parameters_mismatch(self):
+        x = paddle.randn([3, 8])
+        create_net()(x)
+        # parameters with different names can not reuse the program
+        net = SimpleNet()
+        with mock.patch.object(
+            ConcreteProgram,
+            'from_func_spec',
+            wraps=ConcreteProgram.from_func_spec,
+        ) as from_func_spec:
+            net(x)
+        self.assertEqual(from_func_spec.call_count, 1)
+
+    def run_and_count_builds(self, net, x):
+        with mock.patch.object(
+            ConcreteProgram,
+            'from_func_spec',
+            wraps=ConcreteProgram.from_func_spec,
+        ) as from_func_spec:
+            out = net(x)
+        return out, from_func_spec.call_count
+
+    def test_layer_attrs(self):
+        x = paddle.randn([3, 8])
+        _, count = self.run_and_count_builds(create_net(ResidualNet, True), x)
+        self.assertEqual(count, 1)
+        _, count = self.run_and_count_builds(create_net(ResidualNet, True), x)
+        self.assertEqual(count, 0)
+        # the program depends on the flag of the layer
+        _, count = self.run_and_count_builds(create_net(ResidualNet, False), x)
+        self.assertEqual(count, 1)
+        self.assertEqual(len(self.cache_files('program')), 2)
+
+    def test_referred_globals(self):
+        x = paddle.randn([3, 8])
+        net = create_net(ResidualNet, False)
+        out, count = self.run_and_count_builds(net, x)
+        self.assertEqual(count, 1)
+        # SCALE is referred by the helper function converted
+        with mock.patch('{}.SCALE'.format(__name__), 3.0):
+            new_net = create_net(ResidualNet, False)
+            new_net.set_state_dict(net.state_dict())
+            new_out, count = self.run_and_count_builds(new_net, x)
+        self.assertEqual(count, 1)
+        np.testing.assert_allclose(
+            new_out.numpy(), out.numpy() * 1.5, rtol=1e-05
+        )
+
+    def test_entries_of_other_users(self):
+        cache = get_persistent_cache()
+        source_code = 'def foo(x):\n    return x\n'
+        cache.save_code(source_code, 'def foo(x):\n    return x + 0\n')
+        with mock.patch('os.getuid', return_value=os.getuid() + 1):
+            self.assertIsNone(cache.load_code(source_code))
+
+    def test_reuse_code(self):
+        cache = get_persistent_cache()
+        create_net()(paddle.randn([3, 8]))
+        self.assertGreater(len(self.cache_files('code')), 0)
+
+        source_code = 'def foo(x):\n    return x\n'
+        self.assertIsNone(cache.load_code(source_code))
+        cache.save_code(source_code, 'def foo(x):\n    return x + 0\n')
+        self.assertEqual(
+            cache.load_code(source_code), 'def foo(x):\n    return x + 0\n'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.jit.dy2static.function_spec import ShapeBucketing
+
+
+def sum_last_dim(x):
+    return paddle.sum(x, axis=-1)
+
+
+def double(x):
+    return x * 2, {'sum': paddle.sum(x, axis=-1)}
+
+
+class TestProgramCacheLRU(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_eviction(self):
+        func = paddle.jit.to_static(sum_last_dim, max_cache_size=2)
+        for length in [2, 3, 2, 4]:
+            func(paddle.ones([2, length]))
+
+        info = func.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 3)
+        self.assertEqual(info.evictions, 1)
+        self.assertEqual(info.size, 2)
+        self.assertEqual(info.max_size, 2)
+        self.assertEqual(func.get_traced_count(), 2)
+
+        # [2, 3] is the least recently used program and was evicted
+        func(paddle.ones([2, 2]))
+        func(paddle.ones([2, 3]))
+        info = func.cache_info()
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(info.misses, 4)
+        self.assertEqual(info.evictions, 2)
+
+    def test_unbounded(self):
+        func = paddle.jit.to_static(sum_last_dim)
+        for length in range(1, 5):
+            func(paddle.ones([2, length]))
+        info = func.cache_info()
+        self.assertEqual(info.misses, 4)
+        self.assertEqual(info.evictions, 0)
+        self.assertIsNone(info.max_size)
+
+    def test_invalid_max_size(self):
+        with self.assertRaises(ValueError):
+            paddle.jit.to_static(sum_last_dim, max_cache_size=0)
+
+
+class TestShapeBucketing(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_share_program(self):
+        func = paddle.jit.to_static(
+            sum_last_dim, shape_buckets={'x': {-1: [4, 8]}}
+        )
+        for length in [1, 3, 4, 5, 8]:
+            x = np.random.random([2, length]).astype('float32')
+            out = func(paddle.to_tensor(x))
+            np.testing.assert_allclose(out.numpy(), x.sum(-1), rtol=1e-05)
+        self.assertEqual(func.get_traced_count(), 2)
+
+        # dims larger than all buckets are not padded
+        func(paddle.ones([2, 10]))
+        self.assertEqual(func.get_traced_count(), 3)
+
+    def test_layer_gradient(self):
+        layer = paddle.nn.Linear(4, 4)
+        layer.forward = paddle.jit.to_static(
+            layer.forward, shape_buckets={'input': {0: [8]}}
+        )
+        x = paddle.randn([3, 4])
+        x.stop_gradient = False
+        out = layer(x)
+        # output is cropped back to the original batch size
+        self.assertEqual(out.shape, [3, 4])
+        paddle.sum(out).backward()
+        self.assertEqual(x.grad.shape, [3, 4])
+        np.testing.assert_allclose(
+            x.grad.numpy(),
+            np.tile(layer.weight.numpy().sum(-1), [3, 1]),
+            rtol=1e-05,
+        )
+
+    def test_crop_outputs(self):
+        func = paddle.jit.to_static(double, shape_buckets={'x': {-1: [8]}})
+        for length in [3, 5]:
+            x = np.random.random([2, length]).astype('float32')
+            out, info = func(paddle.to_tensor(x))
+            self.assertEqual(out.shape, [2, length])
+            np.testing.assert_allclose(out.numpy(), x * 2, rtol=1e-05)
+            np.testing.assert_allclose(
+                info['sum'].numpy(), x.sum(-1), rtol=1e-05
+            )
+        self.assertEqual(func.get_traced_count(), 1)
+
+    def test_ignored_with_input_spec(self):
+        func = paddle.jit.to_static(
+            sum_last_dim,
+            input_spec=[paddle.static.InputSpec([None, None], 'float32')],
+            shape_buckets={'x': {-1: [8]}},
+        )
+        out = func(paddle.ones([2, 3]))
+        np.testing.assert_allclose(out.numpy(), [3, 3], rtol=1e-05)
+
+    def test_pad(self):
+        bucketing = ShapeBucketing({'x': {1: [4]}, 'y': {0: [2]}}, pad_value=-1)
+        args, kwargs, crops = bucketing.pad_args(
+            ['x', 'z'],
+            (np.ones([2, 3]), np.ones([1])),
+            {'y': paddle.ones([1], dtype='int64')},
+        )
+        np.testing.assert_array_equal(args[0], [[1, 1, 1, -1], [1, 1, 1, -1]])
+        np.testing.assert_array_equal(args[1], [1])
+        np.testing.assert_array_equal(kwargs['y'].numpy(), [1, -1])
+        self.assertEqual(kwargs['y'].dtype, paddle.int64)
+        self.assertEqual(crops, {1: (3, 4), 0: (1, 2)})
+
+        # inputs padded from different sizes along the same axis
+        bucketing = ShapeBucketing({'x': {1: [4]}, 'y': {1: [4]}})
+        _, _, crops = bucketing.pad_args(
+            ['x', 'y'], (np.ones([2, 3]), np.ones([2, 2])), {}
+        )
+        self.assertEqual(crops, {})
+
+    def test_invalid_buckets(self):
+        with self.assertRaises(TypeError):
+            ShapeBucketing([4, 8])
+        with self.assertRaises(ValueError):
+            ShapeBucketing({'x': {0: []}})
+        with self.assertRaises(ValueError):
+            ShapeBucketing({'x': {3: [4]}}).pad_args(['x'], (np.ones([2]),), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,7 @@ import numpy as np
 
 from paddle.io import (
     BatchSampler,
+    BucketBatchSampler,
     Dataset,
     RandomSampler,
     Sampler,
@@ -289,5 +290,132 @@ class TestWeightedRandomSampler(unittest.TestCase):
             self.assertTrue(True)
 
 
+class TestBucketBatchSampler(unittest.TestCase):
+    def setUp(self):
+        self.dataset = RandomDataset(1000, 10)
+        self.lengths = np.random.RandomState(0).randint(1, 100, [1000])
+
+    def check_cover(self, batches, num_samples):
+        indices = sorted(idx for batch in batches for idx in batch)
+        self.assertEqual(indices, list(range(num_samples)))
+
+    def test_batch_size(self):
+        sampler = BucketBatchSampler(
+            self.dataset, self.lengths, batch_size=32, bucket_size=256
+        )
+        batches = list(sampler)
+        self.assertEqual(len(sampler), len(batches))
+        self.check_cover(batches, 1000)
+        for batch in batches:
+            self.assertLessEqual(len(batch), 32)
+            lengths = self.lengths[batch]
+            self.assertTrue(np.all(np.diff(lengths) >= 0))
+
+        # samples of similar lengths are padded less
+        def padded_size(batches):
+            return sum(len(b) * self.lengths[b].max() for b in batches)
+
+        random_batches = list(
+            BatchSampler(self.dataset, shuffle=True, batch_size=32)
+        )
+        self.assertLess(padded_size(batches), padded_size(random_batches))
+
+    def test_max_tokens(self):
+        lengths = self.lengths.copy()
+        lengths[0] = 500
+        sampler = BucketBatchSampler(
+            self.dataset, lengths, max_tokens=256, shuffle=True
+        )
+        batches = list(sampler)
+        self.check_cover(batches, 1000)
+        for batch in batches:
+            if len(batch) > 1:
+                self.assertLessEqual(len(batch) * lengths[batch].max(), 256)
+        self.assertIn([0], batches)
+
+    def test_length_fn(self):
+        sampler = BucketBatchSampler(
+            self.dataset, lambda sample: int(sample[1][0]), batch_size=8
+        )
+        labels = [int(self.dataset[i][1][0]) for i in range(1000)]
+        np.testing.assert_array_equal(sampler.lengths, labels)
+
+    def test_drop_last(self):
+        sampler = BucketBatchSampler(
+            self.dataset,
+            self.lengths,
+            batch_size=32,
+            bucket_size=100,
+            drop_last=True,
+        )
+        batches = list(sampler)
+        self.assertEqual(len(batches), 30)
+        self.assertTrue(all(len(b) == 32 for b in batches))
+
+    def test_drop_last_max_tokens(self):
+        def get_batches(drop_last):
+            sampler = BucketBatchSampler(
+                self.dataset,
+                self.lengths,
+                batch_size=16,
+                max_tokens=512,
+                bucket_size=100,
+                drop_last=drop_last,
+            )
+            return list(sampler)
+
+        all_batches = get_batches(False)
+        batches = get_batches(True)
+        # mini-batches cut short by max_tokens are kept
+        self.assertTrue(any(len(b) < 16 for b in batches))
+        dropped = [b for b in all_batches if b not in batches]
+        self.assertEqual(len(dropped) + len(batches), len(all_batches))
+        self.assertGreater(len(dropped), 0)
+        self.assertLessEqual(len(dropped), 10)
+        for batch in dropped:
+            # only the last mini-batch of a bucket, with the longest samples
+            self.assertLess(len(batch), 16)
+            bucket = batch[0] // 100
+            bucket_lengths = self.lengths[bucket * 100 : (bucket + 1) * 100]
+            self.assertEqual(self.lengths[batch].max(), bucket_lengths.max())
+
+    def test_epoch(self):
+        sampler = BucketBatchSampler(
+            self.dataset, self.lengths, batch_size=32, shuffle=True
+        )
+        epoch0 = list(sampler)
+        epoch1 = list(sampler)
+        self.assertNotEqual(epoch0, epoch1)
+        sampler.set_epoch(0)
+        self.assertEqual(list(sampler), epoch0)
+
+    def test_distributed(self):
+        num_replicas = 3
+        rank_batches = []
+        for rank in range(num_replicas):
+            sampler = BucketBatchSampler(
+                self.dataset,
+                self.lengths,
+                max_tokens=512,
+                bucket_size=200,
+                num_replicas=num_replicas,
+                rank=rank,
+                shuffle=True,
+            )
+            sampler.set_epoch(5)
+            rank_batches.append(list(sampler))
+        # every rank gets the same number of mini-batches
+        self.assertEqual(len({len(b) for b in rank_batches}), 1)
+        self.check_cover(
+            {tuple(b) for batches in rank_batches for b in batches}, 1000
+        )
+
+    def test_assert(self):
+        with self.assertRaises(AssertionError):
+            BucketBatchSampler(self.dataset, self.lengths)
+        with self.assertRaises(AssertionError):
+            BucketBatchSampler(self.dataset, self.lengths[:10], batch_size=8)
+
+
 if __name__ == '__main__':
     unittest.main()
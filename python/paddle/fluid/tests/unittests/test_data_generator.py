@@ -10,7 +10,13 @@
 # distributed under the License is distributed on an "AS IS" BASIS,
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
+import array
+import io
+import struct
 import unittest
+from unittest import mock
+
+import numpy as np
 
 import paddle.distributed.fleet as fleet
 
@@ -118,6 +124,50 @@ class MyMultiSlotDataGenerator_zip(fleet.MultiSlotDataGenerator):
         return data_iter
 
 
+class MyMultiSlotDataGenerator_binary(fleet.MultiSlotDataGenerator):
+    def generate_sample(self, line):
+        def data_iter():
+            for i in range(40):
+                if i == 1:
+                    yield None
+                score = [0.5, i] if i % 2 else [i]
+                yield ("words", [1, 2, 3, i]), ("score", score)
+
+        return data_iter
+
+
+class MyMultiSlotDataGenerator_block(fleet.MultiSlotDataGenerator):
+    def generate_block(self, lines):
+        words = [np.array(line.split(), dtype='int64') for line in lines]
+        lengths = [len(w) for w in words]
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        scores = np.array([len(line) * 0.5 for line in lines])
+        return [
+            ("words", np.concatenate(words), offsets),
+            ("score", scores, np.arange(len(lines) + 1)),
+        ]
+
+
+def parse_binary_records(data):
+    records = []
+    pos = 0
+    while pos < len(data):
+        (record_bytes,) = struct.unpack_from('=I', data, pos)
+        pos += 4
+        end = pos + record_bytes
+        record = []
+        while pos < end:
+            feasign_type, num = struct.unpack_from('=cI', data, pos)
+            pos += 5
+            typecode = 'Q' if feasign_type == b'u' else 'f'
+            feasigns = array.array(typecode)
+            feasigns.frombytes(data[pos : pos + feasigns.itemsize * num])
+            pos += feasigns.itemsize * num
+            record.append((feasign_type, feasigns.tolist()))
+        records.append(record)
+    return records
+
+
 class TestMultiSlotDataGenerator(unittest.TestCase):
     def test_MultiSlotDataGenerator_basic(self):
         my_ms_dg = MyMultiSlotDataGenerator()
@@ -186,5 +236,109 @@ class TestMultiSlotDataGeneratorZip(unittest.TestCase):
         my_ms_dg.run_from_memory()
 
 
+class TestMultiSlotDataGeneratorBinary(unittest.TestCase):
+    def test_MultiSlotDataGenerator_binary(self):
+        my_ms_dg = MyMultiSlotDataGenerator_binary()
+        my_ms_dg.set_batch(4)
+        my_ms_dg.set_output_format("binary")
+        stdout = io.TextIOWrapper(io.BytesIO())
+        with mock.patch('sys.stdout', stdout):
+            my_ms_dg.run_from_memory()
+        records = parse_binary_records(stdout.buffer.getvalue())
+        self.assertEqual(len(records), 40)
+        self.assertEqual(records[0], [(b'u', [1, 2, 3, 0]), (b'u', [0])])
+        self.assertEqual(records[3], [(b'u', [1, 2, 3, 3]), (b'f', [0.5, 3])])
+        self.assertEqual(records[4], [(b'u', [1, 2, 3, 4]), (b'u', [4])])
+        self.assertEqual(
+            my_ms_dg._proto_info, [("words", "uint64"), ("score", "float")]
+        )
+
+    def test_MultiSlotDataGenerator_binary_error(self):
+        my_ms_dg = MyMultiSlotDataGenerator()
+        with self.assertRaises(ValueError):
+            my_ms_dg.set_output_format("json")
+        with self.assertRaises(ValueError):
+            MyMultiSlotStringDataGenerator().set_output_format("binary")
+        with self.assertRaises(ValueError):
+            my_ms_dg._gen_bytes([("words", ["1"])])
+        with self.assertRaises(ValueError):
+            my_ms_dg._gen_bytes([("words", [-1])])
+
+
+class TestMultiSlotDataGeneratorBlock(unittest.TestCase):
+    def run_from_stdin(self, my_ms_dg, lines):
+        stdout = io.TextIOWrapper(io.BytesIO())
+        with mock.patch('sys.stdin', io.StringIO("".join(lines))):
+            with mock.patch('sys.stdout', stdout):
+                my_ms_dg.run_from_stdin()
+        stdout.flush()
+        return stdout.buffer.getvalue()
+
+    def test_MultiSlotDataGenerator_block(self):
+        lines = ["1 2 3\n", "4\n", "5 6\n"] * 3
+        samples = [
+            [
+                ("words", [int(w) for w in line.split()]),
+                ("score", [len(line) * 0.5]),
+            ]
+            for line in lines
+        ]
+        for output_format in ["text", "binary"]:
+            my_ms_dg = MyMultiSlotDataGenerator_block()
+            my_ms_dg.set_block_size(2)
+            my_ms_dg.set_output_format(output_format)
+            output = self.run_from_stdin(my_ms_dg, lines)
+
+            expected_dg = fleet.MultiSlotDataGenerator()
+            if output_format == "binary":
+                expected = b"".join(map(expected_dg._gen_bytes, samples))
+            else:
+                expected = "".join(map(expected_dg._gen_str, samples))
+                expected = expected.encode()
+            self.assertEqual(output, expected)
+            self.assertEqual(my_ms_dg._proto_info, expected_dg._proto_info)
+
+    def test_MultiSlotDataGenerator_block_type(self):
+        my_ms_dg = fleet.MultiSlotDataGenerator()
+        float_block = [("score", np.array([0.5]), [0, 1])]
+        int_block = [("score", np.array([1 << 60], dtype='uint64'), [0, 1])]
+        my_ms_dg._gen_block_bytes(float_block)
+        records = parse_binary_records(my_ms_dg._gen_block_bytes(int_block))
+        # int values of a float slot are still uint64
+        self.assertEqual(records, [[(b'u', [1 << 60])]])
+        self.assertEqual(my_ms_dg._proto_info, [("score", "float")])
+
+    def test_MultiSlotDataGenerator_block_signed(self):
+        values = np.array([-5, 3], dtype='int64')
+        output = fleet.MultiSlotDataGenerator()._gen_block_str(
+            [("words", values, [0, 1, 2])]
+        )
+        expected_dg = fleet.MultiSlotDataGenerator()
+        expected = "".join(
+            expected_dg._gen_str([("words", [v])]) for v in values.tolist()
+        )
+        self.assertEqual(output, expected)
+
+    def test_MultiSlotDataGenerator_block_error(self):
+        with self.assertRaises(ValueError):
+            MyMultiSlotDataGenerator_block().run_from_memory()
+        my_ms_dg = fleet.MultiSlotDataGenerator()
+        with self.assertRaises(ValueError):
+            my_ms_dg.set_block_size(0)
+        with self.assertRaises(ValueError):
+            # empty field
+            my_ms_dg._gen_block_str([("words", np.array([1]), [0, 1, 1])])
+        with self.assertRaises(ValueError):
+            # inconsistent sample number
+            my_ms_dg._gen_block_bytes(
+                [
+                    ("words", np.array([1, 2]), [0, 1, 2]),
+                    ("label", np.array([1]), [0, 1]),
+                ]
+            )
+        with self.assertRaises(ValueError):
+            my_ms_dg._gen_block_bytes([("words", np.array(["1"]), [0, 1])])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.fluid.dataloader.collate import _CollateEngine, default_collate_fn
+
+
+def make_batch(batch_size, dtype='float32'):
+    return [
+        {
+            'image': np.random.random([3, 8, 8]).astype(dtype),
+            'label': i,
+            'meta': ['name', (0.5, np.arange(2))],
+        }
+        for i in range(batch_size)
+    ]
+
+
+class TestCollateEngine(unittest.TestCase):
+    def assert_batch_equal(self, output, expected):
+        if isinstance(expected, dict):
+            self.assertEqual(list(output.keys()), list(expected.keys()))
+            for key in expected:
+                self.assert_batch_equal(output[key], expected[key])
+        elif isinstance(expected, list):
+            self.assertEqual(len(output), len(expected))
+            for out, exp in zip(output, expected):
+                self.assert_batch_equal(out, exp)
+        elif isinstance(expected, np.ndarray):
+            self.assertEqual(output.dtype, expected.dtype)
+            np.testing.assert_array_equal(output, expected)
+        else:
+            self.assertEqual(output, expected)
+
+    def test_same_as_default(self):
+        for reuse_buffer in [False, True]:
+            engine = _CollateEngine(reuse_buffer)
+            for batch_size, dtype in [
+                (4, 'float32'),
+                (4, 'float32'),
+                (2, 'float32'),
+                (4, 'float64'),
+            ]:
+                batch = make_batch(batch_size, dtype)
+                self.assert_batch_equal(
+                    engine(batch), default_collate_fn(batch)
+                )
+
+    def test_reuse_buffer(self):
+        engine = _CollateEngine(reuse_buffer=True)
+        out1 = engine(make_batch(4))['image']
+        out2 = engine(make_batch(4))['image']
+        self.assertTrue(np.shares_memory(out1, out2))
+        # smaller batch reuses the buffer of larger batch
+        out3 = engine(make_batch(2))['image']
+        self.assertTrue(np.shares_memory(out1, out3))
+
+        engine = _CollateEngine(reuse_buffer=False)
+        out1 = engine(make_batch(4))['image']
+        out2 = engine(make_batch(4))['image']
+        self.assertFalse(np.shares_memory(out1, out2))
+
+    def test_schema_mismatch(self):
+        engine = _CollateEngine()
+        engine(make_batch(4))
+
+        # dtype mismatch in non-first sample
+        batch = make_batch(3)
+        batch[1]['image'] = batch[1]['image'].astype('float64')
+        self.assert_batch_equal(engine(batch), default_collate_fn(batch))
+
+        # number type mismatch in non-first sample
+        batch = [(1, 2.0), (1.0, 2.0)]
+        self.assert_batch_equal(engine(batch), default_collate_fn(batch))
+
+        batch = [(np.ones([2]), 1), (np.ones([3]), 2)]
+        self.assertRaises(ValueError, engine, batch)
+
+        batch = [(1, 2), (1, 2, 3)]
+        self.assertRaises(RuntimeError, engine, batch)
+
+        batch = [{'a': 1}, {'b': 1}]
+        self.assertRaises(KeyError, engine, batch)
+
+    def test_tensor_fields(self):
+        paddle.disable_static()
+        engine = _CollateEngine()
+        batch = [
+            (paddle.to_tensor(np.ones([2], dtype='float32') * i), i)
+            for i in range(3)
+        ]
+        tensor, label = engine(batch)
+        np.testing.assert_allclose(
+            tensor.numpy(), np.stack([np.ones([2]) * i for i in range(3)])
+        )
+        np.testing.assert_array_equal(label, np.arange(3))
+        paddle.enable_static()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -592,6 +592,65 @@ class TestDataset(unittest.TestCase):
 
         temp_dir.cleanup()
 
+    def test_binary_dataset_run(self):
+        """
+        Testcase for InMemoryDataset and QueueDataset with binary records.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        filename = os.path.join(temp_dir.name, "test_binary_dataset_run.bin")
+        generator = paddle.distributed.fleet.MultiSlotDataGenerator()
+        with open(filename, "wb") as f:
+            for i in range(1, 8):
+                sample = [
+                    ("slot1", [i]),
+                    ("slot2", [2, 3]),
+                    ("slot3", [i + 4] * 4),
+                    ("slot4", [i * 0.5]),
+                ]
+                f.write(generator._gen_bytes(sample))
+
+        slots = ["slot1", "slot2", "slot3", "slot4"]
+        slots_vars = []
+        for slot in slots[:3]:
+            var = paddle.static.data(
+                name=slot, shape=[-1, 1], dtype="int64", lod_level=1
+            )
+            slots_vars.append(var)
+        slots_vars.append(
+            paddle.static.data(
+                name="slot4", shape=[-1, 1], dtype="float32", lod_level=1
+            )
+        )
+
+        exe = fluid.Executor(fluid.CPUPlace())
+        exe.run(fluid.default_startup_program())
+
+        dataset = paddle.distributed.InMemoryDataset()
+        dataset.init(
+            batch_size=4,
+            thread_num=1,
+            pipe_command="cat",
+            use_var=slots_vars,
+            data_feed_type="MultiSlotBinaryInMemoryDataFeed",
+        )
+        dataset.set_filelist([filename])
+        dataset.load_into_memory()
+        self.assertEqual(dataset.get_memory_data_size(), 7)
+        exe.train_from_dataset(fluid.default_main_program(), dataset)
+
+        dataset = paddle.distributed.QueueDataset()
+        dataset.init(
+            batch_size=4,
+            thread_num=1,
+            pipe_command="cat",
+            use_var=slots_vars,
+            data_feed_type="MultiSlotBinaryDataFeed",
+        )
+        dataset.set_filelist([filename])
+        exe.train_from_dataset(fluid.default_main_program(), dataset)
+
+        temp_dir.cleanup()
+
     def test_queue_dataset_run(self):
         """
         Testcase for QueueDataset from create to run.
@@ -454,5 +454,67 @@ class TestDatasetWithDropLast(unittest.TestCase):
         self.run_main(dataset, 10, 3)
 
 
+class TestTensorDatasetGetitems(unittest.TestCase):
+    def run_main(self, num_workers, use_numpy):
+        place = paddle.CPUPlace()
+        with fluid.dygraph.guard(place):
+            input_np = np.random.random([10, 3, 4]).astype('float32')
+            label_np = np.random.randint(0, 9, [10, 1]).astype('int64')
+            if use_numpy:
+                dataset = TensorDataset([input_np, label_np])
+            else:
+                dataset = TensorDataset(
+                    [paddle.to_tensor(input_np), paddle.to_tensor(label_np)]
+                )
+
+            indices = [7, 1, 3]
+            batch = dataset.__getitems__(indices)
+            assert len(batch) == 2
+            np.testing.assert_allclose(np.array(batch[0]), input_np[indices])
+            np.testing.assert_array_equal(np.array(batch[1]), label_np[indices])
+
+            subset = paddle.io.Subset(dataset, [9, 8, 7, 6])
+            batch = subset.__getitems__([0, 2])
+            np.testing.assert_allclose(np.array(batch[0]), input_np[[9, 7]])
+
+            # samples fetched by __getitems__ in default collate mode, and
+            # by __getitem__ with user defined collate_fn
+            def collate_fn(samples):
+                return [
+                    np.stack([np.array(f) for f in s]) for s in zip(*samples)
+                ]
+
+            for fn in [None, collate_fn]:
+                dataloader = DataLoader(
+                    subset,
+                    places=place,
+                    num_workers=num_workers,
+                    batch_size=3,
+                    collate_fn=fn,
+                )
+                outputs = [(i.numpy(), l.numpy()) for i, l in dataloader()]
+                assert len(outputs) == 2
+                np.testing.assert_allclose(outputs[0][0], input_np[[9, 8, 7]])
+                np.testing.assert_array_equal(outputs[1][1], label_np[[6]])
+
+    def test_main(self):
+        self.run_main(num_workers=0, use_numpy=False)
+        self.run_main(num_workers=0, use_numpy=True)
+        self.run_main(num_workers=2, use_numpy=True)
+
+
+class TestSubsetGetitemsFallback(unittest.TestCase):
+    def test_main(self):
+        dataset = RandomDataset(10)
+        subset = paddle.io.Subset(dataset, [1, 3, 5])
+        image, label = subset.__getitems__([0, 2])
+        np.testing.assert_allclose(
+            image, np.stack([dataset[1][0], dataset[5][0]])
+        )
+        np.testing.assert_array_equal(
+            label, np.stack([dataset[1][1], dataset[5][1]])
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
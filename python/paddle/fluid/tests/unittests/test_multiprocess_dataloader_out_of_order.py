@@ -0,0 +1,119 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import time
+import unittest
+import warnings
+
+import numpy as np
+
+import paddle
+import paddle.fluid as fluid
+from paddle.io import DataLoader, Dataset, IterableDataset
+
+SAMPLE_NUM = 40
+BATCH_SIZE = 4
+
+
+class SlowSampleDataset(Dataset):
+    def __init__(self, sample_num, slow_idx=0, delay=2.0):
+        self.sample_num = sample_num
+        self.slow_idx = slow_idx
+        self.delay = delay
+
+    def __len__(self):
+        return self.sample_num
+
+    def __getitem__(self, idx):
+        if idx == self.slow_idx:
+            time.sleep(self.delay)
+        return np.array([idx]).astype('int64')
+
+
+class RangeIterableDataset(IterableDataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __iter__(self):
+        worker_info = paddle.io.get_worker_info()
+        for i in range(
+            worker_info.id, self.sample_num, worker_info.num_workers
+        ):
+            yield np.array([i]).astype('int64')
+
+
+@unittest.skipIf(
+    sys.platform == 'darwin' or sys.platform == 'win32',
+    "multi-process DataLoader is not supported on MacOs and Windows",
+)
+class TestDataLoaderOutOfOrder(unittest.TestCase):
+    def load(self, dataset, persistent_workers=False, **kwargs):
+        place = paddle.CPUPlace()
+        with fluid.dygraph.guard(place):
+            loader = DataLoader(
+                dataset,
+                places=place,
+                num_workers=2,
+                batch_size=BATCH_SIZE,
+                persistent_workers=persistent_workers,
+                **kwargs
+            )
+            return [data.numpy().flatten().tolist() for data in loader()]
+
+    def test_out_of_order(self):
+        for persistent_workers in [False, True]:
+            batches = self.load(
+                SlowSampleDataset(SAMPLE_NUM),
+                persistent_workers=persistent_workers,
+                in_order=False,
+            )
+            self.assertEqual(len(batches), SAMPLE_NUM // BATCH_SIZE)
+            # the slow batch does not stall other batches
+            self.assertNotEqual(batches[0][0], 0)
+            self.assertEqual(sorted(sum(batches, [])), list(range(SAMPLE_NUM)))
+
+    def test_reorder_window(self):
+        for window in [1, 4, 16]:
+            batches = self.load(
+                SlowSampleDataset(SAMPLE_NUM, delay=0.5),
+                reorder_window=window,
+            )
+            self.assertEqual(sum(batches, []), list(range(SAMPLE_NUM)))
+
+    def test_iterable_dataset_out_of_order(self):
+        for persistent_workers in [False, True]:
+            batches = self.load(
+                RangeIterableDataset(SAMPLE_NUM),
+                persistent_workers=persistent_workers,
+                in_order=False,
+            )
+            self.assertEqual(sorted(sum(batches, [])), list(range(SAMPLE_NUM)))
+
+    def test_invalid_reorder_window(self):
+        with self.assertRaises(AssertionError):
+            DataLoader(SlowSampleDataset(SAMPLE_NUM), reorder_window=0)
+
+    def test_reorder_window_out_of_order(self):
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            loader = DataLoader(
+                SlowSampleDataset(SAMPLE_NUM), in_order=False, reorder_window=4
+            )
+        self.assertTrue(any("reorder_window" in str(i.message) for i in w))
+        self.assertIsNone(loader.reorder_window)
+
+
+if __name__ == '__main__':
+    unittest.main()
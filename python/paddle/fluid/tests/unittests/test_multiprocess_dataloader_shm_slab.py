@@ -0,0 +1,231 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import os
+import sys
+import unittest
+
+import numpy as np
+
+import paddle
+import paddle.fluid as fluid
+from paddle.fluid.dataloader.slab import (
+    _SlabBatch,
+    _SlabField,
+    _SlabPool,
+    _SlabWriter,
+)
+from paddle.io import DataLoader, Dataset, IterableDataset
+
+IMAGE_SIZE = 32
+
+
+class RandomDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __len__(self):
+        return self.sample_num
+
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.random([3, IMAGE_SIZE, IMAGE_SIZE]).astype('float32')
+        label = np.random.randint(0, 9, (1,)).astype('int64')
+        return image, label
+
+
+class RandomIterableDataset(IterableDataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __iter__(self):
+        for idx in range(self.sample_num):
+            np.random.seed(idx)
+            yield np.random.random([3, IMAGE_SIZE, IMAGE_SIZE]).astype(
+                'float32'
+            )
+
+
+def _to_tensor(arr):
+    tensor = fluid.core.LoDTensor()
+    tensor.set(arr, fluid.core.CPUPlace())
+    return tensor
+
+
+@unittest.skipIf(
+    sys.platform == 'darwin' or sys.platform == 'win32',
+    "shared memory slab is only used in multi-process mode on Linux",
+)
+class TestSlabPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = _SlabPool(2)
+        self.writer = _SlabWriter()
+
+    def tearDown(self):
+        self.writer.close()
+        self.pool.close()
+
+    def write_and_wrap(self, batch):
+        slot, names = self.pool.acquire()
+        slab_batch = self.writer.write(slot, names, batch, _to_tensor)
+        self.assertTrue(isinstance(slab_batch, _SlabBatch))
+        return slot, slab_batch, self.pool.wrap(slab_batch)
+
+    def test_first_batch_allocate_slabs(self):
+        batch = [np.random.random([4, 8]).astype('float32')]
+        slot, slab_batch, tensors = self.write_and_wrap(batch)
+        # no slab allocated for the slot yet, sent in default way
+        self.assertFalse(isinstance(slab_batch.fields[0], _SlabField))
+        self.assertEqual(slab_batch.nbytes, [batch[0].nbytes])
+        np.testing.assert_array_equal(np.array(tensors[0]), batch[0])
+
+        # slot released at once for no tensor wraps slabs
+        slots = [self.pool.acquire()[0], self.pool.acquire()[0]]
+        self.assertIn(slot, slots)
+        self.assertIsNone(self.pool.acquire())
+
+    def test_zero_copy_and_recycle(self):
+        batch = [
+            np.random.random([4, 8]).astype('float32'),
+            np.arange(4).astype('int64'),
+            'not_a_tensor',
+        ]
+        # allocate slabs of all slots
+        for _ in range(2):
+            self.write_and_wrap(batch)
+        gc.collect()
+
+        slot, slab_batch, tensors = self.write_and_wrap(batch)
+        self.assertTrue(isinstance(slab_batch.fields[0], _SlabField))
+        self.assertTrue(isinstance(slab_batch.fields[1], _SlabField))
+        self.assertEqual(slab_batch.nbytes[2], 0)
+        np.testing.assert_array_equal(np.array(tensors[0]), batch[0])
+        np.testing.assert_array_equal(np.array(tensors[1]), batch[1])
+
+        # slot is held until all tensors wrapped from slabs are freed
+        other = self.pool.acquire()
+        self.assertIsNotNone(other)
+        self.assertIsNone(self.pool.acquire())
+        self.pool.release(other[0])
+
+        del tensors
+        gc.collect()
+        slots = [self.pool.acquire()[0], self.pool.acquire()[0]]
+        self.assertIn(slot, slots)
+
+    def test_grow_slab(self):
+        pool = _SlabPool(1)
+        small = [np.ones([2, 4], dtype='float32')]
+        large = [np.ones([16, 4], dtype='float32')]
+        try:
+            slot, names = pool.acquire()
+            self.assertEqual(names, [])
+            pool.wrap(self.writer.write(slot, names, small, _to_tensor))
+
+            # slab allocated for small field is too small for large field
+            slot, names = pool.acquire()
+            self.assertEqual(len(names), 1)
+            slab_batch = self.writer.write(slot, names, large, _to_tensor)
+            self.assertFalse(isinstance(slab_batch.fields[0], _SlabField))
+            pool.wrap(slab_batch)
+
+            # the slab is reallocated for large field
+            slot, new_names = pool.acquire()
+            self.assertNotEqual(names, new_names)
+            slab_batch = self.writer.write(slot, new_names, large, _to_tensor)
+            self.assertTrue(isinstance(slab_batch.fields[0], _SlabField))
+            tensors = pool.wrap(slab_batch)
+            np.testing.assert_array_equal(np.array(tensors[0]), large[0])
+            del tensors
+        finally:
+            pool.close()
+
+    def test_wrap_after_close(self):
+        batch = [np.random.random([4, 8]).astype('float32')]
+        slot, names = self.pool.acquire()
+        slab_batch = self.writer.write(slot, names, batch, _to_tensor)
+        self.pool.close()
+        # slabs are unlinked, the batch is dropped
+        self.assertIsNone(self.pool.wrap(slab_batch))
+
+
+@unittest.skipIf(
+    sys.platform == 'darwin' or sys.platform == 'win32',
+    "multi-process DataLoader is not supported on MacOs and Windows",
+)
+class TestDataLoaderShmSlab(unittest.TestCase):
+    def setUp(self):
+        os.environ['FLAGS_use_shm_slab'] = '1'
+
+    def tearDown(self):
+        os.environ.pop('FLAGS_use_shm_slab', None)
+
+    def run_main(self, num_workers, persistent_workers=False):
+        place = paddle.CPUPlace()
+        with fluid.dygraph.guard(place):
+            dataset = RandomDataset(40)
+            dataloader = DataLoader(
+                dataset,
+                places=place,
+                num_workers=num_workers,
+                batch_size=4,
+                drop_last=False,
+                persistent_workers=persistent_workers,
+            )
+            for _ in range(2):
+                for i, (image, label) in enumerate(dataloader()):
+                    expected = [dataset[i * 4 + j] for j in range(4)]
+                    np.testing.assert_allclose(
+                        image.numpy(), np.stack([e[0] for e in expected])
+                    )
+                    np.testing.assert_array_equal(
+                        label.numpy(), np.stack([e[1] for e in expected])
+                    )
+                self.assertEqual(i + 1, len(dataloader))
+
+    def test_main(self):
+        for num_workers in [1, 2]:
+            for persistent_workers in [False, True]:
+                self.run_main(num_workers, persistent_workers)
+
+    def test_iterable_dataset(self):
+        # indices left in the indices queue of a drained worker are
+        # skipped, their slots should be released for following epochs
+        place = paddle.CPUPlace()
+        with fluid.dygraph.guard(place):
+            dataset = RandomIterableDataset(20)
+            dataloader = DataLoader(
+                dataset,
+                places=place,
+                num_workers=2,
+                batch_size=4,
+                persistent_workers=True,
+            )
+            for _ in range(3):
+                batches = [data for data in dataloader()]
+                # each worker iterates the full dataset
+                self.assertEqual(len(batches), 10)
+                del batches
+                gc.collect()
+            # no slot leaked, indices of next epoch are all assigned slots
+            iterator = dataloader._iterator
+            iterator._reset()
+            self.assertEqual(
+                len(iterator._task_slots), len(iterator._task_infos)
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
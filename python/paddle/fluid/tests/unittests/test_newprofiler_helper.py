@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import random
 import unittest
 
 import paddle.profiler.statistic_helper as statistic_helper
@@ -131,5 +132,103 @@ class TestStatisticHelper(unittest.TestCase):
         self.assertEqual(dst, [(10, 11)])
 
 
+def reference_merge(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def reference_cover(ranges, start, end):
+    return any(s <= start and end <= e for s, e in ranges)
+
+
+class TestIntervalSet(unittest.TestCase):
+    def random_ranges(self, num):
+        ranges = []
+        for _ in range(num):
+            start = random.randint(0, 50)
+            ranges.append((start, start + random.choice([0, 1, 2, 3, 5, 8])))
+        return ranges
+
+    def test_basic(self):
+        ranges = statistic_helper.IntervalSet.from_ranges(
+            [(5, 8), (1, 3), (3, 4), (10, 10), (10, 12)]
+        )
+        self.assertEqual(ranges.to_list(), [(1, 4), (5, 8), (10, 12)])
+        self.assertEqual(len(ranges), 3)
+        self.assertEqual(ranges.total(), 8)
+        self.assertEqual(statistic_helper.sum_ranges(ranges), 8)
+        self.assertFalse(statistic_helper.IntervalSet())
+        self.assertEqual(statistic_helper.IntervalSet().total(), 0)
+
+    def test_zero_length_ranges(self):
+        IntervalSet = statistic_helper.IntervalSet
+        ranges = IntervalSet.from_ranges([(1, 5)])
+        points = IntervalSet.from_ranges([(1, 1), (3, 3), (5, 5)])
+        # points inside or at the start of a range are kept
+        self.assertEqual(
+            points.intersection(ranges).to_list(), [(1, 1), (3, 3)]
+        )
+        self.assertEqual(ranges.intersection(points).to_list(), [(3, 3)])
+        self.assertEqual(points.difference(ranges).to_list(), [(5, 5)])
+        # touching ranges do not intersect
+        self.assertEqual(
+            ranges.intersection(IntervalSet.from_ranges([(5, 7)])).to_list(),
+            [],
+        )
+
+    def test_union_all(self):
+        IntervalSet = statistic_helper.IntervalSet
+        sets = [
+            IntervalSet.from_ranges(self.random_ranges(10)) for _ in range(5)
+        ]
+        expected = reference_merge(sum([s.to_list() for s in sets], []))
+        self.assertEqual(IntervalSet.union_all(sets).to_list(), expected)
+        self.assertEqual(IntervalSet.union_all([]).to_list(), [])
+
+    def test_random(self):
+        IntervalSet = statistic_helper.IntervalSet
+        random.seed(2022)
+        for _ in range(200):
+            ranges1 = self.random_ranges(random.randint(0, 20))
+            ranges2 = self.random_ranges(random.randint(0, 20))
+            set1 = IntervalSet.from_ranges(ranges1)
+            set2 = IntervalSet.from_ranges(ranges2)
+            merged1 = reference_merge(ranges1)
+            merged2 = reference_merge(ranges2)
+            self.assertEqual(set1.to_list(), merged1)
+            self.assertEqual(
+                set1.union(set2).to_list(), reference_merge(ranges1 + ranges2)
+            )
+            # compare the covered points of ranges with positive length
+            intersection = set1.intersection(set2).to_list()
+            difference = set1.difference(set2).to_list()
+            for point in range(60):
+                in1 = reference_cover(merged1, point, point + 1)
+                in2 = reference_cover(merged2, point, point + 1)
+                self.assertEqual(
+                    reference_cover(intersection, point, point + 1),
+                    in1 and in2,
+                )
+                self.assertEqual(
+                    reference_cover(difference, point, point + 1),
+                    in1 and not in2,
+                )
+
+    def test_aggregate_durations(self):
+        result = statistic_helper.aggregate_durations(
+            ['b', 'a', 'b', 'c', 'b'], [3, 1, 5, 2, 4]
+        )
+        self.assertEqual(
+            result,
+            [('b', 3, 12, 3, 5), ('a', 1, 1, 1, 1), ('c', 1, 2, 2, 2)],
+        )
+        self.assertEqual(statistic_helper.aggregate_durations([], []), [])
+
+
 if __name__ == '__main__':
     unittest.main()
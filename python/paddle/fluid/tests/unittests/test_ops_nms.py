@@ -232,6 +232,64 @@ class TestOpsNMS(unittest.TestCase):
                     ),
                 )
 
+    def test_multiclass_nms_many_categories(self):
+        for device in self.devices:
+            paddle.set_device(device)
+            num_boxes = 512
+            boxes = np.random.rand(num_boxes, 4).astype('float32') * 100 - 50
+            boxes[:, 2:] = boxes[:, :2] + np.random.rand(num_boxes, 2) * 20
+            scores = np.random.rand(num_boxes).astype('float32')
+            category_idxs = np.random.randint(0, 80, num_boxes)
+
+            out = paddle.vision.ops.nms(
+                paddle.to_tensor(boxes),
+                self.threshold,
+                paddle.to_tensor(scores),
+                paddle.to_tensor(category_idxs),
+            )
+            out_py = multiclass_nms(
+                boxes, scores, category_idxs, self.threshold, num_boxes
+            )
+            np.testing.assert_array_equal(out.numpy(), out_py)
+
+            # only boxes of given categories are kept
+            categories = list(range(0, 80, 3))
+            out = paddle.vision.ops.nms(
+                paddle.to_tensor(boxes),
+                self.threshold,
+                paddle.to_tensor(scores),
+                paddle.to_tensor(category_idxs),
+                categories,
+                self.topk,
+            )
+            out_py = out_py[np.isin(category_idxs[out_py], categories)]
+            np.testing.assert_array_equal(out.numpy(), out_py[: self.topk])
+
+    def test_multiclass_nms_large_offsets(self):
+        # offsets of categories are far larger than sizes of boxes
+        for device in self.devices:
+            paddle.set_device(device)
+            num_boxes = 512
+            boxes = np.random.rand(num_boxes, 4).astype('float32') * 4000
+            boxes[:, 2:] = boxes[:, :2] + np.random.rand(num_boxes, 2) * 4
+            # half of boxes are moved from the others in the same category
+            shifts = np.random.rand(num_boxes // 2, 1).astype('float32')
+            boxes[: num_boxes // 2] = boxes[num_boxes // 2 :] + shifts
+            scores = np.random.rand(num_boxes).astype('float32')
+            category_idxs = np.random.randint(0, 1000, num_boxes)
+            category_idxs[: num_boxes // 2] = category_idxs[num_boxes // 2 :]
+
+            out = paddle.vision.ops.nms(
+                paddle.to_tensor(boxes),
+                self.threshold,
+                paddle.to_tensor(scores),
+                paddle.to_tensor(category_idxs),
+            )
+            out_py = multiclass_nms(
+                boxes, scores, category_idxs, self.threshold, num_boxes
+            )
+            np.testing.assert_array_equal(out.numpy(), out_py)
+
     def test_matrix_nms_dynamic(self):
         for device in self.devices:
             for dtype in self.dtypes:
@@ -0,0 +1,160 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+import numpy as np
+
+import paddle
+
+
+class TestSaveLoadMmapFormat(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'test_mmap/obj.pdparams')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_state_dict(self):
+        layer = paddle.nn.Linear(10, 20)
+        state_dict = layer.state_dict()
+        paddle.save(state_dict, self.path, use_mmap_format=True)
+
+        for mmap in [False, True]:
+            load_dict = paddle.load(self.path, mmap=mmap)
+            self.assertEqual(list(load_dict.keys()), list(state_dict.keys()))
+            for key, value in state_dict.items():
+                self.assertTrue(isinstance(load_dict[key], paddle.Tensor))
+                self.assertEqual(load_dict[key].name, value.name)
+                np.testing.assert_array_equal(
+                    load_dict[key].numpy(), value.numpy()
+                )
+
+            load_dict = paddle.load(
+                self.path, mmap=mmap, return_numpy=True, keep_name_table=True
+            )
+            self.assertIn("StructuredToParameterName@@", load_dict)
+            for key, value in state_dict.items():
+                self.assertTrue(isinstance(load_dict[key], np.ndarray))
+                np.testing.assert_array_equal(load_dict[key], value.numpy())
+
+    def test_set_state_dict(self):
+        layer = paddle.nn.Linear(10, 20)
+        paddle.save(layer.state_dict(), self.path, use_mmap_format=True)
+
+        new_layer = paddle.nn.Linear(10, 20)
+        new_layer.set_state_dict(paddle.load(self.path, mmap=True))
+        for key, value in layer.state_dict().items():
+            np.testing.assert_array_equal(
+                new_layer.state_dict()[key].numpy(), value.numpy()
+            )
+
+    def test_copy_on_write(self):
+        array = np.random.random([4, 8]).astype('float32')
+        paddle.save({'x': array}, self.path, use_mmap_format=True)
+
+        loaded = paddle.load(self.path, mmap=True, return_numpy=True)
+        loaded['x'][0] = 0
+        np.testing.assert_array_equal(
+            paddle.load(self.path, return_numpy=True)['x'], array
+        )
+
+    def test_nested_object(self):
+        tensor = paddle.randn([3, 4])
+        obj = {
+            'tensor': tensor,
+            'list': [tensor, np.arange(6, dtype='int64'), 'str', 1.5],
+            'tuple': (np.zeros([0, 2], dtype='float32'), {'bool': True}),
+        }
+        paddle.save(obj, self.path, use_mmap_format=True)
+
+        for mmap in [False, True]:
+            load_obj = paddle.load(self.path, mmap=mmap)
+            # the same tensor is saved once
+            self.assertIs(load_obj['tensor'], load_obj['list'][0])
+            np.testing.assert_array_equal(
+                load_obj['tensor'].numpy(), tensor.numpy()
+            )
+            np.testing.assert_array_equal(
+                load_obj['list'][1].numpy(), np.arange(6)
+            )
+            self.assertEqual(load_obj['list'][2:], ['str', 1.5])
+            self.assertEqual(load_obj['tuple'][0].shape, [0, 2])
+            self.assertEqual(load_obj['tuple'][1], {'bool': True})
+
+    def test_bytes_io(self):
+        objs = [
+            {'x': np.random.random([5]).astype('float32')},
+            paddle.nn.Linear(2, 3).state_dict(),
+        ]
+        byio = BytesIO()
+        for obj in objs:
+            paddle.save(obj, byio, use_mmap_format=True)
+        byio.seek(0)
+        for obj in objs:
+            load_obj = paddle.load(byio, mmap=True, return_numpy=True)
+            for key, value in obj.items():
+                np.testing.assert_array_equal(load_obj[key], np.array(value))
+
+    def test_static_mode(self):
+        array = np.random.random([4, 8]).astype('float32')
+        paddle.save({'x': array}, self.path, use_mmap_format=True)
+        paddle.enable_static()
+        try:
+            loaded = paddle.load(self.path, mmap=True)
+            self.assertTrue(
+                isinstance(loaded['x'], paddle.fluid.core.LoDTensor)
+            )
+            np.testing.assert_array_equal(np.array(loaded['x']), array)
+        finally:
+            paddle.disable_static()
+
+    def test_mmap_on_pickle_format(self):
+        layer = paddle.nn.Linear(10, 20)
+        paddle.save(layer.state_dict(), self.path)
+        with self.assertWarns(UserWarning):
+            load_dict = paddle.load(self.path, mmap=True)
+        for key, value in layer.state_dict().items():
+            np.testing.assert_array_equal(load_dict[key].numpy(), value.numpy())
+
+    def test_bfloat16(self):
+        tensor = paddle.randn([4, 8]).astype('bfloat16')
+        paddle.save({'x': tensor}, self.path, use_mmap_format=True)
+
+        for mmap in [False, True]:
+            loaded = paddle.load(self.path, mmap=mmap)
+            self.assertEqual(loaded['x'].dtype, paddle.bfloat16)
+            np.testing.assert_array_equal(loaded['x'].numpy(), tensor.numpy())
+            # numpy has no bfloat16, data is returned as uint16
+            loaded = paddle.load(self.path, mmap=mmap, return_numpy=True)
+            self.assertEqual(loaded['x'].dtype, np.uint16)
+
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            paddle.save({}, self.path, use_mmap_format=1)
+        with self.assertRaises(ValueError):
+            paddle.save(
+                {'layer': paddle.nn.Linear(2, 3)},
+                self.path,
+                use_mmap_format=True,
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
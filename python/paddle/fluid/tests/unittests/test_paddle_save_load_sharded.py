@@ -0,0 +1,132 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+import numpy as np
+
+import paddle
+
+
+class LinearNet(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.fc1 = paddle.nn.Linear(16, 32)
+        self.fc2 = paddle.nn.Linear(32, 8)
+
+    def forward(self, x):
+        return self.fc2(self.fc1(x))
+
+
+class TestSaveLoadSharded(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dirname = os.path.join(self.temp_dir.name, 'test_sharded')
+        self.path = os.path.join(self.dirname, 'model.pdparams')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def shard_files(self):
+        return [f for f in os.listdir(self.dirname) if '.shard-' in f]
+
+    def assert_state_dict_equal(self, load_dict, state_dict):
+        self.assertEqual(list(load_dict.keys()), list(state_dict.keys()))
+        for key, value in state_dict.items():
+            self.assertEqual(load_dict[key].name, value.name)
+            np.testing.assert_array_equal(load_dict[key].numpy(), value.numpy())
+
+    def test_save_load(self):
+        state_dict = LinearNet().state_dict()
+        for num_shards in [1, 3, 8]:
+            paddle.save(state_dict, self.path, num_shards=num_shards)
+            self.assertEqual(len(self.shard_files()), num_shards)
+            for mmap in [False, True]:
+                for num_threads in [None, 1]:
+                    load_dict = paddle.load(
+                        self.path, mmap=mmap, num_threads=num_threads
+                    )
+                    self.assert_state_dict_equal(load_dict, state_dict)
+
+    def test_set_state_dict(self):
+        layer = LinearNet()
+        paddle.save(layer.state_dict(), self.path, num_shards=2, num_threads=2)
+        new_layer = LinearNet()
+        new_layer.set_state_dict(paddle.load(self.path))
+        x = paddle.randn([4, 16])
+        np.testing.assert_array_equal(layer(x).numpy(), new_layer(x).numpy())
+
+    def test_async_save(self):
+        layer = LinearNet()
+        state_dict = layer.state_dict()
+        expected = {k: v.numpy() for k, v in state_dict.items()}
+        future = paddle.save(state_dict, self.path, async_save=True)
+        # modify parameters before the save completes
+        for param in layer.parameters():
+            param.set_value(np.zeros(param.shape, dtype='float32'))
+        self.assertIsNone(future.result())
+
+        load_dict = paddle.load(self.path, return_numpy=True)
+        for key, value in expected.items():
+            np.testing.assert_array_equal(load_dict[key], value)
+
+    def test_replace_checkpoint(self):
+        paddle.save(LinearNet().state_dict(), self.path, num_shards=4)
+        old_shards = self.shard_files()
+        state_dict = LinearNet().state_dict()
+        paddle.save(state_dict, self.path, num_shards=2)
+        # shards of the previous checkpoint are removed
+        self.assertEqual(len(self.shard_files()), 2)
+        self.assertTrue(set(old_shards).isdisjoint(self.shard_files()))
+        self.assert_state_dict_equal(paddle.load(self.path), state_dict)
+
+        # replaced by a checkpoint not sharded
+        paddle.save(state_dict, self.path)
+        self.assert_state_dict_equal(paddle.load(self.path), state_dict)
+
+    def test_nested_object(self):
+        tensor = paddle.randn([3, 4])
+        obj = {
+            'model': LinearNet().state_dict(),
+            'list': [tensor, tensor, np.arange(5), 'str'],
+            'epoch': 10,
+        }
+        paddle.save(obj, self.path, num_shards=3)
+        load_obj = paddle.load(self.path, return_numpy=True)
+        self.assertIs(load_obj['list'][0], load_obj['list'][1])
+        np.testing.assert_array_equal(load_obj['list'][0], tensor.numpy())
+        np.testing.assert_array_equal(load_obj['list'][2], np.arange(5))
+        self.assertEqual(load_obj['list'][3], 'str')
+        self.assertEqual(load_obj['epoch'], 10)
+        for key, value in obj['model'].items():
+            np.testing.assert_array_equal(load_obj['model'][key], value.numpy())
+
+    def test_error(self):
+        state_dict = LinearNet().state_dict()
+        with self.assertRaises(ValueError):
+            paddle.save(state_dict, self.path, num_shards=0)
+        with self.assertRaises(ValueError):
+            paddle.save(state_dict, self.path, num_shards=2, num_threads=0)
+        with self.assertRaises(TypeError):
+            paddle.save(state_dict, self.path, async_save=1)
+        with self.assertRaises(ValueError):
+            paddle.save(state_dict, BytesIO(), num_shards=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1044,6 +1044,175 @@ class TestProfilerStatistic(unittest.TestCase):
                 )
             )
 
+    def build_step(self, step, offset):
+        profilerstep_node = HostPythonNode(
+            'ProfileStep#{}'.format(step),
+            profiler.TracerEventType.ProfileStep,
+            offset,
+            offset + 400,
+            1000,
+            1001,
+        )
+        conv2d_node = HostPythonNode(
+            'conv2d',
+            profiler.TracerEventType.Operator,
+            offset + 10,
+            offset + 100,
+            1000,
+            1001,
+        )
+        conv2d_launchkernel = HostPythonNode(
+            'cudalaunchkernel',
+            profiler.TracerEventType.CudaRuntime,
+            offset + 20,
+            offset + 30,
+            1000,
+            1001,
+        )
+        conv2d_kernel = DevicePythonNode(
+            'conv2d_kernel',
+            profiler.TracerEventType.Kernel,
+            offset + 150,
+            offset + 200 + step,
+            0,
+            0,
+            0,
+        )
+        allreduce_node = HostPythonNode(
+            'allreduce_op',
+            profiler.TracerEventType.Operator,
+            offset + 120,
+            offset + 140,
+            1000,
+            1001,
+        )
+        allreduce_launchkernel = HostPythonNode(
+            'cudalaunchkernel',
+            profiler.TracerEventType.CudaRuntime,
+            offset + 125,
+            offset + 130,
+            1000,
+            1001,
+        )
+        nccl_kernel = DevicePythonNode(
+            'nccl_allreduce_kernel',
+            profiler.TracerEventType.Kernel,
+            offset + 180,
+            offset + 260,
+            0,
+            0,
+            1,
+        )
+        profilerstep_node.children_node.extend([conv2d_node, allreduce_node])
+        conv2d_node.runtime_node.append(conv2d_launchkernel)
+        conv2d_launchkernel.device_node.append(conv2d_kernel)
+        allreduce_node.runtime_node.append(allreduce_launchkernel)
+        allreduce_launchkernel.device_node.append(nccl_kernel)
+        return profilerstep_node
+
+    def build_tree(self, steps):
+        root_node = HostPythonNode(
+            'Root Node',
+            profiler.TracerEventType.UserDefined,
+            0,
+            float('inf'),
+            1000,
+            1001,
+        )
+        for step in steps:
+            root_node.children_node.append(self.build_step(step, step * 1000))
+        return {'thread1001': root_node}
+
+    def test_statistic_merge(self):
+        extra_info = {
+            'Process Cpu Utilization': '1.02',
+            'System Cpu Utilization': '0.68',
+        }
+        merged_data = profiler_statistic.StatisticData({}, {})
+        for window in [[0, 1], [2]]:
+            merged_data.merge(
+                profiler_statistic.StatisticData(
+                    self.build_tree(window), extra_info
+                )
+            )
+        expected_data = profiler_statistic.StatisticData(
+            self.build_tree([0, 1, 2]), extra_info
+        )
+
+        self.assertIsNone(merged_data.node_trees)
+        self.assertEqual(len(merged_data.time_range_summary.CPUTimeRange), 0)
+        merged_summary = merged_data.time_range_summary
+        expected_summary = expected_data.time_range_summary
+        self.assertEqual(
+            dict(merged_summary.CPUTimeRangeSum),
+            dict(expected_summary.CPUTimeRangeSum),
+        )
+        self.assertEqual(
+            dict(merged_summary.GPUTypeTimeRangeSum),
+            dict(expected_summary.GPUTypeTimeRangeSum),
+        )
+        self.assertEqual(
+            dict(merged_summary.call_times), dict(expected_summary.call_times)
+        )
+        self.assertEqual(list(merged_summary.get_gpu_devices()), [0])
+
+        for name in ['conv2d', 'allreduce_op']:
+            merged_item = merged_data.event_summary.items[name]
+            expected_item = expected_data.event_summary.items[name]
+            self.assertEqual(merged_item.call, 3)
+            self.assertEqual(merged_item.cpu_time, expected_item.cpu_time)
+            self.assertEqual(merged_item.gpu_time, expected_item.gpu_time)
+        kernel_item = merged_data.event_summary.kernel_items['conv2d_kernel']
+        self.assertEqual(kernel_item.call, 3)
+        self.assertEqual(kernel_item.gpu_time, 153)
+        self.assertEqual(kernel_item.min_gpu_time, 50)
+        self.assertEqual(kernel_item.max_gpu_time, 52)
+
+        merged_distributed = merged_data.distributed_summary
+        expected_distributed = expected_data.distributed_summary
+        for attr in [
+            'cpu_communication_time',
+            'gpu_communication_time',
+            'communication_time',
+            'computation_time',
+            'overlap_time',
+            'cpu_calls',
+            'gpu_calls',
+        ]:
+            self.assertEqual(
+                getattr(merged_distributed, attr),
+                getattr(expected_distributed, attr),
+            )
+        self.assertEqual(
+            profiler_statistic._build_table(merged_data),
+            profiler_statistic._build_table(expected_data),
+        )
+
+    def test_statistic_merge_extra_info(self):
+        windows = [
+            ([0, 1], {'Process Cpu Utilization': '1.0', 'Host': 'a'}),
+            ([2], {'Process Cpu Utilization': '0.4', 'Host': 'b'}),
+        ]
+        merged_data = profiler_statistic.StatisticData({}, {})
+        durations = []
+        for steps, extra_info in windows:
+            data = profiler_statistic.StatisticData(
+                self.build_tree(steps), extra_info
+            )
+            durations.append(
+                data.time_range_summary.get_cpu_range_sum(
+                    profiler.TracerEventType.ProfileStep
+                )
+            )
+            merged_data.merge(data)
+
+        # numeric values are averaged weighted by durations of windows
+        self.assertAlmostEqual(
+            float(merged_data.extra_info['Process Cpu Utilization']),
+            (1.0 * durations[0] + 0.4 * durations[1]) / sum(durations),
+        )
+        self.assertEqual(merged_data.extra_info['Host'], 'b')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -14,11 +14,16 @@
 
 import collections
 import copyreg
+import io
+import mmap
 import os
 import pickle
+import struct
 import sys
+import uuid
 import warnings
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -27,6 +32,7 @@ import paddle
 # deprecated module import
 from paddle import fluid
 from paddle.fluid import core
+from paddle.fluid.data_feeder import convert_dtype
 from paddle.fluid.framework import (
     EagerParamBase,
     ParamBase,
@@ -34,6 +40,7 @@ from paddle.fluid.framework import (
     Variable,
     _current_expected_place,
     _dygraph_tracer,
+    _in_eager_without_dygraph_check,
     _non_static_mode,
     _varbase_creator,
 )
@@ -220,6 +227,8 @@ def _parse_load_config(configs):
         'params_filename',
         'keep_name_table',
         'return_numpy',
+        'mmap',
+        'num_threads',
     ]
 
     # input check
@@ -236,12 +245,21 @@ def _parse_load_config(configs):
     inner_config.params_filename = configs.get('params_filename', None)
     inner_config.keep_name_table = configs.get('keep_name_table', None)
     inner_config.return_numpy = configs.get('return_numpy', False)
+    inner_config.mmap = configs.get('mmap', False)
+    inner_config.num_threads = configs.get('num_threads', None)
 
     return inner_config
 
 
 def _parse_save_config(configs):
-    supported_configs = ['use_binary_format', 'pickle_protocol']
+    supported_configs = [
+        'use_binary_format',
+        'pickle_protocol',
+        'use_mmap_format',
+        'num_shards',
+        'num_threads',
+        'async_save',
+    ]
 
     # input check
     for key in configs:
@@ -255,6 +273,10 @@ def _parse_save_config(configs):
     inner_config = _SaveLoadConfig()
     inner_config.use_binary_format = configs.get('use_binary_format', False)
     inner_config.pickle_protocol = configs.get('pickle_protocol', None)
+    inner_config.use_mmap_format = configs.get('use_mmap_format', False)
+    inner_config.num_shards = configs.get('num_shards', None)
+    inner_config.num_threads = configs.get('num_threads', None)
+    inner_config.async_save = configs.get('async_save', False)
 
     return inner_config
 
@@ -634,6 +656,497 @@ def _save_binary_var(obj, path):
         )
 
 
+# NOTE: [ mmap format of paddle.save ]
+# Layout of the file saved with `use_mmap_format=True`:
+#   | magic(8 bytes) | header size(8 bytes) | header | padding | data |
+# header is a pickled dict, which contains the pickled object with all
+# tensors and numpy arrays replaced by persistent ids, and the index of
+# tensor data(dtype, shape, offset and size in data section). Data of
+# each tensor is aligned to _MMAP_FORMAT_ALIGNMENT bytes, so that it can
+# be memory mapped and wrapped as tensor without copy when loading.
+_MMAP_FORMAT_MAGIC = b'PDMMAP\x00\x01'
+_MMAP_FORMAT_VERSION = 1
+_MMAP_FORMAT_ALIGNMENT = 64
+_MMAP_FORMAT_PID = 'paddle_tensor'
+
+
+def _align_offset(offset, alignment=_MMAP_FORMAT_ALIGNMENT):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class _TensorRecord:
+    """
+    Index of a tensor saved in mmap format, `name` is None for tensors
+    saved from numpy.ndarray or LoDTensor. `dtype` is the numpy dtype of
+    the saved data.
+    """
+
+    def __init__(self, name, dtype, shape, offset=0, nbytes=0):
+        self.name = name
+        self.dtype = dtype
+        self.shape = tuple(shape)
+        self.offset = offset
+        self.nbytes = nbytes
+
+    def to_tuple(self):
+        return (self.name, self.dtype, self.shape, self.offset, self.nbytes)
+
+    @staticmethod
+    def from_tuple(record):
+        return _TensorRecord(*record)
+
+
+def _tensor_record(obj):
+    # get the index of a tensor without copying it to host memory, data
+    # is copied when it is written, see _write_tensor_data
+    if isinstance(obj, fluid.Layer):
+        raise ValueError(
+            "paddle do not support saving `paddle.nn.Layer` object."
+        )
+    if isinstance(obj, (core.VarBase, core.eager.Tensor)):
+        if obj.type == core.VarDesc.VarType.VOCAB:
+            return None
+        if not obj.value().get_tensor()._is_initialized():
+            raise ValueError(
+                "The saved tensor is not initialized. If you used group sharded, please use save_group_sharded_model."
+            )
+        dtype = np.dtype(convert_dtype(obj.dtype))
+        return _TensorRecord(obj.name, dtype.str, obj.shape)
+    if isinstance(obj, core.LoDTensor):
+        if not obj._is_initialized():
+            raise ValueError("The saved tensor is not initialized.")
+        dtype = np.dtype(convert_dtype(obj._dtype()))
+        return _TensorRecord(None, dtype.str, obj.shape())
+    if isinstance(obj, np.ndarray) and obj.dtype.kind in 'biufc':
+        return _TensorRecord(None, obj.dtype.str, obj.shape)
+    return None
+
+
+def _tensor_to_ndarray(obj):
+    if isinstance(obj, (core.VarBase, core.eager.Tensor)):
+        return obj.numpy()
+    if isinstance(obj, core.LoDTensor):
+        return np.array(obj)
+    return obj
+
+
+def _mmap_format_dumps(obj, protocol):
+    """
+    Pickle `obj` with tensors replaced by persistent ids, return the
+    pickled bytes, the tensors and their records.
+    """
+    tensors = []
+    records = []
+    memo = {}
+
+    class _Pickler(pickle.Pickler):
+        def persistent_id(self, obj):
+            if id(obj) in memo:
+                return (_MMAP_FORMAT_PID, memo[id(obj)])
+            record = _tensor_record(obj)
+            if record is None:
+                return None
+            memo[id(obj)] = len(records)
+            tensors.append(obj)
+            records.append(record)
+            return (_MMAP_FORMAT_PID, memo[id(obj)])
+
+    buffer = io.BytesIO()
+    _Pickler(buffer, protocol).dump(obj)
+    return buffer.getvalue(), tensors, records
+
+
+def _write_tensor_data(f, tensors, records, data_offset):
+    for tensor, record in zip(tensors, records):
+        pos = f.tell()
+        if pos < data_offset + record.offset:
+            f.write(b'\0' * (data_offset + record.offset - pos))
+        data = np.ascontiguousarray(_tensor_to_ndarray(tensor))
+        f.write(data.reshape(-1).view(np.uint8).data)
+
+
+def _add_name_table(obj):
+    # keep the name table as paddle.save saves state_dict
+    if _is_state_dict(obj) and _non_static_mode():
+        name_table = {}
+        for key, value in obj.items():
+            if isinstance(value, (Variable, core.VarBase, core.eager.Tensor)):
+                name_table[key] = value.name
+        obj = dict(obj)
+        obj["StructuredToParameterName@@"] = name_table
+    return obj
+
+
+def _record_nbytes(record):
+    return int(np.prod(record.shape, dtype='int64')) * (
+        np.dtype(record.dtype).itemsize
+    )
+
+
+def _layout_records(records):
+    # place records one after another in a data section, return its size
+    data_size = 0
+    for record in records:
+        record.offset = _align_offset(data_size)
+        record.nbytes = _record_nbytes(record)
+        data_size = record.offset + record.nbytes
+    return data_size
+
+
+def _mmap_format_save(obj, f, protocol):
+    obj_bytes, tensors, records = _mmap_format_dumps(
+        _add_name_table(obj), protocol
+    )
+    data_size = _layout_records(records)
+
+    header = pickle.dumps(
+        {
+            'version': _MMAP_FORMAT_VERSION,
+            'object': obj_bytes,
+            'records': [record.to_tuple() for record in records],
+            'data_size': data_size,
+        },
+        protocol=protocol,
+    )
+
+    # offsets are relative to the beginning of the object, since several
+    # objects can be saved into one BytesIO
+    base = f.tell()
+    f.write(_MMAP_FORMAT_MAGIC)
+    f.write(struct.pack('<Q', len(header)))
+    f.write(header)
+    data_offset = base + _align_offset(
+        len(_MMAP_FORMAT_MAGIC) + 8 + len(header)
+    )
+    _write_tensor_data(f, tensors, records, data_offset)
+    pos = f.tell()
+    if pos < data_offset + data_size:
+        f.write(b'\0' * (data_offset + data_size - pos))
+
+
+def _peek_magic(f):
+    pos = f.tell()
+    magic = f.read(len(_MMAP_FORMAT_MAGIC))
+    f.seek(pos)
+    return magic
+
+
+def _read_header(path, f, version, format_name):
+    f.read(len(_MMAP_FORMAT_MAGIC))
+    (header_size,) = struct.unpack('<Q', f.read(8))
+    header = pickle.loads(f.read(header_size))
+    if header['version'] > version:
+        raise ValueError(
+            "The file {} is saved in {} format version {}, which is not "
+            "supported by current paddle.".format(
+                path, format_name, header['version']
+            )
+        )
+    return header, header_size
+
+
+def _mmap_record_to_tensor(array, record, config):
+    if config.return_numpy:
+        return array
+    # NOTE: numpy has no bfloat16, data of bfloat16 tensors is saved and
+    # loaded as uint16 arrays, which are set as bfloat16 tensors by paddle
+    # NOTE: tensors wrap the memory mapped data on CPUPlace without copy,
+    # data is read from file only when it is accessed. Mapped memory is
+    # copy-on-write, modifying tensors does not change the file
+    if config.mmap:
+        if _non_static_mode():
+            if _in_eager_without_dygraph_check():
+                return core.eager.Tensor(
+                    value=array,
+                    place=core.CPUPlace(),
+                    persistable=False,
+                    zero_copy=True,
+                    name=record.name,
+                    stop_gradient=True,
+                )
+            return core.VarBase(
+                value=array,
+                place=core.CPUPlace(),
+                persistable=False,
+                zero_copy=True,
+                name=record.name or '',
+            )
+        t = core.LoDTensor()
+        t.set(array, core.CPUPlace(), True)
+        return t
+    if record.name is not None:
+        return _tuple_to_tensor((record.name, array), return_numpy=False)
+    return _ndarray_to_tensor(array, return_numpy=False)
+
+
+def _mmap_format_load(path, f, config):
+    base = f.tell()
+    header, header_size = _read_header(path, f, _MMAP_FORMAT_VERSION, 'mmap')
+    records = [_TensorRecord.from_tuple(r) for r in header['records']]
+    data_offset = base + _align_offset(
+        len(_MMAP_FORMAT_MAGIC) + 8 + header_size
+    )
+
+    buffer = None
+    if config.mmap and _is_file_path(path) and header['data_size'] > 0:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    def read_record(idx):
+        record = records[idx]
+        if buffer is not None:
+            return _record_to_ndarray(
+                buffer, record, data_offset + record.offset
+            )
+        f.seek(data_offset + record.offset)
+        return _record_to_ndarray(bytearray(f.read(record.nbytes)), record, 0)
+
+    load_result = _mmap_format_unpickle(
+        header['object'], records, read_record, config
+    )
+    f.seek(data_offset + header['data_size'])
+    return load_result
+
+
+def _record_to_ndarray(buffer, record, offset):
+    count = int(np.prod(record.shape, dtype='int64'))
+    array = np.frombuffer(
+        buffer, dtype=record.dtype, count=count, offset=offset
+    )
+    return array.reshape(record.shape)
+
+
+def _mmap_format_unpickle(obj_bytes, records, read_record, config):
+    loaded = {}
+
+    class _Unpickler(pickle.Unpickler):
+        def persistent_load(self, pid):
+            typename, idx = pid
+            if typename != _MMAP_FORMAT_PID:
+                raise pickle.UnpicklingError(
+                    "Unsupported persistent id {}".format(pid)
+                )
+            if idx not in loaded:
+                loaded[idx] = _mmap_record_to_tensor(
+                    read_record(idx), records[idx], config
+                )
+            return loaded[idx]
+
+    load_result = _Unpickler(io.BytesIO(obj_bytes)).load()
+    if (
+        isinstance(load_result, dict)
+        and "StructuredToParameterName@@" in load_result
+        and not config.keep_name_table
+    ):
+        del load_result["StructuredToParameterName@@"]
+    return load_result
+
+
+# NOTE: [ sharded format of paddle.save ]
+# With `num_shards` specified, data of tensors is split into several
+# shard files beside `path`, and `path` only holds a manifest:
+#   | magic(8 bytes) | header size(8 bytes) | header |
+# header is the same as the mmap format, with the shard files and the
+# shard id of each tensor, offset of a tensor is relative to the
+# beginning of its shard. Shards are written concurrently by a thread
+# pool into temporary files and renamed when completed, the manifest is
+# replaced last and each save uses new shard file names, so that an
+# interrupted save never breaks the checkpoint saved before it. Shards
+# of the previous checkpoint are removed after the manifest is replaced.
+_SHARDED_FORMAT_MAGIC = b'PDSHARD\x01'
+_SHARDED_FORMAT_VERSION = 1
+_MAX_IO_THREADS = 8
+
+# async saves are written by a single background thread one by one, so
+# that saves to the same path are completed in order
+_async_save_executor = None
+
+
+def _get_async_save_executor():
+    global _async_save_executor
+    if _async_save_executor is None:
+        _async_save_executor = ThreadPoolExecutor(max_workers=1)
+    return _async_save_executor
+
+
+def _default_io_threads(num_shards):
+    return max(1, min(num_shards, _MAX_IO_THREADS))
+
+
+def _assign_shards(records, num_shards):
+    # assign the largest tensor to the least loaded shard first, so that
+    # shards are balanced and written in similar time
+    loads = [0] * num_shards
+    shard_ids = [0] * len(records)
+    for idx in sorted(
+        range(len(records)),
+        key=lambda i: _record_nbytes(records[i]),
+        reverse=True,
+    ):
+        shard_id = loads.index(min(loads))
+        shard_ids[idx] = shard_id
+        loads[shard_id] += _record_nbytes(records[idx])
+    return shard_ids
+
+
+def _snapshot_tensor(tensor):
+    # copy tensor data to host memory, so that it can be modified by
+    # training while it is written in background
+    if isinstance(tensor, np.ndarray):
+        return tensor.copy()
+    return _tensor_to_ndarray(tensor)
+
+
+def _write_shard(shard_path, tensors, records):
+    tmp_path = shard_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            _write_tensor_data(f, tensors, records, 0)
+        os.replace(tmp_path, shard_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _sharded_format_shards(path):
+    # shard files of the checkpoint saved in `path` before, if any
+    if not os.path.isfile(path):
+        return []
+    try:
+        with open(path, 'rb') as f:
+            if _peek_magic(f) != _SHARDED_FORMAT_MAGIC:
+                return []
+            header, _ = _read_header(
+                path, f, _SHARDED_FORMAT_VERSION, 'sharded'
+            )
+            return header['shards']
+    except Exception:
+        return []
+
+
+def _write_sharded_files(
+    path, obj_bytes, tensors, records, num_shards, num_threads, protocol
+):
+    dirname, basename = os.path.split(path)
+    token = uuid.uuid4().hex[:8]
+    shards = [
+        '{}.{}.shard-{:05d}-of-{:05d}'.format(basename, token, i, num_shards)
+        for i in range(num_shards)
+    ]
+    shard_ids = _assign_shards(records, num_shards)
+    groups = [[] for _ in range(num_shards)]
+    for idx, shard_id in enumerate(shard_ids):
+        groups[shard_id].append(idx)
+    for group in groups:
+        _layout_records([records[idx] for idx in group])
+
+    # NOTE: tensors are copied to host memory before, writer threads only
+    # write numpy arrays to files
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        futures = [
+            pool.submit(
+                _write_shard,
+                os.path.join(dirname, shard),
+                [tensors[idx] for idx in group],
+                [records[idx] for idx in group],
+            )
+            for shard, group in zip(shards, groups)
+        ]
+        for future in futures:
+            future.result()
+
+    header = pickle.dumps(
+        {
+            'version': _SHARDED_FORMAT_VERSION,
+            'object': obj_bytes,
+            'records': [record.to_tuple() for record in records],
+            'shards': shards,
+            'record_shards': shard_ids,
+        },
+        protocol=protocol,
+    )
+    old_shards = _sharded_format_shards(path)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_SHARDED_FORMAT_MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+    os.replace(tmp_path, path)
+
+    for shard in old_shards:
+        if shard not in shards:
+            try:
+                os.remove(os.path.join(dirname, shard))
+            except FileNotFoundError:
+                pass
+
+
+def _sharded_save(obj, path, protocol, config):
+    num_shards = config.num_shards or 1
+    num_threads = config.num_threads or _default_io_threads(num_shards)
+    obj_bytes, tensors, records = _mmap_format_dumps(
+        _add_name_table(obj), protocol
+    )
+    if config.async_save:
+        tensors = [_snapshot_tensor(tensor) for tensor in tensors]
+        return _get_async_save_executor().submit(
+            _write_sharded_files,
+            path,
+            obj_bytes,
+            tensors,
+            records,
+            num_shards,
+            num_threads,
+            protocol,
+        )
+    # NOTE: Tensor.numpy() is not called from writer threads, which may
+    # run device-to-host copies out of the current device context
+    tensors = [_tensor_to_ndarray(tensor) for tensor in tensors]
+    _write_sharded_files(
+        path, obj_bytes, tensors, records, num_shards, num_threads, protocol
+    )
+
+
+def _read_shard(shard_path, use_mmap):
+    with open(shard_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return b''
+        if use_mmap:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        buffer = bytearray(size)
+        f.readinto(buffer)
+        return buffer
+
+
+def _sharded_format_load(path, f, config):
+    header, _ = _read_header(path, f, _SHARDED_FORMAT_VERSION, 'sharded')
+    records = [_TensorRecord.from_tuple(r) for r in header['records']]
+    shard_ids = header['record_shards']
+    dirname = os.path.dirname(path)
+
+    num_threads = config.num_threads or _default_io_threads(
+        len(header['shards'])
+    )
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        buffers = list(
+            pool.map(
+                lambda shard: _read_shard(
+                    os.path.join(dirname, shard), config.mmap
+                ),
+                header['shards'],
+            )
+        )
+
+    def read_record(idx):
+        record = records[idx]
+        return _record_to_ndarray(
+            buffers[shard_ids[idx]], record, record.offset
+        )
+
+    return _mmap_format_unpickle(header['object'], records, read_record, config)
+
+
 def save(obj, path, protocol=4, **configs):
     '''
     Save an object to the specified path.
@@ -660,9 +1173,18 @@ def save(obj, path, protocol=4, **configs):
           use_binary_format(bool): When the saved object is static graph variable, you can specify ``use_binary_for_var``.
           If True, save the file in the c++ binary format when saving a single static graph variable; otherwise, save it in pickle format.
           Default: False
+          use_mmap_format(bool): If True, save tensors of the object in a data section with an index of their offsets,
+          so that the file can be loaded with ``paddle.load(path, mmap=True)`` and tensors are memory mapped instead
+          of being read into memory. Default: False
+          num_shards(int): If specified, data of tensors is split into ``num_shards`` files beside ``path``, which are written
+          concurrently, and ``path`` only holds the object structure and the index of tensors. The checkpoint saved before
+          in ``path`` is kept intact until all shards are written. Only supports saving to file. Default: None
+          num_threads(int): The number of threads to write shards. Default: min(num_shards, 8)
+          async_save(bool): If True, tensors are copied to host memory and the object is saved in sharded format by a
+          background thread, ``paddle.save`` returns without waiting for the writes. Default: False
 
     Returns:
-        None
+        None, or a ``concurrent.futures.Future`` of the background save if ``async_save`` is True.
 
     Examples:
         .. code-block:: python
@@ -763,6 +1285,19 @@ def save(obj, path, protocol=4, **configs):
             tensor = paddle.randn([2, 3], dtype='float32')
             paddle.save(tensor, byio)
 
+        .. code-block:: python
+            :name: code-example-6
+
+            # example 6: save state_dict into shards in background
+            import paddle
+
+            layer = paddle.nn.Linear(3, 4)
+            future = paddle.save(
+                layer.state_dict(), 'example/model.pdparams', num_shards=2, async_save=True)
+            # ... continue training, wait before exit or next save
+            future.result()
+            state_dict = paddle.load('example/model.pdparams')
+
     '''
     if _is_file_path(path):
         # 1. input check
@@ -794,6 +1329,46 @@ def save(obj, path, protocol=4, **configs):
             )
         )
 
+    if not isinstance(config.use_mmap_format, bool):
+        raise TypeError(
+            "Type of `use_mmap_format` should be bool, but received {}.".format(
+                type(config.use_mmap_format)
+            )
+        )
+
+    if config.num_shards is not None and (
+        not isinstance(config.num_shards, int) or config.num_shards <= 0
+    ):
+        raise ValueError(
+            "`num_shards` should be a positive integer, but received {}.".format(
+                config.num_shards
+            )
+        )
+
+    if config.num_threads is not None and (
+        not isinstance(config.num_threads, int) or config.num_threads <= 0
+    ):
+        raise ValueError(
+            "`num_threads` should be a positive integer, but received {}.".format(
+                config.num_threads
+            )
+        )
+
+    if not isinstance(config.async_save, bool):
+        raise TypeError(
+            "Type of `async_save` should be bool, but received {}.".format(
+                type(config.async_save)
+            )
+        )
+
+    use_sharded_format = config.num_shards is not None or config.async_save
+    if use_sharded_format and not _is_file_path(path):
+        raise ValueError(
+            "`num_shards` and `async_save` only support saving objects to file, but got {}".format(
+                type(path)
+            )
+        )
+
     if config.use_binary_format:
         _save_binary_var(obj, path)
     else:
@@ -809,6 +1384,13 @@ def save(obj, path, protocol=4, **configs):
             with _open_file_buffer(path, "wb") as f:
                 f.write(obj.desc.serialize_to_string())
 
+        elif use_sharded_format:
+            return _sharded_save(obj, path, protocol, config)
+
+        elif config.use_mmap_format:
+            with _open_file_buffer(path, 'wb') as f:
+                _mmap_format_save(obj, f, protocol)
+
         elif _is_state_dict(obj):
             if _non_static_mode():
                 _legacy_save(obj, path, protocol)
@@ -921,6 +1503,11 @@ def load(path, **configs):
             by default.
             (3) return_numpy(bool): If specified as True, return tensor as numpy.ndarray, otherwise return tensor as paddle.Tensor.
             Default False.
+            (4) mmap(bool): If specified as True, tensors of the file saved with ``use_mmap_format=True`` are memory mapped,
+            and returned as Tensor on CPUPlace(or numpy.ndarray if ``return_numpy`` is True) sharing memory with the mapped
+            file, data is read from file only when it is accessed. Default False.
+            (5) num_threads(int): The number of threads to read shards of the file saved with ``num_shards``.
+            Default min(number of shards, 8).
 
     Returns:
         Object(Object): a target object can be used in paddle
@@ -1043,6 +1630,19 @@ def load(path, **configs):
 
     if _is_memory_buffer(path) or os.path.isfile(path):
         config = _parse_load_config(configs)
+        with _open_file_buffer(path, 'rb') as f:
+            magic = _peek_magic(f)
+            if magic == _MMAP_FORMAT_MAGIC:
+                return _mmap_format_load(path, f, config)
+            if magic == _SHARDED_FORMAT_MAGIC:
+                return _sharded_format_load(path, f, config)
+        if config.mmap:
+            warnings.warn(
+                "`mmap` only takes effect on the file saved with "
+                "`use_mmap_format=True` or `num_shards`, the file will be "
+                "fully loaded."
+            )
+
         exception_type = pickle.UnpicklingError
         try:
             with _open_file_buffer(path, 'rb') as f:
@@ -24,6 +24,7 @@ from ..fluid.dataloader import Sampler  # noqa: F401
 from ..fluid.dataloader import SequenceSampler  # noqa: F401
 from ..fluid.dataloader import RandomSampler  # noqa: F401
 from ..fluid.dataloader import DistributedBatchSampler  # noqa: F401
+from ..fluid.dataloader import BucketBatchSampler  # noqa: F401
 from ..fluid.dataloader import ComposeDataset  # noqa: F401
 from ..fluid.dataloader import ChainDataset  # noqa: F401
 from ..fluid.dataloader import WeightedRandomSampler  # noqa: F401
@@ -38,6 +39,7 @@ __all__ = [  # noqa
     'ChainDataset',
     'BatchSampler',
     'DistributedBatchSampler',
+    'BucketBatchSampler',
     'DataLoader',
     'get_worker_info',
     'Sampler',
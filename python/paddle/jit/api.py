@@ -220,7 +220,12 @@ def ignore_module(modules: List[Any]):
 
 
 def to_static(
-    function=None, input_spec=None, build_strategy=None, property=False
+    function=None,
+    input_spec=None,
+    build_strategy=None,
+    property=False,
+    max_cache_size=None,
+    shape_buckets=None,
 ):
     """
     Converts imperative dygraph APIs into declarative function APIs. Decorator
@@ -230,6 +235,17 @@ def to_static(
     decorated function calls other imperative function, the called one will be
     converted into declarative function as well.
 
+    Note:
+        The converted code and programs can be cached on disk and reused by later
+        processes to skip the conversion, by setting the environment variable
+        ``FLAGS_jit_persistent_cache_dir`` to the cache directory. Programs are
+        keyed by the source code of the function and layers, the functions and
+        values referred by globals and closures, and the non-tensor attributes
+        of layers. States which are not reachable from them (e.g. changed by
+        code outside the function) are not covered, clear the directory once
+        they change. Cache entries are unpickled when loading, the directory
+        must be trusted and only writable by the current user.
+
     Args:
         function (callable): callable imperative function.
         input_spec(list[InputSpec]|tuple[InputSpec]): list/tuple of InputSpec to specific the shape/dtype/name
@@ -240,6 +256,14 @@ def to_static(
             of the computational graph. For more information about build_strategy,
             please refer to :code:`paddle.static.BuildStrategy`. The default is None.
         property(bool, Optional): whether the fucntion is python property. The default is False.
+        max_cache_size(int, Optional): max number of programs traced for different inputs to keep, the least
+            recently used program is evicted if exceeded. The default is None, means no limit.
+        shape_buckets(dict, Optional): {argument name: {axis: list of bucket sizes}}. Dims of input tensors are padded
+            with 0 up to the smallest bucket size not less than them, so that inputs with different shapes share one traced
+            program, and dims of output tensors at the bucketed axes which equal the padded sizes are cropped back to the
+            original sizes. Padded elements are visible to the function, e.g. reductions along the bucketed axes count
+            them, mask them in the function if needed. It is ignored with a warning if ``input_spec`` is specified, for
+            shapes of inputs are fixed by ``input_spec``. The default is None.
 
 
     Returns:
@@ -280,6 +304,8 @@ def to_static(
                 input_spec=input_spec,
                 build_strategy=build_strategy,
                 property=property,
+                max_cache_size=max_cache_size,
+                shape_buckets=shape_buckets,
             ),
         )
 
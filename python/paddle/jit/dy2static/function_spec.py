@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bisect
 import collections
 import inspect
 
@@ -250,6 +251,149 @@ class FunctionSpec:
         return func_to_source_code(self._dygraph_function)
 
 
+class ShapeBucketing:
+    """
+    Rounds dims of input tensors up to bucket sizes and pads them, so that
+    inputs with different shapes share one traced program.
+
+    Output tensors are cropped back to the original size along the bucketed
+    axes: for each bucketed axis, a dim of an output at the same axis which
+    equals the padded size is cropped. Padded elements are still visible to
+    the function, e.g. they are counted by reductions along the bucketed
+    axes, choose `pad_value` accordingly or mask them in the function.
+
+    Args:
+        buckets(dict): {argument name: {axis: list of bucket sizes}}. A dim
+            is padded to the smallest bucket size not less than it, and kept
+            unchanged if it is larger than all bucket sizes.
+        pad_value(int|float, optional): value to pad tensors. Default 0.
+    """
+
+    def __init__(self, buckets, pad_value=0):
+        if not isinstance(buckets, dict):
+            raise TypeError(
+                "The type of `shape_buckets` should be dict, but received {}.".format(
+                    type_name(buckets)
+                )
+            )
+        self._buckets = {}
+        for name, axis_buckets in buckets.items():
+            if not isinstance(axis_buckets, dict):
+                raise TypeError(
+                    "Buckets of argument `{}` should be a dict of {{axis: list of sizes}}, but received {}.".format(
+                        name, type_name(axis_buckets)
+                    )
+                )
+            self._buckets[name] = {}
+            for axis, sizes in axis_buckets.items():
+                sizes = sorted(sizes)
+                if len(sizes) == 0 or not all(
+                    isinstance(size, int) and size > 0 for size in sizes
+                ):
+                    raise ValueError(
+                        "Bucket sizes of argument `{}` should be a non-empty list of positive integers, but received {}.".format(
+                            name, sizes
+                        )
+                    )
+                self._buckets[name][axis] = sizes
+        self._pad_value = pad_value
+
+    @staticmethod
+    def _bucket_size(size, sizes):
+        idx = bisect.bisect_left(sizes, size)
+        return sizes[idx] if idx < len(sizes) else size
+
+    def _padded_shape(self, shape, axis_buckets):
+        padded_shape = list(shape)
+        for axis, sizes in axis_buckets.items():
+            if not -len(shape) <= axis < len(shape):
+                raise ValueError(
+                    "Bucket axis {} is out of range of input with shape {}.".format(
+                        axis, shape
+                    )
+                )
+            padded_shape[axis] = self._bucket_size(shape[axis], sizes)
+        return padded_shape
+
+    def _pad(self, value, axis_buckets, crops):
+        if not isinstance(value, (np.ndarray, core.VarBase, core.eager.Tensor)):
+            return value
+        shape = list(value.shape)
+        padded_shape = self._padded_shape(shape, axis_buckets)
+        for axis in axis_buckets:
+            if padded_shape[axis] > shape[axis]:
+                crop = (shape[axis], padded_shape[axis])
+                # NOTE: inputs padded from different sizes along the same
+                # axis, outputs can not be cropped along it
+                if crops.setdefault(axis, crop) != crop:
+                    crops[axis] = None
+
+        if isinstance(value, np.ndarray):
+            pad_width = [
+                (0, padded - size) for size, padded in zip(shape, padded_shape)
+            ]
+            if any(after > 0 for _, after in pad_width):
+                value = np.pad(
+                    value, pad_width, constant_values=self._pad_value
+                )
+        else:
+            # NOTE: pad with concat, which supports all dtypes and keeps
+            # the gradient of the original tensor
+            for axis in range(len(shape)):
+                if padded_shape[axis] > shape[axis]:
+                    pad_shape = list(value.shape)
+                    pad_shape[axis] = padded_shape[axis] - shape[axis]
+                    padding = paddle.full(
+                        pad_shape, self._pad_value, dtype=value.dtype
+                    )
+                    value = paddle.concat([value, padding], axis=axis)
+        return value
+
+    def pad_args(self, arg_names, args, kwargs):
+        """
+        Pads tensors in `args` and `kwargs` according to the buckets of
+        their argument names, returns the padded `args` and `kwargs`, and
+        {axis: (original size, padded size)} to crop outputs.
+        """
+        crops = {}
+        args = list(args)
+        for i, name in enumerate(arg_names[: len(args)]):
+            if name in self._buckets:
+                args[i] = self._pad(args[i], self._buckets[name], crops)
+        kwargs = {
+            name: self._pad(value, self._buckets[name], crops)
+            if name in self._buckets
+            else value
+            for name, value in kwargs.items()
+        }
+        crops = {axis: crop for axis, crop in crops.items() if crop is not None}
+        return tuple(args), kwargs, crops
+
+    def crop_outputs(self, outputs, crops):
+        """
+        Crops output tensors back to the original sizes along the bucketed
+        axes, see `pad_args`.
+        """
+        if not crops:
+            return outputs
+
+        def crop(value):
+            if not isinstance(value, (core.VarBase, core.eager.Tensor)):
+                return value
+            shape = value.shape
+            for axis, (size, padded) in crops.items():
+                if -len(shape) <= axis < len(shape) and shape[axis] == padded:
+                    value = paddle.slice(
+                        value, axes=[axis % len(shape)], starts=[0], ends=[size]
+                    )
+            return value
+
+        flat = [crop(value) for value in flatten(outputs)]
+        if not isinstance(outputs, (list, tuple, dict)):
+            return flat[0]
+        return pack_sequence_as(outputs, flat)
+
+
 def get_parameters(layer_instance, include_sublayer=True):
     """
     Returns parameters of decorated layers. If set `include_sublayer` True,
@@ -0,0 +1,543 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import threading
+import types
+
+import numpy as np
+
+import paddle
+import paddle.version as fluid_version
+from paddle.fluid import core, framework
+from paddle.fluid.dygraph import layers
+from paddle.fluid.dygraph.base import switch_to_static_graph
+from paddle.fluid.layers.utils import flatten, pack_sequence_as
+
+from . import logging_utils
+from .function_spec import get_buffers, get_parameters
+from .utils import unwrap
+
+__all__ = []
+
+# NOTE: [ persistent cache of dy2static ]
+# Translating a function by `@paddle.jit.to_static` includes two steps:
+# transforming the AST of the dygraph function into static code, and
+# running the static code to build programs for each input spec. Both
+# steps are repeated in every new process. If the cache directory is
+# set by `FLAGS_jit_persistent_cache_dir`, the transformed code and the
+# built programs are saved into it and reused by later processes:
+#   1. `code-<hash>`: transformed source code, keyed by the dygraph
+#      source code.
+#   2. `program-<hash>`: serialized main/startup programs with the names
+#      of inputs, outputs and parameters, keyed by the source files of
+#      the function and layers, the functions, modules and values the
+#      function refers to by globals and closures (recursively), the
+#      non-tensor attributes of the layers, the input specs, the
+#      parameters of the layer, paddle version and flags which affect
+#      the translation.
+# A program loaded from cache is only used if all its parameters are
+# found in the layer with the same names, otherwise it is rebuilt. The
+# key can not cover everything that affects the translation, e.g.
+# python objects which are reached by attributes of unsupported objects,
+# or states changed by code running outside the function, programs are
+# not cached if an unsupported value is found, and the cache should be
+# cleared once such states change.
+#
+# Entries are unpickled when loading, the directory must be trusted and
+# only writable by the current user, entries owned by other users are
+# ignored.
+PERSISTENT_CACHE_DIR_ENV_NAME = 'FLAGS_jit_persistent_cache_dir'
+
+# bump it if the format of cache entries changes
+_CACHE_FORMAT_VERSION = 1
+
+_PADDLE_DIR = os.path.dirname(os.path.abspath(paddle.__file__))
+
+# attributes of Layer which are covered by the sublayers, parameters and
+# buffers in the program key, or do not affect the translation
+_LAYER_INTERNAL_ATTRS = frozenset(
+    [
+        'training',
+        '_full_name',
+        '_helper',
+        '_built',
+        '_init_in_dynamic_mode',
+        '_parameters',
+        '_buffers',
+        '_non_persistable_buffer_names_set',
+        '_sub_layers',
+        '_loaddict_holder',
+        '_op_recorder',
+        '_customized_attrs',
+        '_forward_pre_hooks',
+        '_forward_post_hooks',
+        '_state_dict_hooks',
+        '_original_funcs',
+        '_casted_by_pure_fp16',
+    ]
+)
+
+# max depth of attributes of python objects to fingerprint
+_MAX_VALUE_DEPTH = 4
+
+_CONST_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+_CACHE_LOCK = threading.Lock()
+_PERSISTENT_CACHES = {}
+
+
+def get_persistent_cache():
+    """
+    Returns the PersistentCache of the directory set by
+    `FLAGS_jit_persistent_cache_dir`, or None if it is not set.
+    """
+    cache_dir = os.environ.get(PERSISTENT_CACHE_DIR_ENV_NAME, '')
+    if not cache_dir:
+        return None
+    cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    with _CACHE_LOCK:
+        if cache_dir not in _PERSISTENT_CACHES:
+            _PERSISTENT_CACHES[cache_dir] = PersistentCache(cache_dir)
+        return _PERSISTENT_CACHES[cache_dir]
+
+
+def _hash(obj):
+    return hashlib.sha256(repr(obj).encode('utf-8')).hexdigest()
+
+
+def _environment():
+    return (
+        _CACHE_FORMAT_VERSION,
+        fluid_version.full_version,
+        fluid_version.commit,
+        str(os.environ.get('FLAGS_optim_transformation')),
+    )
+
+
+class _SourceFingerprints:
+    """
+    Hash of source files, source files of paddle are not hashed since
+    they are covered by the version of paddle.
+    """
+
+    def __init__(self):
+        # {file path: (mtime, hash)}
+        self._files = {}
+
+    def of_file(self, path):
+        if path.startswith(_PADDLE_DIR + os.sep):
+            return 'paddle'
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._files.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, 'rb') as f:
+                cached = (mtime, hashlib.sha256(f.read()).hexdigest())
+            self._files[path] = cached
+        return cached[1]
+
+    def of_object(self, obj):
+        """
+        Returns the hash of the source file defining `obj`, and None if
+        the source file is not available.
+        """
+        try:
+            path = inspect.getsourcefile(obj)
+        except TypeError:
+            return None
+        if path is None or not os.path.isfile(path):
+            return None
+        return (getattr(obj, '__qualname__', None), self.of_file(path))
+
+    def of_function(self, function, visited):
+        """
+        Returns the hash of `function` with the functions, modules and
+        values it refers to by globals and closures, which may also be
+        converted by convert_call, and None if any of them is not
+        supported.
+        """
+        fingerprint = self.of_object(function)
+        if fingerprint is None or fingerprint[1] == 'paddle':
+            return fingerprint
+        if id(function) in visited:
+            return ('visited', fingerprint[0])
+        visited.add(id(function))
+
+        referred = []
+        global_names = set()
+        codes = [function.__code__]
+        while codes:
+            code = codes.pop()
+            global_names.update(code.co_names)
+            codes.extend(
+                c for c in code.co_consts if isinstance(c, types.CodeType)
+            )
+        for name in sorted(global_names):
+            if name not in function.__globals__:
+                continue
+            value = self.of_value(function.__globals__[name], visited)
+            if value is None:
+                return None
+            referred.append((name, value))
+        for name, cell in zip(
+            function.__code__.co_freevars, function.__closure__ or ()
+        ):
+            try:
+                contents = cell.cell_contents
+            except ValueError:
+                # the cell is not assigned yet
+                contents = None
+            value = self.of_value(contents, visited)
+            if value is None:
+                return None
+            referred.append((name, value))
+        defaults = self.of_value(
+            (function.__defaults__, function.__kwdefaults__), visited
+        )
+        if defaults is None:
+            return None
+        return fingerprint, referred, defaults
+
+    def of_value(self, value, visited, depth=0):
+        """
+        Returns the hash of a python value which may affect the program
+        translated, and None if the value is not supported.
+        """
+        if isinstance(value, _CONST_TYPES):
+            return repr(value)
+        if isinstance(value, (np.dtype, core.VarDesc.VarType)):
+            return repr(value)
+        if isinstance(value, np.ndarray):
+            return (
+                'ndarray',
+                value.shape,
+                value.dtype.str,
+                hashlib.sha256(np.ascontiguousarray(value).data).hexdigest(),
+            )
+        if isinstance(
+            value, (framework.Variable, core.VarBase, core.eager.Tensor)
+        ):
+            # tensors are inputs of the program, not constants
+            return ('tensor', tuple(value.shape), str(value.dtype))
+        if isinstance(value, layers.Layer):
+            # sublayers are fingerprinted by their attributes
+            return ('layer', type(value).__qualname__)
+        if isinstance(value, types.ModuleType):
+            path = getattr(value, '__file__', None)
+            if path is None or not os.path.isfile(path):
+                return ('module', value.__name__)
+            return ('module', value.__name__, self.of_file(path))
+        if isinstance(value, (types.FunctionType, types.MethodType)):
+            if isinstance(value, types.MethodType):
+                value = value.__func__
+            return self.of_function(value, visited)
+        if isinstance(value, (types.BuiltinFunctionType, np.ufunc)):
+            return ('builtin', getattr(value, '__qualname__', repr(value)))
+        if isinstance(value, type):
+            return self.of_object(value) or ('type', value.__qualname__)
+        if depth >= _MAX_VALUE_DEPTH:
+            return None
+        if isinstance(value, (list, tuple, set, frozenset)):
+            items = [self.of_value(v, visited, depth + 1) for v in value]
+            if any(item is None for item in items):
+                return None
+            if isinstance(value, (set, frozenset)):
+                items = sorted(items, key=repr)
+            return (type(value).__name__, items)
+        if isinstance(value, dict):
+            items = [
+                (repr(k), self.of_value(v, visited, depth + 1))
+                for k, v in value.items()
+            ]
+            if any(item[1] is None for item in items):
+                return None
+            return ('dict', sorted(items, key=lambda item: item[0]))
+        if hasattr(value, '__dict__'):
+            attrs = self.of_value(vars(value), visited, depth + 1)
+            if attrs is None:
+                return None
+            return (self.of_object(type(value)), attrs)
+        return None
+
+    def of_layer_attrs(self, layer):
+        """
+        Returns the hash of non-tensor attributes of `layer`, such as
+        flags set in `__init__`, and None if any of them is not supported.
+        """
+        attrs = []
+        visited = set()
+        for name, value in sorted(vars(layer).items()):
+            if name in _LAYER_INTERNAL_ATTRS:
+                continue
+            fingerprint = self.of_value(value, visited)
+            if fingerprint is None:
+                return None
+            attrs.append((name, fingerprint))
+        return attrs
+
+
+def _spec_signature(specs):
+    signature = []
+    for spec in flatten(specs):
+        if isinstance(spec, paddle.static.InputSpec):
+            signature.append(
+                (
+                    'InputSpec',
+                    tuple(spec.shape),
+                    str(spec.dtype),
+                    spec.name,
+                    getattr(spec, 'stop_gradient', None),
+                )
+            )
+        else:
+            signature.append(repr(spec))
+    return repr(signature), repr(specs)
+
+
+def _encode_structure(structure):
+    """
+    Encodes nested structure of Variables into picklable structure of
+    Variable names.
+    """
+    flat = flatten(structure)
+    leaves = []
+    for item in flat:
+        if isinstance(item, framework.Variable):
+            leaves.append(('var', item.name))
+        elif isinstance(item, layers.Layer):
+            leaves.append(('layer', None))
+        else:
+            leaves.append(('const', item))
+    if structure is None:
+        return None, leaves
+    return pack_sequence_as(structure, list(range(len(flat)))), leaves
+
+
+def _decode_structure(encoded, program, class_instance):
+    template, leaves = encoded
+    block = program.global_block()
+    flat = []
+    for kind, value in leaves:
+        if kind == 'var':
+            flat.append(block.var(value))
+        elif kind == 'layer':
+            flat.append(class_instance)
+        else:
+            flat.append(value)
+    if template is None:
+        return None
+    return pack_sequence_as(template, flat)
+
+
+class PersistentCache:
+    """
+    Saves and loads the transformed code and programs of dy2static in a
+    directory, see NOTE: [ persistent cache of dy2static ].
+
+    Args:
+        cache_dir(str): the directory to save cache entries.
+    """
+
+    def __init__(self, cache_dir):
+        self._cache_dir = cache_dir
+        self._fingerprints = _SourceFingerprints()
+
+    def _path(self, kind, key):
+        return os.path.join(self._cache_dir, '{}-{}'.format(kind, key))
+
+    def _read(self, kind, key):
+        path = self._path(kind, key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                # NOTE: only unpickle entries written by the current user
+                if hasattr(os, 'getuid') and (
+                    os.fstat(f.fileno()).st_uid != os.getuid()
+                ):
+                    logging_utils.warn(
+                        "Ignore dy2static cache {} owned by other user.".format(
+                            path
+                        )
+                    )
+                    return None
+                return pickle.load(f)
+        except Exception as e:
+            logging_utils.warn(
+                "Failed to read dy2static cache {}: {}".format(path, e)
+            )
+            return None
+
+    def _write(self, kind, key, data):
+        # write into a temporary file and rename, so that processes
+        # sharing the directory never read a partial entry
+        try:
+            os.makedirs(self._cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(kind, key))
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except Exception as e:
+            logging_utils.warn(
+                "Failed to write dy2static cache into {}: {}".format(
+                    self._cache_dir, e
+                )
+            )
+
+    def _code_key(self, source_code):
+        return _hash((_environment(), source_code))
+
+    def load_code(self, source_code):
+        """
+        Returns the transformed code of `source_code`, or None if missed.
+        """
+        entry = self._read('code', self._code_key(source_code))
+        if entry is None or entry['source_code'] != source_code:
+            return None
+        logging_utils.log(3, "Load transformed code from persistent cache.")
+        return entry['static_code']
+
+    def save_code(self, source_code, static_code):
+        entry = {'source_code': source_code, 'static_code': static_code}
+        self._write(
+            'code', self._code_key(source_code), pickle.dumps(entry, protocol=4)
+        )
+
+    def _program_key(self, cache_key):
+        function = unwrap(cache_key.function_spec.dygraph_function)
+        if isinstance(function, types.MethodType):
+            function = function.__func__
+        if not isinstance(function, types.FunctionType):
+            return None
+        function_fingerprint = self._fingerprints.of_function(function, set())
+        if function_fingerprint is None:
+            return None
+
+        layer_signature = []
+        class_instance = cache_key.class_instance
+        if class_instance is not None:
+            for sublayer in class_instance.sublayers(include_self=True):
+                fingerprint = self._fingerprints.of_object(type(sublayer))
+                attrs = self._fingerprints.of_layer_attrs(sublayer)
+                if fingerprint is None or attrs is None:
+                    return None
+                layer_signature.append((fingerprint, attrs, sublayer.training))
+            for name, var in list(get_parameters(class_instance).items()) + (
+                list(get_buffers(class_instance).items())
+            ):
+                layer_signature.append(
+                    (name, tuple(var.shape), str(var.dtype), var.stop_gradient)
+                )
+
+        build_strategy = cache_key.kwargs.get('build_strategy', None)
+        return _hash(
+            (
+                _environment(),
+                function_fingerprint,
+                _spec_signature(cache_key.input_args_with_spec),
+                _spec_signature(cache_key.input_kwargs_with_spec),
+                layer_signature,
+                cache_key.kwargs.get('with_hook', False),
+                cache_key.kwargs.get('is_train', False),
+                getattr(build_strategy, 'build_cinn_pass', False),
+                bool(core._is_fwd_prim_enabled()),
+                bool(core._is_bwd_prim_enabled()),
+                framework.default_main_program().random_seed,
+                framework.default_startup_program().random_seed,
+            )
+        )
+
+    @switch_to_static_graph
+    def load_program(self, cache_key):
+        """
+        Returns the ConcreteProgram of `cache_key` loaded from cache, or
+        None if missed.
+        """
+        # imported here since program_translator imports this module
+        from .program_translator import ConcreteProgram
+
+        key = self._program_key(cache_key)
+        if key is None:
+            return None
+        entry = self._read('program', key)
+        if entry is None:
+            return None
+
+        class_instance = cache_key.class_instance
+        available = {}
+        if class_instance is not None:
+            available.update(get_parameters(class_instance))
+            available.update(get_buffers(class_instance))
+        if any(name not in available for name in entry['parameters']):
+            return None
+
+        main_program = framework.Program.parse_from_string(
+            entry['main_program']
+        )
+        startup_program = framework.Program.parse_from_string(
+            entry['startup_program']
+        )
+        main_program.random_seed = entry['random_seed']
+        startup_program.random_seed = entry['startup_random_seed']
+
+        logging_utils.log(
+            3,
+            "Load program of {} from persistent cache.".format(
+                cache_key.function_spec
+            ),
+        )
+        return ConcreteProgram(
+            inputs=_decode_structure(
+                entry['inputs'], main_program, class_instance
+            ),
+            outputs=_decode_structure(
+                entry['outputs'], main_program, class_instance
+            ),
+            parameters=[available[name] for name in entry['parameters']],
+            function=cache_key.function_spec.dygraph_function,
+            main_program=main_program,
+            startup_program=startup_program,
+            **cache_key.kwargs
+        )
+
+    def save_program(self, cache_key, concrete_program):
+        key = self._program_key(cache_key)
+        if key is None:
+            return
+        main_program = concrete_program.main_program
+        startup_program = concrete_program.startup_program
+        entry = {
+            'main_program': main_program.desc.serialize_to_string(),
+            'startup_program': startup_program.desc.serialize_to_string(),
+            'random_seed': main_program.random_seed,
+            'startup_random_seed': startup_program.random_seed,
+            'inputs': _encode_structure(concrete_program.inputs),
+            'outputs': _encode_structure(concrete_program.outputs),
+            'parameters': [p.name for p in concrete_program.parameters],
+        }
+        # programs with inputs or outputs which can not be pickled, such
+        # as python objects, are not cached
+        try:
+            data = pickle.dumps(entry, protocol=4)
+        except Exception:
+            return
+        self._write('program', key, data)
@@ -30,6 +30,7 @@ from . import error, logging_utils
 from .ast_transformer import DygraphToStaticAst
 from .function_spec import (
     FunctionSpec,
+    ShapeBucketing,
     _hash_spec_names,
     get_buffers,
     get_parameters,
@@ -40,6 +41,7 @@ from .origin_info import (
     update_op_callstack_with_origin_info,
 )
 from .partial_program import partial_program_from
+from .persistent_cache import get_persistent_cache
 from .utils import (
     ALREADY_D2S,
     ast_to_func,
@@ -47,6 +49,7 @@ from .utils import (
     func_to_source_code,
     input_specs_compatible,
     make_hashable,
+    source_to_func,
     type_name,
     unwrap,
 )
@@ -121,13 +124,27 @@ class FunctionCache:
         #  Consider this case: source_code in self._code_to_ast_caches,
         #  but actually they are methods in different classes.
         #  Maybe use (__class__, source_code) as key
+        persistent_cache = get_persistent_cache()
         if source_code in self._code_to_ast_caches:
             root_wrapper = self._code_to_ast_caches[source_code]
         else:
+            static_code = None
+            if persistent_cache is not None:
+                static_code = persistent_cache.load_code(source_code)
+            if static_code is not None:
+                # NOTE: origin info is not saved in persistent cache, error
+                # messages of the function point to the transformed code.
+                static_func, file_name = source_to_func(static_code, func)
+                return static_func
+
             root = gast.parse(source_code)
             root = attach_origin_info(root, func)
             root_wrapper = self._dygraph_to_static.get_static_ast(root)
             self._code_to_ast_caches[source_code] = root_wrapper
+            if persistent_cache is not None:
+                persistent_cache.save_code(
+                    source_code, ast_to_source_code(root_wrapper.node)
+                )
 
         # Get static function from AST
         static_func, file_name = ast_to_func(root_wrapper.node, func)
@@ -315,7 +332,18 @@ class StaticFunction:
 
         self._input_spec = input_spec
         self._function_spec = FunctionSpec(function, input_spec)
-        self._program_cache = ProgramCache()
+        self._program_cache = ProgramCache(kwargs.get("max_cache_size", None))
+        shape_buckets = kwargs.get("shape_buckets", None)
+        if shape_buckets is not None and not isinstance(
+            shape_buckets, ShapeBucketing
+        ):
+            shape_buckets = ShapeBucketing(shape_buckets)
+        if shape_buckets is not None and input_spec is not None:
+            logging_utils.warn(
+                "`shape_buckets` is ignored since `input_spec` is specified, "
+                "shapes of inputs are fixed by `input_spec`."
+            )
+        self._shape_buckets = shape_buckets
         self._descriptor_cache = weakref.WeakKeyDictionary()
         # Note: Hold a reference to ProgramTranslator for switching `enable_to_static`.
         self._program_trans = ProgramTranslator()
@@ -434,6 +462,17 @@ class StaticFunction:
 
         # 2. trace ops from dygraph layers and cache the generated program.
         args, kwargs = self._function_spec.unified_args_and_kwargs(args, kwargs)
+        # NOTE: shapes of inputs only affect the program if `input_spec` is
+        # not specified, pad them to bucket sizes to share programs, and
+        # crop outputs back to the original sizes.
+        crops = None
+        if (
+            self._shape_buckets is not None
+            and self._function_spec.input_spec is None
+        ):
+            args, kwargs, crops = self._shape_buckets.pad_args(
+                self._function_spec.args_name, args, kwargs
+            )
 
         try:
             concrete_program, partial_program_layer = self.get_concrete_program(
@@ -452,7 +491,10 @@ class StaticFunction:
 
             # 4. return outputs.
             try:
-                return partial_program_layer(args)
+                outputs = partial_program_layer(args)
+                if crops:
+                    outputs = self._shape_buckets.crop_outputs(outputs, crops)
+                return outputs
             except Exception as e:
                 if not hasattr(e, error.ERROR_DATA):
                     # runtime error
@@ -559,6 +601,13 @@ class StaticFunction:
         """
         return len(self._program_cache)
 
+    def cache_info(self):
+        """
+        Returns the hits, misses, evictions, current size and max size of
+        the program cache of the decorated function.
+        """
+        return self._program_cache.cache_info()
+
     @property
     def code(self):
         """
@@ -1121,19 +1170,42 @@ class FallbackProgramLayer(object):
         return super().__setattr__(key, value)
 
 
+ProgramCacheInfo = collections.namedtuple(
+    'ProgramCacheInfo', ['hits', 'misses', 'evictions', 'size', 'max_size']
+)
+
+
 class ProgramCache:
     """
     Wrapper class for the program functions defined by dygraph function.
+
+    Args:
+        max_size(int, optional): max number of cached programs, the least
+            recently used program is evicted if exceeded. Default None,
+            means no limit.
     """
 
     dy2static_error_file = "to_static.error"
 
-    def __init__(self):
-        # {hash_id : (concrete_program, partial_layer)}
+    def __init__(self, max_size=None):
+        if max_size is not None and (
+            not isinstance(max_size, int) or max_size <= 0
+        ):
+            raise ValueError(
+                "`max_cache_size` should be a positive integer, but received {}.".format(
+                    max_size
+                )
+            )
+        # {hash_id : (concrete_program, partial_layer)}, in order of
+        # least recently used to most recently used
         self._caches = collections.OrderedDict()
+        self._max_size = max_size
         # trace mostly recent used program
         self._recent_key = None
         self._recent_cache_key = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
 
     def _build_once(self, cache_key):
         # TODO(Aurelius84): Need a gloabl FLAGS to enable/disable to_prim
@@ -1142,6 +1214,12 @@ class ProgramCache:
         enable_fallback = enable_prim
         # TODO(CZ): later when use cinn, set_prim_all_enabled and check_and_set_prim_all_enabled will be set at else branch.
         core.check_and_set_prim_all_enabled()
+        persistent_cache = get_persistent_cache()
+        if persistent_cache is not None:
+            concrete_program = persistent_cache.load_program(cache_key)
+            if concrete_program is not None:
+                concrete_program._to_prim()
+                return concrete_program, partial_program_from(concrete_program)
         try:
             concrete_program = ConcreteProgram.from_func_spec(
                 func_spec=cache_key.function_spec,
@@ -1169,6 +1247,8 @@ class ProgramCache:
             else:
                 raise
 
+        if persistent_cache is not None:
+            persistent_cache.save_program(cache_key, concrete_program)
         concrete_program._to_prim()
         return concrete_program, partial_program_from(concrete_program)
 
@@ -1181,14 +1261,23 @@ class ProgramCache:
         item_id = hash(item)
         self._recent_cache_key = item
         self._recent_key = item_id
-        if item_id not in self._caches:
+        if item_id in self._caches:
+            self._hits += 1
+            self._caches.move_to_end(item_id)
+        else:
+            self._misses += 1
             self._caches[item_id] = self._build_once(item)
             # Note: raise warnings if number of traced program is more than `max_tracing_count`
             current_tracing_count = len(self._caches)
-            if current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
+            if self._max_size is not None:
+                while len(self._caches) > self._max_size:
+                    self._caches.popitem(last=False)
+                    self._evictions += 1
+            elif current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
                 logging_utils.warn(
                     "Current traced program number: {} > `max_tracing_count`:{}. Too much cached programs will bring expensive overhead. "
-                    "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors.".format(
+                    "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors. "
+                    "You can set `max_cache_size` or `shape_buckets` in `@paddle.jit.to_static` to limit the cached programs.".format(
                         current_tracing_count, MAX_TRACED_PROGRAM_COUNT
                     )
                 )
@@ -1218,6 +1307,15 @@ class ProgramCache:
     def __len__(self):
         return len(self._caches)
 
+    def cache_info(self):
+        return ProgramCacheInfo(
+            self._hits,
+            self._misses,
+            self._evictions,
+            len(self._caches),
+            self._max_size,
+        )
+
     def concrete_programs(self):
         return [cp for key, (cp, _) in self._caches.items()]
 
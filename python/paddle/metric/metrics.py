@@ -162,6 +162,57 @@ class Metric(metaclass=abc.ABCMeta):
             )
         )
 
+    def state_dict(self):
+        """
+        Returns the states of metric as a dict of python numbers and numpy
+        arrays, which can be saved or sent to other processes, and loaded
+        by :code:`set_state_dict` or combined by :code:`merge`.
+        """
+        raise NotImplementedError(
+            "function 'state_dict' not implemented in {}.".format(
+                self.__class__.__name__
+            )
+        )
+
+    def set_state_dict(self, state_dict):
+        """
+        Sets the states of metric from a dict returned by :code:`state_dict`.
+        """
+        raise NotImplementedError(
+            "function 'set_state_dict' not implemented in {}.".format(
+                self.__class__.__name__
+            )
+        )
+
+    def merge(self, other):
+        """
+        Merges the states of another metric of the same type, or a dict
+        returned by its :code:`state_dict`, into this metric. It can be used
+        to combine metrics updated on different data shards or ranks without
+        gathering the raw predictions.
+        """
+        raise NotImplementedError(
+            "function 'merge' not implemented in {}.".format(
+                self.__class__.__name__
+            )
+        )
+
+    def _other_state_dict(self, other):
+        if isinstance(other, Metric):
+            if not isinstance(other, type(self)):
+                raise TypeError(
+                    "Can not merge {} into {}.".format(
+                        type(other).__name__, type(self).__name__
+                    )
+                )
+            return other.state_dict()
+        if not isinstance(other, dict):
+            raise TypeError(
+                "The 'other' must be a {} or a dict returned by state_dict, "
+                "but received {}.".format(type(self).__name__, type(other))
+            )
+        return other
+
     def compute(self, *args):
         """
         This API is advanced usage to accelerate metric calculating, calulations
@@ -429,17 +480,13 @@ class Precision(Metric):
         elif not _is_numpy_(labels):
             raise ValueError("The 'labels' must be a numpy ndarray or Tensor.")
 
-        sample_num = labels.shape[0]
-        preds = np.floor(preds + 0.5).astype("int32")
+        preds = np.floor(preds + 0.5).astype("int32").reshape([-1])
+        labels = labels.reshape([-1])
 
-        for i in range(sample_num):
-            pred = preds[i]
-            label = labels[i]
-            if pred == 1:
-                if pred == label:
-                    self.tp += 1
-                else:
-                    self.fp += 1
+        positive = preds == 1
+        tp = int(np.count_nonzero(positive & (labels == 1)))
+        self.tp += tp
+        self.fp += int(np.count_nonzero(positive)) - tp
 
     def reset(self):
         """
@@ -448,6 +495,28 @@ class Precision(Metric):
         self.tp = 0
         self.fp = 0
 
+    def state_dict(self):
+        """
+        Returns the states of metric, see :code:`Metric.state_dict`.
+        """
+        return {'tp': self.tp, 'fp': self.fp}
+
+    def set_state_dict(self, state_dict):
+        """
+        Sets the states of metric, see :code:`Metric.set_state_dict`.
+        """
+        self.tp = state_dict['tp']
+        self.fp = state_dict['fp']
+
+    def merge(self, other):
+        """
+        Merges the states of another Precision or its state dict, see
+        :code:`Metric.merge`.
+        """
+        state_dict = self._other_state_dict(other)
+        self.tp += state_dict['tp']
+        self.fp += state_dict['fp']
+
     def accumulate(self):
         """
         Calculate the final precision.
@@ -562,17 +631,13 @@ class Recall(Metric):
         elif not _is_numpy_(labels):
             raise ValueError("The 'labels' must be a numpy ndarray or Tensor.")
 
-        sample_num = labels.shape[0]
-        preds = np.rint(preds).astype("int32")
+        preds = np.rint(preds).astype("int32").reshape([-1])
+        labels = labels.reshape([-1])
 
-        for i in range(sample_num):
-            pred = preds[i]
-            label = labels[i]
-            if label == 1:
-                if pred == label:
-                    self.tp += 1
-                else:
-                    self.fn += 1
+        positive = labels == 1
+        tp = int(np.count_nonzero(positive & (preds == 1)))
+        self.tp += tp
+        self.fn += int(np.count_nonzero(positive)) - tp
 
     def accumulate(self):
         """
@@ -591,6 +656,28 @@ class Recall(Metric):
         self.tp = 0
         self.fn = 0
 
+    def state_dict(self):
+        """
+        Returns the states of metric, see :code:`Metric.state_dict`.
+        """
+        return {'tp': self.tp, 'fn': self.fn}
+
+    def set_state_dict(self, state_dict):
+        """
+        Sets the states of metric, see :code:`Metric.set_state_dict`.
+        """
+        self.tp = state_dict['tp']
+        self.fn = state_dict['fn']
+
+    def merge(self, other):
+        """
+        Merges the states of another Recall or its state dict, see
+        :code:`Metric.merge`.
+        """
+        state_dict = self._other_state_dict(other)
+        self.tp += state_dict['tp']
+        self.fn += state_dict['fn']
+
     def name(self):
         """
         Returns metric name
@@ -602,7 +689,8 @@ class Auc(Metric):
     """
     The auc metric is for binary classification.
     Refer to https://en.wikipedia.org/wiki/Receiver_operating_characteristic#Area_under_the_curve.
-    Please notice that the auc metric is implemented with python, which may be a little bit slow.
+    The predictions are counted in histograms of thresholds by numpy, and
+    histograms of different data shards or ranks can be combined by :code:`merge`.
 
     The `auc` function creates four local variables, `true_positives`,
     `true_negatives`, `false_positives` and `false_negatives` that are used to
@@ -714,14 +802,16 @@ class Auc(Metric):
         elif not _is_numpy_(preds):
             raise ValueError("The 'preds' must be a numpy ndarray or Tensor.")
 
-        for i, lbl in enumerate(labels):
-            value = preds[i, 1]
-            bin_idx = int(value * self._num_thresholds)
-            assert bin_idx <= self._num_thresholds
-            if lbl:
-                self._stat_pos[bin_idx] += 1.0
-            else:
-                self._stat_neg[bin_idx] += 1.0
+        bin_idx = (preds[:, 1] * self._num_thresholds).astype('int64')
+        assert bin_idx.size == 0 or bin_idx.max() <= self._num_thresholds
+        is_pos = labels.reshape([-1]) != 0
+        _num_pred_buckets = self._num_thresholds + 1
+        self._stat_pos += np.bincount(
+            bin_idx[is_pos], minlength=_num_pred_buckets
+        )
+        self._stat_neg += np.bincount(
+            bin_idx[~is_pos], minlength=_num_pred_buckets
+        )
 
     @staticmethod
     def trapezoid_area(x1, x2, y1, y2):
@@ -734,21 +824,21 @@ class Auc(Metric):
         Return:
             float: the area under auc curve
         """
-        tot_pos = 0.0
-        tot_neg = 0.0
-        auc = 0.0
-
-        idx = self._num_thresholds
-        while idx >= 0:
-            tot_pos_prev = tot_pos
-            tot_neg_prev = tot_neg
-            tot_pos += self._stat_pos[idx]
-            tot_neg += self._stat_neg[idx]
-            auc += self.trapezoid_area(
-                tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
+        # accumulate from the highest threshold to the lowest
+        tot_pos = np.cumsum(self._stat_pos[::-1])
+        tot_neg = np.cumsum(self._stat_neg[::-1])
+        tot_pos_prev = np.concatenate([[0.0], tot_pos[:-1]])
+        tot_neg_prev = np.concatenate([[0.0], tot_neg[:-1]])
+        auc = float(
+            np.sum(
+                self.trapezoid_area(
+                    tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
+                )
             )
-            idx -= 1
+        )
 
+        tot_pos = tot_pos[-1]
+        tot_neg = tot_neg[-1]
         return (
             auc / tot_pos / tot_neg if tot_pos > 0.0 and tot_neg > 0.0 else 0.0
         )
@@ -761,6 +851,61 @@ class Auc(Metric):
         self._stat_pos = np.zeros(_num_pred_buckets)
         self._stat_neg = np.zeros(_num_pred_buckets)
 
+    def state_dict(self):
+        """
+        Returns the histograms of positive and negative predictions, see
+        :code:`Metric.state_dict`.
+        """
+        return {
+            'num_thresholds': self._num_thresholds,
+            'stat_pos': self._stat_pos.copy(),
+            'stat_neg': self._stat_neg.copy(),
+        }
+
+    def _check_num_thresholds(self, state_dict):
+        if state_dict['num_thresholds'] != self._num_thresholds:
+            raise ValueError(
+                "The num_thresholds of states should be {}, but received "
+                "{}.".format(self._num_thresholds, state_dict['num_thresholds'])
+            )
+
+    def set_state_dict(self, state_dict):
+        """
+        Sets the histograms of positive and negative predictions, see
+        :code:`Metric.set_state_dict`.
+        """
+        self._check_num_thresholds(state_dict)
+        self._stat_pos = np.array(state_dict['stat_pos'], dtype='float64')
+        self._stat_neg = np.array(state_dict['stat_neg'], dtype='float64')
+
+    def merge(self, other):
+        """
+        Merges the histograms of another Auc with the same num_thresholds, or
+        its state dict, see :code:`Metric.merge`.
+
+        Examples:
+            .. code-block:: python
+
+              import numpy as np
+              import paddle
+
+              m1 = paddle.metric.Auc()
+              m2 = paddle.metric.Auc()
+              for m in [m1, m2]:
+                  preds = np.random.random(size=(8, 2))
+                  labels = np.random.randint(2, size=(8, 1))
+                  m.update(preds=preds, labels=labels)
+
+              # m2.state_dict() can also be gathered from other ranks, e.g.
+              # by paddle.distributed.all_gather_object
+              m1.merge(m2.state_dict())
+              res = m1.accumulate()
+        """
+        state_dict = self._other_state_dict(other)
+        self._check_num_thresholds(state_dict)
+        self._stat_pos += state_dict['stat_pos']
+        self._stat_neg += state_dict['stat_neg']
+
     def name(self):
         """
         Returns metric name
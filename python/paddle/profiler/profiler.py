@@ -358,6 +358,9 @@ class Profiler:
         profile_memory (bool, optional): If it is True, collect tensor memory allocation and release information. Default: False.
         custom_device_types (list, optional): If targets contain profiler.ProfilerTarget.CUSTOM_DEVICE, custom_device_types select the custom device type for profiling. The default value represents all custom devices will be selected.
         with_flops (bool, optional): If it is True, the flops of the op will be calculated. Default: False.
+        incremental_summary (bool, optional): If it is True, the profiling data of each RECORD window is folded into running statistics after ``on_trace_ready`` is called,
+            and the raw data is dropped, so that the memory keeps bounded when profiling long-running jobs with ``make_scheduler`` . ``summary`` prints the statistics of all windows folded
+            so far and can be called while profiling, flops are only printed for the latest window when ``with_flops`` is True, ``export`` is only available inside ``on_trace_ready`` . Default: False.
 
     Examples:
         1. profiling range [2, 5).
@@ -480,6 +483,7 @@ class Profiler:
         emit_nvtx: Optional[bool] = False,
         custom_device_types: Optional[list] = [],
         with_flops: Optional[bool] = False,
+        incremental_summary: Optional[bool] = False,
     ):
         supported_targets = _get_supported_targets()
         if targets:
@@ -544,6 +548,11 @@ class Profiler:
         self.profile_memory = profile_memory
         self.with_flops = with_flops
         self.emit_nvtx = emit_nvtx
+        self.incremental_summary = incremental_summary
+        # statistics folded from all RECORD windows in incremental_summary mode
+        self._statistic_data = None
+        # flops report of the latest RECORD window in incremental_summary mode
+        self._flops_report = None
 
     def __enter__(self):
         self.start()
@@ -643,8 +652,7 @@ class Profiler:
             or self.current_state == ProfilerState.RECORD_AND_RETURN
         ):
             self.profiler_result = self.profiler.stop()
-            if self.on_trace_ready:
-                self.on_trace_ready(self)
+            self._handle_trace_ready()
         utils._is_profiler_used = False
 
     def step(self, num_samples: Optional[int] = None):
@@ -804,8 +812,28 @@ class Profiler:
                 self.profiler_result = self.profiler.stop()
                 self.profiler.prepare()
                 self.profiler.start()
-            if self.on_trace_ready:
-                self.on_trace_ready(self)
+            self._handle_trace_ready()
+
+    def _handle_trace_ready(self):
+        if self.on_trace_ready:
+            self.on_trace_ready(self)
+        if self.incremental_summary and self.profiler_result:
+            statistic_data = StatisticData(
+                self.profiler_result.get_data(),
+                self.profiler_result.get_extra_info(),
+            )
+            if self._statistic_data is None:
+                self._statistic_data = StatisticData({}, {})
+            self._statistic_data.merge(statistic_data)
+            # NOTE: flops are computed on layer trees of each window, which
+            # can not be folded, only the report of the latest window is kept
+            # so that the memory keeps bounded as well
+            if self.with_flops:
+                self._flops_report = gen_layer_flops(
+                    self.profiler_result.get_data()
+                )
+            # drop the node trees of the window to keep the memory bounded
+            self.profiler_result = None
 
     def export(self, path="", format="json"):
         r"""
@@ -873,11 +901,15 @@ class Profiler:
         if isinstance(views, SummaryView):
             views = [views]
 
-        if self.profiler_result:
+        statistic_data = None
+        if self._statistic_data is not None:
+            statistic_data = self._statistic_data
+        elif self.profiler_result:
             statistic_data = StatisticData(
                 self.profiler_result.get_data(),
                 self.profiler_result.get_extra_info(),
             )
+        if statistic_data is not None:
             print(
                 _build_table(
                     statistic_data,
@@ -889,7 +921,9 @@ class Profiler:
                 )
             )
 
-        if self.with_flops:
+        if self.with_flops and (
+            self.profiler_result or self._flops_report is not None
+        ):
             self._print_flops()
 
     def _print_flops(self, repeat=1):
@@ -898,7 +932,11 @@ class Profiler:
             return
 
         print(" Flops Profiler Begin ".center(100, "-"))
-        print(gen_layer_flops(self.profiler_result.get_data(), repeat))
+        if self._flops_report is not None:
+            print("Latest Record Window")
+            print(self._flops_report)
+        else:
+            print(gen_layer_flops(self.profiler_result.get_data(), repeat))
         print("- Flops Profiler End -".center(100, "-"))
 
 
@@ -973,5 +1011,14 @@ def get_profiler(config_path):
             print(
                 'Set timer_only parameter error, use default parameter instead.'
             )
+    if "incremental_summary" in config_dict:
+        if isinstance(config_dict['incremental_summary'], bool):
+            translated_config_dict['incremental_summary'] = config_dict[
+                'incremental_summary'
+            ]
+        else:
+            print(
+                'Set incremental_summary parameter error, use default parameter instead.'
+            )
 
     return Profiler(**translated_config_dict)
@@ -19,10 +19,9 @@ from paddle.fluid.core import TracerEventType, TracerMemEventType
 from paddle.utils.flops import flops
 
 from .statistic_helper import (
-    intersection_ranges,
-    merge_ranges,
-    merge_self_ranges,
-    sum_ranges,
+    IntervalSet,
+    aggregate_durations,
+    count_unique_ranges,
 )
 
 _AllTracerEventType = [
@@ -185,6 +184,17 @@ def get_device_nodes(hostnode):
     return device_nodes
 
 
+def _merge_items(items, other_items):
+    r'''
+    Merge statistic items of another summary into items, keyed by name.
+    '''
+    for name, item in other_items.items():
+        if name in items:
+            items[name].merge(item)
+        else:
+            items[name] = item
+
+
 def _build_layer_from_tree(nodetrees):
     def build_layer(node, depth=0):
 
@@ -342,72 +352,87 @@ class TimeRangeSummary:
     """
 
     def __init__(self):
-        self.CPUTimeRange = collections.defaultdict(list)
+        self.CPUTimeRange = collections.defaultdict(IntervalSet)
         self.GPUTimeRange = collections.defaultdict(
-            lambda: collections.defaultdict(list)
+            lambda: collections.defaultdict(IntervalSet)
         )  # GPU events should be divided into different devices
         self.CPUTimeRangeSum = collections.defaultdict(int)
         self.GPUTimeRangeSum = collections.defaultdict(
             lambda: collections.defaultdict(int)
         )
+        # time of GPU events merged over all devices
+        self.GPUTypeTimeRangeSum = collections.defaultdict(int)
         self.call_times = collections.defaultdict(int)
 
     def parse(self, nodetrees):
         r"""
         Analysis node trees in profiler result, and get time range for different tracer event type.
         """
+        # NOTE: ranges of all threads and streams are collected first and
+        # merged once for each type, see
+        # NOTE: [ interval set of profiler statistic ]
+        cpu_starts = collections.defaultdict(list)
+        cpu_ends = collections.defaultdict(list)
+        gpu_starts = collections.defaultdict(list)  # (device_id, type)
+        gpu_ends = collections.defaultdict(list)
         thread2hostnodes = traverse_tree(nodetrees)
         for threadid, hostnodes in thread2hostnodes.items():
-            CPUTimeRange = collections.defaultdict(list)
-            GPUTimeRange = collections.defaultdict(
-                lambda: collections.defaultdict(
-                    lambda: collections.defaultdict(list)
-                )
-            )  # device_id/type/stream_id
             for hostnode in hostnodes[1:]:  # skip root node
-
-                CPUTimeRange[hostnode.type].append(
-                    (hostnode.start_ns, hostnode.end_ns)
-                )
+                cpu_starts[hostnode.type].append(hostnode.start_ns)
+                cpu_ends[hostnode.type].append(hostnode.end_ns)
                 self.call_times[hostnode.type] += 1
                 for runtimenode in hostnode.runtime_node:
-                    CPUTimeRange[runtimenode.type].append(
-                        (runtimenode.start_ns, runtimenode.end_ns)
-                    )
+                    cpu_starts[runtimenode.type].append(runtimenode.start_ns)
+                    cpu_ends[runtimenode.type].append(runtimenode.end_ns)
                     self.call_times[runtimenode.type] += 1
                     for devicenode in runtimenode.device_node:
-                        GPUTimeRange[devicenode.device_id][devicenode.type][
-                            devicenode.stream_id
-                        ].append((devicenode.start_ns, devicenode.end_ns))
+                        key = (devicenode.device_id, devicenode.type)
+                        gpu_starts[key].append(devicenode.start_ns)
+                        gpu_ends[key].append(devicenode.end_ns)
                         self.call_times[devicenode.type] += 1
 
-            for event_type, time_ranges in CPUTimeRange.items():
-                time_ranges = merge_self_ranges(time_ranges, is_sorted=False)
-                self.CPUTimeRange[event_type] = merge_ranges(
-                    self.CPUTimeRange[event_type], time_ranges, is_sorted=True
-                )
-            for device_id, device_time_ranges in GPUTimeRange.items():
-                for event_type, event_time_ranges in device_time_ranges.items():
-                    for stream_id, time_ranges in event_time_ranges.items():
-                        time_ranges = merge_self_ranges(
-                            time_ranges, is_sorted=False
-                        )
-                        self.GPUTimeRange[device_id][event_type] = merge_ranges(
-                            self.GPUTimeRange[device_id][event_type],
-                            time_ranges,
-                            is_sorted=True,
-                        )
+        for event_type, starts in cpu_starts.items():
+            self.CPUTimeRange[event_type] = IntervalSet(
+                starts, cpu_ends[event_type]
+            )
+        for (device_id, event_type), starts in gpu_starts.items():
+            self.GPUTimeRange[device_id][event_type] = IntervalSet(
+                starts, gpu_ends[(device_id, event_type)]
+            )
 
         for event_type, time_ranges in self.CPUTimeRange.items():
-            self.CPUTimeRangeSum[event_type] = sum_ranges(time_ranges)
+            self.CPUTimeRangeSum[event_type] = time_ranges.total()
+        gpu_type_time_ranges = collections.defaultdict(list)
         for device_id, device_time_ranges in self.GPUTimeRange.items():
             for event_type, time_ranges in device_time_ranges.items():
-                self.GPUTimeRangeSum[device_id][event_type] = sum_ranges(
-                    time_ranges
-                )
+                self.GPUTimeRangeSum[device_id][
+                    event_type
+                ] = time_ranges.total()
+                gpu_type_time_ranges[event_type].append(time_ranges)
+        for event_type, time_ranges in gpu_type_time_ranges.items():
+            self.GPUTypeTimeRangeSum[event_type] = IntervalSet.union_all(
+                time_ranges
+            ).total()
+
+    def merge(self, other):
+        r"""
+        Fold the summary of another profiling window into this one. Time ranges
+        are dropped and only their sums are kept, so windows should not overlap.
+        """
+        self.CPUTimeRange.clear()
+        self.GPUTimeRange.clear()
+        for event_type, value in other.CPUTimeRangeSum.items():
+            self.CPUTimeRangeSum[event_type] += value
+        for device_id, device_time_sums in other.GPUTimeRangeSum.items():
+            for event_type, value in device_time_sums.items():
+                self.GPUTimeRangeSum[device_id][event_type] += value
+        for event_type, value in other.GPUTypeTimeRangeSum.items():
+            self.GPUTypeTimeRangeSum[event_type] += value
+        for event_type, value in other.call_times.items():
+            self.call_times[event_type] += value
 
     def get_gpu_devices(self):
-        return self.GPUTimeRange.keys()
+        return self.GPUTimeRangeSum.keys()
 
     def get_gpu_range_sum(self, device_id, event_type):
         return self.GPUTimeRangeSum[device_id][event_type]
@@ -423,11 +448,16 @@ class DistributedSummary:
     """
 
     def __init__(self):
-        self.cpu_communication_range = []
-        self.gpu_communication_range = []
-        self.communication_range = []
-        self.computation_range = []
-        self.overlap_range = []
+        self.cpu_communication_range = IntervalSet()
+        self.gpu_communication_range = IntervalSet()
+        self.communication_range = IntervalSet()
+        self.computation_range = IntervalSet()
+        self.overlap_range = IntervalSet()
+        self.cpu_communication_time = 0
+        self.gpu_communication_time = 0
+        self.communication_time = 0
+        self.computation_time = 0
+        self.overlap_time = 0
         self.cpu_calls = 0
         self.gpu_calls = 0
 
@@ -435,37 +465,33 @@ class DistributedSummary:
         '''
         Collect all communication and computation time ranges.
         '''
+        cpu_communication = ([], [])
+        gpu_communication = ([], [])
+        computation = ([], [])
+
+        def append(ranges, node):
+            ranges[0].append(node.start_ns)
+            ranges[1].append(node.end_ns)
+
         thread2hostnodes = traverse_tree(nodetrees)
         for threadid, hostnodes in thread2hostnodes.items():
             for hostnode in hostnodes[1:]:  # skip root node
                 # case 1: TracerEventType is Communication
-                if hostnode.type == TracerEventType.Communication:
-                    self.cpu_communication_range.append(
-                        (hostnode.start_ns, hostnode.end_ns)
-                    )
-                    device_nodes = get_device_nodes(hostnode)
-                    for device_node in device_nodes:
-                        if device_node.type == TracerEventType.Kernel:
-                            self.gpu_communication_range.append(
-                                (device_node.start_ns, device_node.end_ns)
-                            )
-
                 # case 2: TracerEventType is Operator but is communication op
-                elif hostnode.type == TracerEventType.Operator and any(
-                    [
-                        name in hostnode.name.lower()
-                        for name in _CommunicationOpName
-                    ]
-                ):
-                    self.cpu_communication_range.append(
-                        (hostnode.start_ns, hostnode.end_ns)
+                if hostnode.type == TracerEventType.Communication or (
+                    hostnode.type == TracerEventType.Operator
+                    and any(
+                        [
+                            name in hostnode.name.lower()
+                            for name in _CommunicationOpName
+                        ]
                     )
+                ):
+                    append(cpu_communication, hostnode)
                     device_nodes = get_device_nodes(hostnode)
                     for device_node in device_nodes:
                         if device_node.type == TracerEventType.Kernel:
-                            self.gpu_communication_range.append(
-                                (device_node.start_ns, device_node.end_ns)
-                            )
+                            append(gpu_communication, device_node)
 
                 # case 3: Others, filter kernels named with nccl
                 else:
@@ -473,32 +499,43 @@ class DistributedSummary:
                         for devicenode in runtimenode.device_node:
                             if devicenode.type == TracerEventType.Kernel:
                                 if 'nccl' in devicenode.name.lower():
-                                    self.gpu_communication_range.append(
-                                        (devicenode.start_ns, devicenode.end_ns)
-                                    )
+                                    append(gpu_communication, devicenode)
                                 else:
-                                    self.computation_range.append(
-                                        (devicenode.start_ns, devicenode.end_ns)
-                                    )
-        self.cpu_calls = len(set(self.cpu_communication_range))
-        self.gpu_calls = len(set(self.gpu_communication_range))
-        self.cpu_communication_range = merge_self_ranges(
-            self.cpu_communication_range, is_sorted=False
-        )
-        self.gpu_communication_range = merge_self_ranges(
-            self.gpu_communication_range, is_sorted=False
-        )
-        self.communication_range = merge_ranges(
-            self.cpu_communication_range,
-            self.gpu_communication_range,
-            is_sorted=True,
+                                    append(computation, devicenode)
+        self.cpu_calls = count_unique_ranges(*cpu_communication)
+        self.gpu_calls = count_unique_ranges(*gpu_communication)
+        self.cpu_communication_range = IntervalSet(*cpu_communication)
+        self.gpu_communication_range = IntervalSet(*gpu_communication)
+        self.communication_range = self.cpu_communication_range.union(
+            self.gpu_communication_range
         )
-        self.computation_range = merge_self_ranges(
-            self.computation_range, is_sorted=False
-        )
-        self.overlap_range = intersection_ranges(
-            self.communication_range, self.computation_range, is_sorted=True
+        self.computation_range = IntervalSet(*computation)
+        self.overlap_range = self.communication_range.intersection(
+            self.computation_range
         )
+        self.cpu_communication_time = self.cpu_communication_range.total()
+        self.gpu_communication_time = self.gpu_communication_range.total()
+        self.communication_time = self.communication_range.total()
+        self.computation_time = self.computation_range.total()
+        self.overlap_time = self.overlap_range.total()
+
+    def merge(self, other):
+        r"""
+        Fold the summary of another profiling window into this one. Time ranges
+        are dropped and only their sums are kept, so windows should not overlap.
+        """
+        self.cpu_communication_range = IntervalSet()
+        self.gpu_communication_range = IntervalSet()
+        self.communication_range = IntervalSet()
+        self.computation_range = IntervalSet()
+        self.overlap_range = IntervalSet()
+        self.cpu_communication_time += other.cpu_communication_time
+        self.gpu_communication_time += other.gpu_communication_time
+        self.communication_time += other.communication_time
+        self.computation_time += other.computation_time
+        self.overlap_time += other.overlap_time
+        self.cpu_calls += other.cpu_calls
+        self.gpu_calls += other.gpu_calls
 
 
 class EventSummary:
@@ -560,6 +597,14 @@ class EventSummary:
                 self.min_general_gpu_time = time
             self.general_gpu_time += time
 
+        def add_gpu_time_stats(self, call, total, min_time, max_time):
+            self.call += call
+            if max_time > self.max_gpu_time:
+                self.max_gpu_time = max_time
+            if min_time < self.min_gpu_time:
+                self.min_gpu_time = min_time
+            self.gpu_time += total
+
         def add_call(self):
             self.call += 1
 
@@ -569,6 +614,25 @@ class EventSummary:
         def add_item(self, node):
             raise NotImplementedError
 
+        def merge(self, other):
+            self.call += other.call
+            self.cpu_time += other.cpu_time
+            self.max_cpu_time = max(self.max_cpu_time, other.max_cpu_time)
+            self.min_cpu_time = min(self.min_cpu_time, other.min_cpu_time)
+            self.gpu_time += other.gpu_time
+            self.max_gpu_time = max(self.max_gpu_time, other.max_gpu_time)
+            self.min_gpu_time = min(self.min_gpu_time, other.min_gpu_time)
+            self.general_gpu_time += other.general_gpu_time
+            self.max_general_gpu_time = max(
+                self.max_general_gpu_time, other.max_general_gpu_time
+            )
+            self.min_general_gpu_time = min(
+                self.min_general_gpu_time, other.min_general_gpu_time
+            )
+            self._flops += other._flops
+            _merge_items(self.devices, other.devices)
+            _merge_items(self.operator_inners, other.operator_inners)
+
     class DeviceItem(ItemBase):
         def add_item(self, node):
             self.call += 1
@@ -684,6 +748,24 @@ class EventSummary:
                             self.add_model_perspective_item(child)
                         deque.append(child)
 
+    def merge(self, other):
+        r"""
+        Fold the summary of another profiling window into this one.
+        """
+        _merge_items(self.items, other.items)
+        for thread_id, items in other.thread_items.items():
+            _merge_items(self.thread_items[thread_id], items)
+        _merge_items(self.userdefined_items, other.userdefined_items)
+        for thread_id, items in other.userdefined_thread_items.items():
+            _merge_items(self.userdefined_thread_items[thread_id], items)
+        _merge_items(
+            self.model_perspective_items, other.model_perspective_items
+        )
+        _merge_items(
+            self.memory_manipulation_items, other.memory_manipulation_items
+        )
+        _merge_items(self.kernel_items, other.kernel_items)
+
     def add_forward_item(self, operator_node):
         pass
 
@@ -749,13 +831,20 @@ class EventSummary:
         self.model_perspective_items[name].add_item(model_perspective_node)
 
     def add_kernel_item(self, root_node):
-        device_nodes = get_device_nodes(root_node)
-        for device_node in device_nodes:
+        names = []
+        durations = []
+        for device_node in get_device_nodes(root_node):
             if device_node.type == TracerEventType.Kernel:
-                name = device_node.name
-                if name not in self.kernel_items:
-                    self.kernel_items[name] = EventSummary.DeviceItem(name)
-                self.kernel_items[name].add_item(device_node)
+                names.append(device_node.name)
+                durations.append(device_node.end_ns - device_node.start_ns)
+        for name, call, total, min_time, max_time in aggregate_durations(
+            names, durations
+        ):
+            if name not in self.kernel_items:
+                self.kernel_items[name] = EventSummary.DeviceItem(name)
+            self.kernel_items[name].add_gpu_time_stats(
+                call, total, min_time, max_time
+            )
 
 
 class MemorySummary:
@@ -793,6 +882,13 @@ class MemorySummary:
                 print("No corresponding type.")
             self.increase_size = self.allocation_size - self.free_size
 
+        def merge(self, other):
+            self.allocation_count += other.allocation_count
+            self.free_count += other.free_count
+            self.allocation_size += other.allocation_size
+            self.free_size += other.free_size
+            self.increase_size = self.allocation_size - self.free_size
+
     def __init__(self):
         self.allocated_items = collections.defaultdict(
             dict
@@ -853,6 +949,47 @@ class MemorySummary:
                         self._analyse_node_memory(host_node.name, child)
                 self._analyse_node_memory(host_node.name, host_node)
 
+    def merge(self, other):
+        r"""
+        Fold the summary of another profiling window into this one.
+        """
+        for place, items in other.allocated_items.items():
+            _merge_items(self.allocated_items[place], items)
+        for place, items in other.reserved_items.items():
+            _merge_items(self.reserved_items[place], items)
+        for place, value in other.peak_allocation_values.items():
+            self.peak_allocation_values[place] = max(
+                self.peak_allocation_values[place], value
+            )
+        for place, value in other.peak_reserved_values.items():
+            self.peak_reserved_values[place] = max(
+                self.peak_reserved_values[place], value
+            )
+
+
+def _merge_extra_info(extra_info, duration, other_extra_info, other_duration):
+    r"""
+    Merge extra info(e.g. cpu utilization) of two profiling windows, numeric
+    values are averaged weighted by the durations of windows, others are
+    taken from the latter window.
+    """
+    merged = dict(extra_info)
+    total = duration + other_duration
+    for key, value in other_extra_info.items():
+        if key not in extra_info:
+            merged[key] = value
+            continue
+        try:
+            prev, curr = float(extra_info[key]), float(value)
+        except (TypeError, ValueError):
+            merged[key] = value
+            continue
+        if total > 0:
+            merged[key] = str((prev * duration + curr * other_duration) / total)
+        else:
+            merged[key] = str((prev + curr) / 2)
+    return merged
+
 
 class StatisticData:
     r"""
@@ -871,6 +1008,29 @@ class StatisticData:
         self.distributed_summary.parse(node_trees)
         self.memory_summary.parse(node_trees)
 
+    def merge(self, other):
+        r"""
+        Fold the statistic of another profiling window into this one. Node
+        trees and time ranges are dropped and only the aggregated results are
+        kept, so that the memory is bounded by the number of distinct events
+        instead of the number of windows.
+        """
+        self.node_trees = None
+        self.extra_info = _merge_extra_info(
+            self.extra_info,
+            self.time_range_summary.get_cpu_range_sum(
+                TracerEventType.ProfileStep
+            ),
+            other.extra_info,
+            other.time_range_summary.get_cpu_range_sum(
+                TracerEventType.ProfileStep
+            ),
+        )
+        self.time_range_summary.merge(other.time_range_summary)
+        self.event_summary.merge(other.event_summary)
+        self.distributed_summary.merge(other.distributed_summary)
+        self.memory_summary.merge(other.memory_summary)
+
 
 def _build_table(
     statistic_data,
@@ -1027,10 +1187,10 @@ def _build_table(
         ) in statistic_data.time_range_summary.CPUTimeRangeSum.items():
             if event_type != TracerEventType.Communication:
                 cpu_type_time[event_type] = value
-        if statistic_data.distributed_summary.cpu_communication_range:
-            cpu_type_time[TracerEventType.Communication] = sum_ranges(
-                statistic_data.distributed_summary.cpu_communication_range
-            )
+        if statistic_data.distributed_summary.cpu_calls:
+            cpu_type_time[
+                TracerEventType.Communication
+            ] = statistic_data.distributed_summary.cpu_communication_time
             cpu_call_times[
                 TracerEventType.Communication
             ] = statistic_data.distributed_summary.cpu_calls
@@ -1058,21 +1218,13 @@ def _build_table(
                     event_type_name
                 ].cpu_time
 
-        gpu_time_range = collections.defaultdict(list)
-        for (
-            device_id,
-            device_time_ranges,
-        ) in statistic_data.time_range_summary.GPUTimeRange.items():
-            for event_type, time_range in device_time_ranges.items():
-                gpu_time_range[event_type] = merge_ranges(
-                    gpu_time_range[event_type], time_range, is_sorted=True
-                )
-        for event_type, time_range in gpu_time_range.items():
-            gpu_type_time[event_type] = sum_ranges(time_range)
-        if statistic_data.distributed_summary.gpu_communication_range:
-            gpu_type_time[TracerEventType.Communication] = sum_ranges(
-                statistic_data.distributed_summary.gpu_communication_range
-            )
+        gpu_type_time.update(
+            statistic_data.time_range_summary.GPUTypeTimeRangeSum
+        )
+        if statistic_data.distributed_summary.gpu_calls:
+            gpu_type_time[
+                TracerEventType.Communication
+            ] = statistic_data.distributed_summary.gpu_communication_time
             gpu_call_times[
                 TracerEventType.Communication
             ] = statistic_data.distributed_summary.gpu_calls
@@ -1255,7 +1407,10 @@ def _build_table(
     if views is None or SummaryView.DistributedView in views:
 
         # ----- Print Distribution Summary Report ----- #
-        if statistic_data.distributed_summary.communication_range:
+        if (
+            statistic_data.distributed_summary.cpu_calls
+            or statistic_data.distributed_summary.gpu_calls
+        ):
             headers = [
                 'Name',
                 'Total Time',
@@ -1279,15 +1434,10 @@ def _build_table(
             append(header_sep)
             append(row_format.format(*headers))
             append(header_sep)
-            communication_time = sum_ranges(
-                statistic_data.distributed_summary.communication_range
-            )
-            computation_time = sum_ranges(
-                statistic_data.distributed_summary.computation_range
-            )
-            overlap_time = sum_ranges(
-                statistic_data.distributed_summary.overlap_range
-            )
+            distributed_summary = statistic_data.distributed_summary
+            communication_time = distributed_summary.communication_time
+            computation_time = distributed_summary.computation_time
+            overlap_time = distributed_summary.overlap_time
             row_values = [
                 'ProfileStep',
                 format_time(total_time, unit=time_unit),
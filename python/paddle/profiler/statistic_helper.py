@@ -12,217 +12,242 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+
+# NOTE: [ interval set of profiler statistic ]
+# Time ranges of events are kept in IntervalSet, which holds the starts
+# and ends of sorted and disjoint ranges in two numpy arrays. Ranges are
+# sorted once when the set is built, and union, intersection and
+# difference of sets are computed by vectorized searchsorted instead of
+# python loops over tuples. Ranges are half open except that zero length
+# ranges are kept, which is the same as the tuple based helpers below.
+
+
+def _as_range_array(values):
+    array = np.asarray(values)
+    if array.dtype.kind not in 'iuf':
+        array = array.astype('int64')
+    return array
+
+
+def _merge_sorted(starts, ends):
+    # merge ranges sorted by start, a range is merged into the previous
+    # one if it starts before or at the end of the previous one
+    if len(starts) == 0:
+        return starts, ends
+    max_ends = np.maximum.accumulate(ends)
+    is_first = np.empty(len(starts), dtype=bool)
+    is_first[0] = True
+    np.greater(starts[1:], max_ends[:-1], out=is_first[1:])
+    first = np.flatnonzero(is_first)
+    last = np.append(first[1:] - 1, len(starts) - 1)
+    return starts[first], max_ends[last]
+
+
+def _overlap_pairs(starts1, ends1, starts2, ends2):
+    """
+    Returns indices of range pairs from two sets which overlap or touch,
+    ranges of the second set should be sorted and disjoint.
+    """
+    lower = np.searchsorted(ends2, starts1, side='left')
+    upper = np.searchsorted(starts2, ends1, side='right')
+    counts = np.maximum(upper - lower, 0)
+    total = int(counts.sum())
+    idx1 = np.repeat(np.arange(len(starts1)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    idx2 = np.repeat(lower, counts) + offsets
+    return idx1, idx2
+
+
+class IntervalSet:
+    r"""
+    A set of sorted and disjoint time ranges backed by numpy arrays.
+
+    Args:
+        starts(numpy.ndarray, optional): starts of ranges.
+        ends(numpy.ndarray, optional): ends of ranges.
+        is_merged(bool, optional): whether the ranges are already sorted
+            and disjoint. Default False.
+    """
+
+    __slots__ = ['starts', 'ends']
+
+    def __init__(self, starts=None, ends=None, is_merged=False):
+        if starts is None:
+            starts = np.empty([0], dtype='int64')
+            ends = np.empty([0], dtype='int64')
+        starts = _as_range_array(starts)
+        ends = _as_range_array(ends)
+        if not is_merged and len(starts) > 0:
+            order = np.argsort(starts, kind='stable')
+            starts, ends = _merge_sorted(starts[order], ends[order])
+        self.starts = starts
+        self.ends = ends
+
+    @classmethod
+    def from_ranges(cls, ranges, is_merged=False):
+        """
+        Builds an IntervalSet from a list of (start, end) tuples.
+        """
+        if isinstance(ranges, IntervalSet):
+            return ranges
+        if len(ranges) == 0:
+            return cls()
+        array = _as_range_array(ranges).reshape([-1, 2])
+        return cls(array[:, 0], array[:, 1], is_merged=is_merged)
+
+    @classmethod
+    def union_all(cls, interval_sets):
+        """
+        Union of several IntervalSets, ranges are sorted only once.
+        """
+        interval_sets = [s for s in interval_sets if len(s) > 0]
+        if len(interval_sets) == 0:
+            return cls()
+        if len(interval_sets) == 1:
+            return interval_sets[0]
+        return cls(
+            np.concatenate([s.starts for s in interval_sets]),
+            np.concatenate([s.ends for s in interval_sets]),
+        )
+
+    def union(self, other):
+        return IntervalSet.union_all([self, other])
+
+    def intersection(self, other):
+        if len(self) == 0 or len(other) == 0:
+            return IntervalSet()
+        idx1, idx2 = _overlap_pairs(
+            self.starts, self.ends, other.starts, other.ends
+        )
+        starts1, ends1 = self.starts[idx1], self.ends[idx1]
+        starts2, ends2 = other.starts[idx2], other.ends[idx2]
+        starts = np.maximum(starts1, starts2)
+        ends = np.minimum(ends1, ends2)
+        # ranges only touching each other do not intersect, a zero length
+        # range intersects a range containing it
+        empty1 = starts1 == ends1
+        empty2 = starts2 == ends2
+        keep = (
+            (starts < ends)
+            | (empty1 & ~empty2 & (starts2 <= starts1) & (starts1 < ends2))
+            | (empty2 & ~empty1 & (starts1 < starts2) & (starts2 < ends1))
+        )
+        return IntervalSet(starts[keep], ends[keep], is_merged=True)
+
+    def difference(self, other):
+        if len(self) == 0 or len(other) == 0:
+            return self
+        dtype = np.result_type(self.starts, other.starts)
+        if dtype.kind == 'f':
+            lowest, highest = -np.inf, np.inf
+        else:
+            lowest, highest = np.iinfo(dtype).min, np.iinfo(dtype).max
+        # subtracting a set is intersecting with the gaps between its ranges
+        gap_starts = np.concatenate([[lowest], other.ends]).astype(dtype)
+        gap_ends = np.concatenate([other.starts, [highest]]).astype(dtype)
+        idx1, idx2 = _overlap_pairs(
+            self.starts, self.ends, gap_starts, gap_ends
+        )
+        starts1, ends1 = self.starts[idx1], self.ends[idx1]
+        starts2, ends2 = gap_starts[idx2], gap_ends[idx2]
+        starts = np.maximum(starts1, starts2)
+        ends = np.minimum(ends1, ends2)
+        keep = (starts < ends) | (
+            (starts1 == ends1) & (starts2 <= starts1) & (starts1 < ends2)
+        )
+        return IntervalSet(starts[keep], ends[keep], is_merged=True)
+
+    def total(self):
+        """
+        Returns the total length of ranges.
+        """
+        return (self.ends - self.starts).sum().item()
+
+    def to_list(self):
+        return list(zip(self.starts.tolist(), self.ends.tolist()))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __repr__(self):
+        return 'IntervalSet({})'.format(self.to_list())
+
+
+def count_unique_ranges(starts, ends):
+    """
+    Returns the number of distinct (start, end) pairs.
+    """
+    if len(starts) == 0:
+        return 0
+    pairs = np.stack([_as_range_array(starts), _as_range_array(ends)], axis=1)
+    return len(np.unique(pairs, axis=0))
+
+
+def aggregate_durations(names, durations):
+    """
+    Aggregates durations by names, returns a list of (name, call, total,
+    min, max) in the order of first appearance of names.
+    """
+    if len(names) == 0:
+        return []
+    index = {}
+    ids = np.fromiter(
+        (index.setdefault(name, len(index)) for name in names),
+        dtype='int64',
+        count=len(names),
+    )
+    order = np.argsort(ids, kind='stable')
+    ids = ids[order]
+    durations = _as_range_array(durations)[order]
+    bounds = np.flatnonzero(np.append(True, ids[1:] != ids[:-1]))
+    calls = np.diff(np.append(bounds, len(ids)))
+    return list(
+        zip(
+            index.keys(),
+            calls.tolist(),
+            np.add.reduceat(durations, bounds).tolist(),
+            np.minimum.reduceat(durations, bounds).tolist(),
+            np.maximum.reduceat(durations, bounds).tolist(),
+        )
+    )
+
 
 def sum_ranges(ranges):
-    result = 0
-    for time_range in ranges:
-        result += time_range[1] - time_range[0]
-    return result
+    if len(ranges) == 0:
+        return 0
+    if isinstance(ranges, IntervalSet):
+        return ranges.total()
+    array = _as_range_array(ranges).reshape([-1, 2])
+    return (array[:, 1] - array[:, 0]).sum().item()
 
 
 def merge_self_ranges(src_ranges, is_sorted=False):
-    merged_ranges = []
-    if len(src_ranges) > 0:
-        if not is_sorted:
-            src_ranges.sort(key=lambda x: x[0])
-        cur_indx = 0
-        merged_ranges.append((src_ranges[cur_indx][0], src_ranges[cur_indx][1]))
-        for cur_indx in range(1, len(src_ranges)):
-            if src_ranges[cur_indx][1] > merged_ranges[-1][1]:
-                if src_ranges[cur_indx][0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (
-                        merged_ranges[-1][0],
-                        src_ranges[cur_indx][1],
-                    )
-                else:
-                    merged_ranges.append(
-                        (src_ranges[cur_indx][0], src_ranges[cur_indx][1])
-                    )
-    return merged_ranges
+    return IntervalSet.from_ranges(src_ranges).to_list()
 
 
 def merge_ranges(range_list1, range_list2, is_sorted=False):
-    merged_ranges = []
-    if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    if len1 == 0 and len2 == 0:
-        return merged_ranges
-    elif len1 == 0:
-        return range_list2
-    elif len2 == 0:
-        return range_list1
-    else:
-        indx1 = 0
-        indx2 = 0
-        range1 = range_list1[indx1]
-        range2 = range_list2[indx2]
-        if range1[0] < range2[0]:
-            merged_ranges.append(range1)
-            indx1 += 1
-        else:
-            merged_ranges.append(range2)
-            indx2 += 1
-        while indx1 < len1 and indx2 < len2:
-            range1 = range_list1[indx1]
-            range2 = range_list2[indx2]
-            if range1[0] < range2[0]:
-                if range1[1] > merged_ranges[-1][1]:
-                    if range1[0] <= merged_ranges[-1][1]:
-                        merged_ranges[-1] = (merged_ranges[-1][0], range1[1])
-                    else:
-                        merged_ranges.append((range1[0], range1[1]))
-                    indx1 += 1
-                else:
-                    indx1 += 1
-            else:
-                if range2[1] > merged_ranges[-1][1]:
-                    if range2[0] <= merged_ranges[-1][1]:
-                        merged_ranges[-1] = (merged_ranges[-1][0], range2[1])
-                    else:
-                        merged_ranges.append((range2[0], range2[1]))
-                    indx2 += 1
-                else:
-                    indx2 += 1
-
-        while indx1 < len1:
-            range1 = range_list1[indx1]
-            if range1[1] > merged_ranges[-1][1]:
-                if range1[0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (merged_ranges[-1][0], range1[1])
-                else:
-                    merged_ranges.append((range1[0], range1[1]))
-                indx1 += 1
-            else:
-                indx1 += 1
-        while indx2 < len2:
-            range2 = range_list2[indx2]
-            if range2[1] > merged_ranges[-1][1]:
-                if range2[0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (merged_ranges[-1][0], range2[1])
-                else:
-                    merged_ranges.append((range2[0], range2[1]))
-                indx2 += 1
-            else:
-                indx2 += 1
-    return merged_ranges
+    return (
+        IntervalSet.from_ranges(range_list1, is_merged=is_sorted)
+        .union(IntervalSet.from_ranges(range_list2, is_merged=is_sorted))
+        .to_list()
+    )
 
 
 def intersection_ranges(range_list1, range_list2, is_sorted=False):
-    result_range = []
-    if len(range_list1) == 0 or len(range_list2) == 0:
-        return result_range
-    if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
-
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    indx1 = 0
-    indx2 = 0
-    range1 = range_list1[indx1]
-    range2 = range_list2[indx2]
-    while indx1 < len1 and indx2 < len2:
-        if range2[1] <= range1[0]:
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] <= range1[0] and range2[1] < range1[1]:
-            assert range2[1] > range1[0]
-            result_range.append((range1[0], range2[1]))
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] <= range1[0]:
-            assert range2[1] >= range1[1]
-            result_range.append(range1)
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-
-        elif range2[1] < range1[1]:
-            assert range2[0] > range1[0]
-            result_range.append(range2)
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] < range1[1]:
-            assert range2[1] >= range1[1]
-            result_range.append((range2[0], range1[1]))
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-
-        else:
-            assert range2[0] >= range1[1]
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-    return result_range
+    return (
+        IntervalSet.from_ranges(range_list1, is_merged=is_sorted)
+        .intersection(IntervalSet.from_ranges(range_list2, is_merged=is_sorted))
+        .to_list()
+    )
 
 
 def subtract_ranges(range_list1, range_list2, is_sorted=False):
-    result_range = []
-    if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
-    if len(range_list1) == 0:
-        return result_range
-    if len(range_list2) == 0:
-        return range_list1
-
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    indx1 = 0
-    indx2 = 0
-    range1 = range_list1[indx1]
-    range2 = range_list2[indx2]
-
-    while indx1 < len(range_list1):
-        if indx2 == len(range_list2):
-            result_range.append(range1)
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-        elif range2[1] <= range1[0]:
-            indx2 += 1
-            if indx2 != len2:
-                range2 = range_list2[indx2]
-        elif range2[0] <= range1[0] and range2[1] < range1[1]:
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 != len2:
-                range2 = range_list2[indx2]
-        elif range2[0] <= range1[0]:
-            assert range2[1] >= range1[1]
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 != len1:
-                range1 = range_list1[indx1]
-        elif range2[0] < range1[1]:
-            assert range2[0] > range1[0]
-            result_range.append((range1[0], range2[0]))
-            range1 = (range2[0], range1[1])
-        else:
-            assert range2[0] >= range1[1]
-            result_range.append(range1)
-            indx1 += 1
-            if indx1 != len1:
-                range1 = range_list1[indx1]
-    return result_range
+    return (
+        IntervalSet.from_ranges(range_list1, is_merged=is_sorted)
+        .difference(IntervalSet.from_ranges(range_list2, is_merged=is_sorted))
+        .to_list()
+    )
@@ -15,15 +15,26 @@
 import itertools
 import logging
 import multiprocessing
+import queue
 import random
 import sys
+import threading
+import traceback
 import warnings
 from itertools import zip_longest
 from queue import Queue
 from threading import Thread
 
+import numpy as np
+
 from paddle.fluid.reader import QUEUE_GET_TIMEOUT
 
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    # python < 3.8
+    shared_memory = None
+
 __all__ = []
 
 # On macOS, the 'spawn' start method is now the default in Python3.8 multiprocessing,
@@ -403,7 +414,118 @@ class XmapEndSignal:
     pass
 
 
-def xmap_readers(mapper, reader, process_num, buffer_size, order=False):
+class _XmapError:
+    # the traceback of an exception raised by the reader or the mapper
+    def __init__(self, message):
+        self.message = message
+
+
+# NOTE: [ shared memory of xmap_readers ]
+# With `use_process=True`, numpy arrays in mapped samples larger than
+# _SHARED_MEMORY_MIN_BYTES are copied into a shared memory block by the
+# worker, only the name of the block is sent through the queue, and the
+# consumer copies the array out and unlinks the block. The worker drops the
+# block from its resource tracker, since the consumer owns it afterwards.
+_SHARED_MEMORY_MIN_BYTES = 1 << 16
+# interval of checking the stop flag and the liveness of workers
+_XMAP_POLL_INTERVAL = 0.1
+# seconds to wait for workers to exit after the consumer stops
+_XMAP_SHUTDOWN_TIMEOUT = 10
+
+
+class _SharedArray:
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+
+def _map_nested(func, obj):
+    if type(obj) in (list, tuple):
+        return type(obj)(_map_nested(func, o) for o in obj)
+    if type(obj) is dict:
+        return {k: _map_nested(func, v) for k, v in obj.items()}
+    return func(obj)
+
+
+def _array_to_shared_memory(obj):
+    if (
+        not isinstance(obj, np.ndarray)
+        or obj.dtype.hasobject
+        or obj.nbytes < _SHARED_MEMORY_MIN_BYTES
+    ):
+        return obj
+    shm = shared_memory.SharedMemory(create=True, size=obj.nbytes)
+    np.ndarray(obj.shape, dtype=obj.dtype, buffer=shm.buf)[...] = obj
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    shm.close()
+    return _SharedArray(shm.name, obj.shape, obj.dtype.str)
+
+
+def _array_from_shared_memory(obj, copy=True):
+    if not isinstance(obj, _SharedArray):
+        return obj
+    shm = shared_memory.SharedMemory(name=obj.name)
+    try:
+        if copy:
+            return np.ndarray(obj.shape, dtype=obj.dtype, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _put_until_stopped(q, item, stop_event):
+    while not stop_event.is_set():
+        try:
+            q.put(item, timeout=_XMAP_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get_until_stopped(q, stop_event):
+    while not stop_event.is_set():
+        try:
+            return q.get(timeout=_XMAP_POLL_INTERVAL)
+        except queue.Empty:
+            pass
+    return None
+
+
+class _OrderWindow:
+    """
+    Bounds the samples read ahead of the next sample to deliver, so that the
+    reorder buffer of ordered xmap_readers holds at most `size` samples.
+    """
+
+    def __init__(self, size):
+        self._cond = threading.Condition()
+        self._next = 0
+        self._size = size
+        self._stopped = False
+
+    def wait(self, order):
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._stopped or order < self._next + self._size
+            )
+            return not self._stopped
+
+    def advance(self):
+        with self._cond:
+            self._next += 1
+            self._cond.notify_all()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+
+def xmap_readers(
+    mapper, reader, process_num, buffer_size, order=False, use_process=False
+):
     """
     Use multi-threads to map samples from reader by a mapper defined by user.
 
@@ -414,87 +536,182 @@ def xmap_readers(mapper, reader, process_num, buffer_size, order=False):
         buffer_size (int): size of the queue to read data in.
         order (bool): whether to keep the data order from original reader.
             Default False.
+        use_process (bool): whether to run the mapper in processes instead
+            of threads, which is faster for mappers holding the GIL. Samples
+            and mapped samples are pickled, and large numpy arrays in mapped
+            samples are passed by shared memory. Not supported on windows.
+            Default False.
 
     Returns:
         callable: a decorated reader with data mapping.
     """
+    if use_process and sys.platform == 'win32':
+        raise NotImplementedError(
+            "xmap_readers with use_process=True is not supported on windows."
+        )
     end = XmapEndSignal()
+    use_shared_memory = use_process and shared_memory is not None
 
-    # define a worker to read samples from reader to in_queue
-    def read_worker(reader, in_queue):
-        for i in reader():
-            in_queue.put(i)
-        in_queue.put(end)
-
-    # define a worker to read samples from reader to in_queue with order flag
-    def order_read_worker(reader, in_queue):
-        in_order = 0
-        for i in reader():
-            in_queue.put((in_order, i))
-            in_order += 1
-        in_queue.put(end)
+    # define a worker to read samples from reader to in_queue, samples are
+    # numbered to be reordered, and wait for the window if order is True
+    def read_worker(in_queue, window, stop_event, errors):
+        try:
+            for in_order, sample in enumerate(reader()):
+                if window is not None and not window.wait(in_order):
+                    return
+                if not _put_until_stopped(
+                    in_queue, (in_order, sample), stop_event
+                ):
+                    return
+        except Exception:
+            errors.append(traceback.format_exc())
+        for _ in range(process_num):
+            if not _put_until_stopped(in_queue, end, stop_event):
+                return
 
     # define a worker to handle samples from in_queue by mapper
     # and put mapped samples into out_queue
-    def handle_worker(in_queue, out_queue, mapper):
-        sample = in_queue.get()
-        while not isinstance(sample, XmapEndSignal):
-            r = mapper(sample)
-            out_queue.put(r)
-            sample = in_queue.get()
-        in_queue.put(end)
+    def handle_worker(in_queue, out_queue, stop_event):
+        try:
+            while True:
+                ins = _get_until_stopped(in_queue, stop_event)
+                if ins is None:
+                    return
+                if isinstance(ins, XmapEndSignal):
+                    break
+                in_order, sample = ins
+                r = mapper(sample)
+                if use_shared_memory:
+                    r = _map_nested(_array_to_shared_memory, r)
+                if not _put_until_stopped(out_queue, (in_order, r), stop_event):
+                    if use_shared_memory:
+                        _map_nested(
+                            lambda o: _array_from_shared_memory(o, False), r
+                        )
+                    return
+        except Exception:
+            out_queue.put(_XmapError(traceback.format_exc()))
+            return
         out_queue.put(end)
 
-    # define a worker to handle samples from in_queue by mapper
-    # and put mapped samples into out_queue by order
-    def order_handle_worker(in_queue, out_queue, mapper, out_order):
-        ins = in_queue.get()
-        while not isinstance(ins, XmapEndSignal):
-            order, sample = ins
-            r = mapper(sample)
-            while order != out_order[0]:
-                pass
-            out_queue.put(r)
-            out_order[0] += 1
-            ins = in_queue.get()
-        in_queue.put(end)
-        out_queue.put(end)
+    def get_mapped(out_queue, workers):
+        if not use_process:
+            return out_queue.get()
+        while True:
+            try:
+                return out_queue.get(timeout=_XMAP_POLL_INTERVAL)
+            except queue.Empty:
+                for w in workers:
+                    if w.exitcode is not None and w.exitcode != 0:
+                        raise RuntimeError(
+                            "xmap_readers worker (pid {}) exited unexpectedly "
+                            "with code {}".format(w.pid, w.exitcode)
+                        )
+
+    def shutdown(out_queue, workers, stop_event, finished):
+        stop_event.set()
+        if finished:
+            for w in workers:
+                w.join()
+            return
+        # drain out_queue until the workers exit, to free shared memory of
+        # mapped samples and unblock workers putting into it
+        deadline = _XMAP_SHUTDOWN_TIMEOUT / _XMAP_POLL_INTERVAL
+        while deadline > 0:
+            alive = any(w.is_alive() for w in workers)
+            try:
+                item = out_queue.get(timeout=_XMAP_POLL_INTERVAL)
+            except queue.Empty:
+                if not alive:
+                    break
+                deadline -= 1
+                continue
+            if use_shared_memory and isinstance(item, tuple):
+                _map_nested(
+                    lambda o: _array_from_shared_memory(o, False), item[1]
+                )
+        for w in workers:
+            if use_process and w.is_alive():
+                w.terminate()
+            w.join(_XMAP_POLL_INTERVAL)
 
     def xreader():
-        in_queue = Queue(buffer_size)
-        out_queue = Queue(buffer_size)
-        out_order = [0]
-        # start a read worker in a thread
-        target = order_read_worker if order else read_worker
-        t = Thread(target=target, args=(reader, in_queue))
-        t.daemon = True
-        t.start()
+        if use_process:
+            in_queue = fork_context.Queue(buffer_size)
+            out_queue = fork_context.Queue(buffer_size)
+            stop_event = fork_context.Event()
+        else:
+            in_queue = Queue(buffer_size)
+            out_queue = Queue(buffer_size)
+            stop_event = threading.Event()
+        # a reorder buffer holds mapped samples ahead of the next one to
+        # deliver, instead of waiting for the order in workers
+        window = _OrderWindow(buffer_size + process_num) if order else None
+        reorder_buffer = {}
+        out_order = 0
+        reader_errors = []
+        finish = 0
+
         # start several handle_workers
-        target = order_handle_worker if order else handle_worker
-        args = (
-            (in_queue, out_queue, mapper, out_order)
-            if order
-            else (in_queue, out_queue, mapper)
-        )
         workers = []
         for i in range(process_num):
-            worker = Thread(target=target, args=args)
+            if use_process:
+                worker = fork_context.Process(
+                    target=handle_worker,
+                    args=(in_queue, out_queue, stop_event),
+                )
+            else:
+                worker = Thread(
+                    target=handle_worker,
+                    args=(in_queue, out_queue, stop_event),
+                )
             worker.daemon = True
             workers.append(worker)
         for w in workers:
             w.start()
+        # start a read worker in a thread, after the worker processes are
+        # forked, so that they never inherit a lock held by the thread
+        t = Thread(
+            target=read_worker,
+            args=(in_queue, window, stop_event, reader_errors),
+        )
+        t.daemon = True
+        t.start()
 
-        sample = out_queue.get()
-        while not isinstance(sample, XmapEndSignal):
-            yield sample
-            sample = out_queue.get()
-        finish = 1
-        while finish < process_num:
-            sample = out_queue.get()
-            if isinstance(sample, XmapEndSignal):
-                finish += 1
-            else:
-                yield sample
+        try:
+            while finish < process_num:
+                sample = get_mapped(out_queue, workers)
+                if isinstance(sample, XmapEndSignal):
+                    finish += 1
+                    continue
+                if isinstance(sample, _XmapError):
+                    raise RuntimeError(
+                        "xmap_readers failed to map a sample:\n{}".format(
+                            sample.message
+                        )
+                    )
+                in_order, sample = sample
+                if use_shared_memory:
+                    sample = _map_nested(_array_from_shared_memory, sample)
+                if not order:
+                    yield sample
+                    continue
+                reorder_buffer[in_order] = sample
+                while out_order in reorder_buffer:
+                    sample = reorder_buffer.pop(out_order)
+                    out_order += 1
+                    window.advance()
+                    yield sample
+            if reader_errors:
+                raise RuntimeError(
+                    "xmap_readers failed to read a sample:\n{}".format(
+                        reader_errors[0]
+                    )
+                )
+        finally:
+            if window is not None:
+                window.stop()
+            shutdown(out_queue, workers, stop_event, finish == process_num)
 
     return xreader
 
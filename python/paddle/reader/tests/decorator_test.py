@@ -17,6 +17,8 @@ import sys
 import time
 import unittest
 
+import numpy as np
+
 import paddle.reader
 
 __all__ = []
@@ -152,6 +154,49 @@ class TestXmap(unittest.TestCase):
                         for idx, e in enumerate(result):
                             self.assertEqual(e, mapper(idx))
 
+    def test_xmap_process(self):
+        if sys.platform == 'win32':
+            return
+
+        def mapper(x):
+            return x, np.full([128, 128], x, dtype='float32')
+
+        for order in (True, False):
+            for process_num in (1, 4):
+                reader = paddle.reader.xmap_readers(
+                    mapper, reader_creator_10(0), process_num, 2, order, True
+                )
+                result = sorted(reader(), key=lambda r: r[0])
+                self.assertEqual([r[0] for r in result], list(range(10)))
+                for idx, image in result:
+                    np.testing.assert_array_equal(image, mapper(idx)[1])
+
+    def test_xmap_error(self):
+        def mapper(x):
+            if x == 5:
+                raise ValueError("invalid sample")
+            return x
+
+        use_processes = (False, True) if sys.platform != 'win32' else (False,)
+        for use_process in use_processes:
+            reader = paddle.reader.xmap_readers(
+                mapper, reader_creator_10(0), 2, 2, True, use_process
+            )
+            with self.assertRaises(RuntimeError) as cm:
+                list(reader())
+            self.assertIn("invalid sample", str(cm.exception))
+
+    def test_xmap_close(self):
+        # readers stopped early shut down their workers
+        reader = paddle.reader.xmap_readers(
+            lambda x: x, reader_creator_10(0), 4, 1, True
+        )
+        for _ in range(3):
+            for i in reader():
+                if i == 2:
+                    break
+        self.assertEqual(list(reader()), list(range(10)))
+
 
 class TestMultiProcessReader(unittest.TestCase):
     def setup(self):
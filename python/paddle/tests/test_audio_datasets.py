@@ -12,12 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import itertools
+import os
+import tempfile
 import unittest
 
 import numpy as np
 from parameterized import parameterized
 
 import paddle
+from paddle.audio.datasets.dataset import AudioClassificationDataset
+from paddle.dataset import array_cache
 
 
 def parameterize(*params):
@@ -116,5 +120,56 @@ class TestAudioDatasets(unittest.TestCase):
         self.assertTrue(0 <= elem[1] <= 2)
 
 
+class TestAudioFeatureCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.old_data_home = array_cache.DATA_HOME
+        array_cache.DATA_HOME = self.temp_dir.name
+        self.files = []
+        for i, length in enumerate([3000, 8000, 4097, 5000, 6001]):
+            path = os.path.join(self.temp_dir.name, '{}.wav'.format(i))
+            waveform = np.random.uniform(-0.5, 0.5, [1, length])
+            paddle.audio.save(
+                path, paddle.to_tensor(waveform, dtype='float32'), 16000
+            )
+            self.files.append(path)
+        self.labels = list(range(len(self.files)))
+
+    def tearDown(self):
+        array_cache.DATA_HOME = self.old_data_home
+        self.temp_dir.cleanup()
+
+    @parameterized.expand(
+        [
+            ('raw', {}),
+            ('mfcc', {'n_mfcc': 20}),
+            ('spectrogram', {'n_fft': 256, 'hop_length': 100}),
+            ('logmelspectrogram', {'n_mels': 32, 'top_db': 80.0}),
+            ('melspectrogram', {'center': False}),
+        ]
+    )
+    def test_cache_features(self, feat_type, feat_config):
+        dataset = AudioClassificationDataset(
+            self.files, self.labels, feat_type=feat_type, **feat_config
+        )
+        for _ in range(2):
+            cached_dataset = AudioClassificationDataset(
+                self.files,
+                self.labels,
+                feat_type=feat_type,
+                cache_features=True,
+                **feat_config,
+            )
+            self.assertEqual(len(cached_dataset), len(dataset))
+            for idx in range(len(dataset)):
+                feat, label = dataset[idx]
+                cached_feat, cached_label = cached_dataset[idx]
+                self.assertEqual(cached_label, label)
+                self.assertEqual(cached_feat.shape, feat.shape)
+                np.testing.assert_allclose(
+                    cached_feat.numpy(), feat.numpy(), rtol=1e-4, atol=1e-4
+                )
+
+
 if __name__ == '__main__':
     unittest.main()
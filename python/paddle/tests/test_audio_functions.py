@@ -315,5 +315,55 @@ class TestAudioFuncitons(unittest.TestCase):
         )
 
 
+class TestMatrixCache(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    @parameterized.expand(
+        [
+            (
+                paddle.audio.functional.compute_fbank_matrix,
+                (16000, 512),
+                {'n_mels': 40, 'htk': True},
+            ),
+            (paddle.audio.functional.create_dct, (20, 40), {}),
+            (
+                paddle.audio.functional.get_window,
+                ('hann', 400),
+                {'dtype': 'float32'},
+            ),
+        ]
+    )
+    def test_cache(self, func, args, kwargs):
+        func.cache_clear()
+        first = func(*args, **kwargs)
+        second = func(*args, **kwargs)
+        info = func.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+        np.testing.assert_array_equal(first.numpy(), second.numpy())
+
+        # returned tensors do not share the cached value
+        value = first.numpy().copy()
+        second *= 2.0
+        np.testing.assert_array_equal(func(*args, **kwargs).numpy(), value)
+
+    def test_shared_by_layers(self):
+        compute_fbank_matrix = paddle.audio.functional.compute_fbank_matrix
+        create_dct = paddle.audio.functional.create_dct
+        compute_fbank_matrix.cache_clear()
+        create_dct.cache_clear()
+        layers = [
+            paddle.audio.features.MFCC(sr=16000, n_mfcc=13) for _ in range(3)
+        ]
+        self.assertEqual(compute_fbank_matrix.cache_info().misses, 1)
+        self.assertEqual(compute_fbank_matrix.cache_info().hits, 2)
+        self.assertEqual(create_dct.cache_info().hits, 2)
+        x = paddle.randn([2, 8000])
+        np.testing.assert_array_equal(
+            layers[0](x).numpy(), layers[2](x).numpy()
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,110 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import itertools
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+import paddle
+import paddle.audio
+
+
+def parameterize(*params):
+    return parameterized.expand(list(itertools.product(*params)))
+
+
+class TestAudioStream(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.wav_path = os.path.join(self.temp_dir.name, 'test.wav')
+        self.sr = 16000
+        waveform = np.random.uniform(-0.5, 0.5, [2, 10007]).astype('float32')
+        paddle.audio.save(self.wav_path, paddle.to_tensor(waveform), self.sr)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @parameterize([0, 100], [-1, 5000], [True, False])
+    def test_stream(self, frame_offset, num_frames, channels_first):
+        wav_data, _ = paddle.audio.load(
+            self.wav_path,
+            frame_offset=frame_offset,
+            num_frames=num_frames,
+            channels_first=channels_first,
+        )
+        axis = 1 if channels_first else 0
+        for source in [self.wav_path, open(self.wav_path, 'rb')]:
+            chunks = list(
+                paddle.audio.stream(
+                    source,
+                    chunk_size=999,
+                    frame_offset=frame_offset,
+                    num_frames=num_frames,
+                    channels_first=channels_first,
+                )
+            )
+            self.assertTrue(all(c.shape[axis] <= 999 for c in chunks))
+            np.testing.assert_array_equal(
+                paddle.concat(chunks, axis=axis).numpy(), wav_data.numpy()
+            )
+
+    @parameterize(
+        ['spectrogram', 'melspectrogram', 'logmelspectrogram', 'mfcc'],
+        [(512, None, True), (400, 160, True), (256, 300, False)],
+        [1000, 4096],
+    )
+    def test_forward_stream(self, feat_type, fft_config, chunk_size):
+        n_fft, hop_length, center = fft_config
+        feat_funcs = {
+            'spectrogram': paddle.audio.features.Spectrogram,
+            'melspectrogram': paddle.audio.features.MelSpectrogram,
+            'logmelspectrogram': paddle.audio.features.LogMelSpectrogram,
+            'mfcc': paddle.audio.features.MFCC,
+        }
+        kwargs = {'n_fft': n_fft, 'hop_length': hop_length, 'center': center}
+        if feat_type != 'spectrogram':
+            kwargs['sr'] = self.sr
+        feature_extractor = feat_funcs[feat_type](**kwargs)
+
+        wav_data, _ = paddle.audio.load(self.wav_path)
+        expected = feature_extractor(wav_data).numpy()
+        for _ in range(2):
+            feats = []
+            for chunk in paddle.audio.stream(self.wav_path, chunk_size):
+                feat = feature_extractor.forward_stream(chunk)
+                if feat is not None:
+                    feats.append(feat)
+            feat = feature_extractor.forward_stream(None, is_last=True)
+            if feat is not None:
+                feats.append(feat)
+            np.testing.assert_allclose(
+                paddle.concat(feats, axis=-1).numpy(),
+                expected,
+                rtol=1e-4,
+                atol=1e-4,
+            )
+
+    def test_top_db(self):
+        feature_extractor = paddle.audio.features.LogMelSpectrogram(
+            sr=self.sr, top_db=80.0
+        )
+        with self.assertRaises(ValueError):
+            feature_extractor.forward_stream(paddle.zeros([1, 1000]))
+
+
+if __name__ == '__main__':
+    unittest.main()
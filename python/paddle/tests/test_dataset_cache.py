@@ -0,0 +1,119 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from paddle.dataset import array_cache
+
+
+class TestArrayCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.temp_dir.name, 'source.bin')
+        with open(self.source, 'wb') as f:
+            f.write(b'source')
+        self.cache_path = os.path.join(self.temp_dir.name, 'test.pdarray')
+        self.build_count = 0
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def build(self):
+        self.build_count += 1
+        data, offsets = array_cache.pack_bytes([b'abc', b'', b'hello'])
+        return {
+            'images': np.arange(24, dtype='uint8').reshape([2, 12]),
+            'labels': np.array([[1], [2]], dtype='int64'),
+            'empty': np.zeros([0, 3], dtype='float32'),
+            'data': data,
+            'offsets': offsets,
+        }
+
+    def cached_arrays(self):
+        array_cache.save_arrays(self.cache_path, self.build(), [self.source])
+        return array_cache.load_arrays(self.cache_path, [self.source])
+
+    def test_round_trip(self):
+        arrays = self.cached_arrays()
+        expected = self.build()
+        self.assertEqual(set(arrays.keys()), set(expected.keys()))
+        for name, array in expected.items():
+            self.assertEqual(arrays[name].dtype, array.dtype)
+            np.testing.assert_array_equal(arrays[name], array)
+        self.assertIsInstance(arrays['images'], np.memmap)
+
+        self.assertEqual(
+            array_cache.unpack_bytes(arrays['data'], arrays['offsets'], 2),
+            b'hello',
+        )
+        self.assertEqual(
+            array_cache.unpack_bytes(arrays['data'], arrays['offsets'], 1),
+            b'',
+        )
+
+    def test_stale(self):
+        self.cached_arrays()
+        self.assertIsNone(array_cache.load_arrays('not_exist.pdarray'))
+
+        # ensure mtime changes
+        time.sleep(0.01)
+        with open(self.source, 'wb') as f:
+            f.write(b'changed source')
+        self.assertIsNone(
+            array_cache.load_arrays(self.cache_path, [self.source])
+        )
+        self.assertIsNotNone(array_cache.load_arrays(self.cache_path))
+
+        with open(self.cache_path, 'wb') as f:
+            f.write(b'broken')
+        self.assertIsNone(array_cache.load_arrays(self.cache_path))
+
+    def test_pickle(self):
+        arrays = self.cached_arrays()
+        images = pickle.loads(pickle.dumps(arrays['images']))
+        self.assertIsInstance(images, np.memmap)
+        np.testing.assert_array_equal(images, arrays['images'])
+
+        # views are pickled by data
+        row = pickle.loads(pickle.dumps(arrays['images'][1:]))
+        self.assertNotIsInstance(row, np.memmap)
+        np.testing.assert_array_equal(row, arrays['images'][1:])
+
+    def test_cached_arrays(self):
+        old_data_home = array_cache.DATA_HOME
+        array_cache.DATA_HOME = self.temp_dir.name
+        try:
+            for _ in range(2):
+                arrays = array_cache.cached_arrays(
+                    'test', [self.source], 'train', self.build
+                )
+            self.assertEqual(self.build_count, 1)
+            np.testing.assert_array_equal(arrays['labels'], [[1], [2]])
+            self.assertTrue(
+                os.path.exists(
+                    array_cache.get_cache_path('test', [self.source], 'train')
+                )
+            )
+        finally:
+            array_cache.DATA_HOME = old_data_home
+
+
+if __name__ == '__main__':
+    unittest.main()
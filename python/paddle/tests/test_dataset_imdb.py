@@ -12,10 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
+import os
+import tarfile
+import tempfile
 import unittest
 
 import numpy as np
 
+from paddle.dataset import array_cache
 from paddle.text.datasets import Imdb
 
 
@@ -47,5 +52,52 @@ class TestImdbTest(unittest.TestCase):
         self.assertTrue(int(label) in [0, 1])
 
 
+class TestImdbCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.old_data_home = array_cache.DATA_HOME
+        array_cache.DATA_HOME = self.temp_dir.name
+        self.data_file = os.path.join(self.temp_dir.name, 'imdb.tar.gz')
+        docs = {
+            'train/pos/0.txt': b'Good movie, good!\n',
+            'train/neg/0.txt': b'bad Movie.\n',
+            'train/pos/1.txt': b'good\n',
+            'train/unsup/0.txt': b'ignored ignored ignored\n',
+            'test/pos/0.txt': b'movie <unk>\n',
+            'test/neg/0.txt': b'\n',
+        }
+        with tarfile.open(self.data_file, 'w:gz') as tarf:
+            for name, doc in docs.items():
+                info = tarfile.TarInfo('aclImdb/' + name)
+                info.size = len(doc)
+                tarf.addfile(info, io.BytesIO(doc))
+
+    def tearDown(self):
+        array_cache.DATA_HOME = self.old_data_home
+        self.temp_dir.cleanup()
+
+    def test_main(self):
+        for use_cache in [False, True, True]:
+            imdb = Imdb(
+                self.data_file, mode='train', cutoff=1, use_cache=use_cache
+            )
+            # words appearing more than cutoff times, sorted by frequency
+            self.assertEqual(
+                imdb.word_idx, {b'good': 0, b'movie': 1, '<unk>': 2}
+            )
+            self.assertEqual(len(imdb), 3)
+            expected = [([0, 1, 0], 0), ([0], 0), ([2, 1], 1)]
+            for i, (doc, label) in enumerate(expected):
+                data, data_label = imdb[i]
+                np.testing.assert_array_equal(data, doc)
+                self.assertEqual(data.dtype, np.int64)
+                np.testing.assert_array_equal(data_label, [label])
+
+        imdb = Imdb(self.data_file, mode='test', cutoff=1)
+        np.testing.assert_array_equal(imdb[0][0], [1, 2])
+        self.assertEqual(len(imdb[1][0]), 0)
+        np.testing.assert_array_equal(imdb.labels, [0, 1])
+
+
 if __name__ == '__main__':
     unittest.main()
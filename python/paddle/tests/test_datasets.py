@@ -15,12 +15,15 @@
 import os
 import shutil
 import tempfile
+import time
 import unittest
+from unittest import mock
 
 import cv2
 import numpy as np
 
 import paddle.vision.transforms as T
+from paddle.dataset import array_cache
 from paddle.dataset.common import _check_exists_and_download
 from paddle.vision.datasets import (
     MNIST,
@@ -35,6 +38,9 @@ class TestFolderDatasets(unittest.TestCase):
     def setUp(self):
         self.data_dir = tempfile.mkdtemp()
         self.empty_dir = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.old_data_home = array_cache.DATA_HOME
+        array_cache.DATA_HOME = self.cache_dir
         for i in range(2):
             sub_dir = os.path.join(self.data_dir, 'class_' + str(i))
             if not os.path.exists(sub_dir):
@@ -44,7 +50,9 @@ class TestFolderDatasets(unittest.TestCase):
                 cv2.imwrite(os.path.join(sub_dir, str(j) + '.jpg'), fake_img)
 
     def tearDown(self):
+        array_cache.DATA_HOME = self.old_data_home
         shutil.rmtree(self.data_dir)
+        shutil.rmtree(self.cache_dir)
 
     def test_dataset(self):
         dataset_folder = DatasetFolder(self.data_dir)
@@ -85,6 +93,73 @@ class TestFolderDatasets(unittest.TestCase):
         for _ in loader:
             pass
 
+    def test_fused_decode(self):
+        for transform, shape in [
+            (T.Compose([T.RandomResizedCrop(8), T.Transpose()]), (3, 8, 8)),
+            (T.Compose([T.Resize((8, 6)), T.Transpose()]), (3, 8, 6)),
+            (T.Transpose(), (3, 32, 32)),
+        ]:
+            dataset_folder = DatasetFolder(
+                self.data_dir, transform=transform, fused_decode=True
+            )
+            for img, _ in dataset_folder:
+                self.assertEqual(img.shape, shape)
+
+            loader = ImageFolder(
+                self.data_dir, transform=transform, fused_decode=True
+            )
+            for (img,) in loader:
+                self.assertEqual(img.shape, shape)
+
+        with self.assertRaises(ValueError):
+            DatasetFolder(self.data_dir, loader=cv2.imread, fused_decode=True)
+
+    def backdate_dirs(self):
+        # directories modified within _MTIME_RESOLUTION_NS of the last scan
+        # are always listed
+        mtime = time.time() - 60
+        for root, _, _ in os.walk(self.data_dir):
+            os.utime(root, (mtime, mtime))
+
+    def listed_dirs(self):
+        with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+            dataset = DatasetFolder(self.data_dir, cache_index=True)
+        listed = [
+            os.path.relpath(call.args[0], self.data_dir)
+            for call in scandir.call_args_list
+        ]
+        return dataset, sorted(listed)
+
+    def test_cache_index(self):
+        dataset_folder = DatasetFolder(self.data_dir)
+        self.backdate_dirs()
+        cached_folder, listed = self.listed_dirs()
+        self.assertEqual(cached_folder.samples, dataset_folder.samples)
+        self.assertEqual(listed, ['.', 'class_0', 'class_1'])
+
+        # unchanged directories are not listed again, only the classes are
+        # found from the root
+        cached_folder, listed = self.listed_dirs()
+        self.assertEqual(cached_folder.samples, dataset_folder.samples)
+        self.assertEqual(listed, ['.'])
+
+        # new files are found by listing the modified directory only
+        sub_dir = os.path.join(self.data_dir, 'class_1', 'sub_dir')
+        os.makedirs(sub_dir)
+        fake_img = (np.random.random((32, 32, 3)) * 255).astype('uint8')
+        cv2.imwrite(os.path.join(sub_dir, '2.jpg'), fake_img)
+        cached_folder, listed = self.listed_dirs()
+        self.assertEqual(
+            cached_folder.samples, DatasetFolder(self.data_dir).samples
+        )
+        self.assertEqual(len(cached_folder), 5)
+        self.assertEqual(
+            listed, ['.', 'class_1', os.path.join('class_1', 'sub_dir')]
+        )
+
+        loader = ImageFolder(self.data_dir, cache_index=True)
+        self.assertEqual(loader.samples, ImageFolder(self.data_dir).samples)
+
     def test_errors(self):
         with self.assertRaises(RuntimeError):
             ImageFolder(self.empty_dir)
@@ -109,6 +184,34 @@ class TestMNISTTest(unittest.TestCase):
         self.assertTrue(label.shape[0] == 1)
         self.assertTrue(0 <= int(label) <= 9)
 
+    def test_getitems(self):
+        indices = [9, 0, 4321, 9999]
+        for transform in [None, T.Transpose()]:
+            for use_cache in [True, False]:
+                mnist = MNIST(
+                    mode='test',
+                    transform=transform,
+                    backend='cv2',
+                    use_cache=use_cache,
+                )
+                images, labels = mnist.__getitems__(indices)
+                samples = [mnist[i] for i in indices]
+                np.testing.assert_array_equal(
+                    images, np.stack([s[0] for s in samples])
+                )
+                np.testing.assert_array_equal(
+                    labels, np.stack([s[1] for s in samples])
+                )
+                self.assertEqual(labels.dtype, np.int64)
+
+        # `images` keeps float32 samples for subclasses
+        self.assertEqual(mnist.images[0].dtype, np.float32)
+        self.assertEqual(mnist.images[0].shape, (784,))
+        self.assertEqual(len(mnist.images[:10]), 10)
+        np.testing.assert_array_equal(
+            mnist.images[4321].reshape([28, 28]), mnist[4321][0][0]
+        )
+
 
 class TestMNISTTrain(unittest.TestCase):
     def test_main(self):
@@ -355,5 +355,61 @@ class TestAuc(unittest.TestCase):
         self.assertEqual(m.accumulate(), 0.0)
 
 
+class TestMetricMerge(unittest.TestCase):
+    def random_binary(self, n):
+        preds = np.random.random(size=(n, 1))
+        labels = np.random.randint(2, size=(n, 1))
+        return preds, labels
+
+    def check_merge(self, metric_cls, to_preds=lambda x: x):
+        shards = [self.random_binary(n) for n in [100, 37, 0, 64]]
+        metric = metric_cls()
+        metric.update(
+            to_preds(np.concatenate([preds for preds, _ in shards])),
+            np.concatenate([labels for _, labels in shards]),
+        )
+
+        merged = metric_cls()
+        for i, (preds, labels) in enumerate(shards):
+            shard_metric = metric_cls()
+            shard_metric.update(to_preds(preds), labels)
+            # merge both metrics and state dicts
+            merged.merge(shard_metric if i % 2 else shard_metric.state_dict())
+        self.assertAlmostEqual(merged.accumulate(), metric.accumulate())
+
+        loaded = metric_cls()
+        loaded.set_state_dict(merged.state_dict())
+        self.assertAlmostEqual(loaded.accumulate(), metric.accumulate())
+
+        with self.assertRaises(TypeError):
+            merged.merge(paddle.metric.Accuracy())
+
+    def test_precision(self):
+        self.check_merge(paddle.metric.Precision)
+
+    def test_recall(self):
+        self.check_merge(paddle.metric.Recall)
+
+    def test_auc(self):
+        self.check_merge(
+            paddle.metric.Auc, lambda x: np.concatenate([1 - x, x], axis=1)
+        )
+        with self.assertRaises(ValueError):
+            paddle.metric.Auc(num_thresholds=255).merge(paddle.metric.Auc())
+
+    def test_auc_reference(self):
+        preds, labels = self.random_binary(1000)
+        m = paddle.metric.Auc()
+        m.update(np.concatenate([1 - preds, preds], axis=1), labels)
+
+        # probability that a positive sample ranks above a negative one
+        bins = (preds.reshape([-1]) * 4095).astype('int64')
+        pos = bins[labels.reshape([-1]) == 1]
+        neg = bins[labels.reshape([-1]) == 0]
+        diff = pos.reshape([-1, 1]) - neg.reshape([1, -1])
+        expected = (np.sum(diff > 0) + 0.5 * np.sum(diff == 0)) / diff.size
+        self.assertAlmostEqual(m.accumulate(), expected)
+
+
 if __name__ == '__main__':
     unittest.main()
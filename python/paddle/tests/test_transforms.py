@@ -1225,5 +1225,104 @@ class TestFunctional(unittest.TestCase):
         self.assertTrue(test_adjust_hue(batch_tensor))
 
 
+class TestBatchCompose(unittest.TestCase):
+    def setUp(self):
+        set_image_backend('cv2')
+        self.images = np.random.randint(0, 256, (4, 10, 12, 3), dtype='uint8')
+
+    def transform_samples(self, trans):
+        outputs = []
+        for image in self.images:
+            for t in trans:
+                image = t(image)
+            outputs.append(np.asarray(image))
+        return np.stack(outputs)
+
+    def test_deterministic(self):
+        for trans in [
+            [
+                transforms.RandomHorizontalFlip(1.0),
+                transforms.ToTensor(),
+                transforms.Normalize([0.4, 0.5, 0.6], [0.2, 0.3, 0.4]),
+            ],
+            [
+                transforms.RandomVerticalFlip(1.0),
+                transforms.CenterCrop((7, 5)),
+                transforms.ToTensor(data_format='HWC'),
+                transforms.Normalize(
+                    [0.4, 0.5, 0.6], [0.2, 0.3, 0.4], data_format='HWC'
+                ),
+            ],
+            [
+                transforms.RandomHorizontalFlip(0.0),
+                transforms.Normalize(127.5, 127.5, data_format='HWC'),
+                transforms.Transpose(),
+            ],
+        ]:
+            batch_trans = transforms.BatchCompose(trans)
+            np.testing.assert_allclose(
+                batch_trans(self.images),
+                self.transform_samples(trans),
+                rtol=1e-05,
+                atol=1e-06,
+            )
+
+    def test_fuse(self):
+        batch_trans = transforms.BatchCompose(
+            [transforms.ToTensor(), transforms.Normalize(0.5, 0.5)]
+        )
+        self.assertEqual(len(batch_trans._stages), 1)
+        output = batch_trans(self.images)
+        self.assertEqual(output.shape, (4, 3, 10, 12))
+        self.assertEqual(output.dtype, np.float32)
+
+    def test_random_crop(self):
+        batch_trans = transforms.BatchCompose(
+            [transforms.RandomCrop(6, padding=2, padding_mode='edge')]
+        )
+        output = batch_trans(self.images)
+        self.assertEqual(output.shape, (4, 6, 6, 3))
+
+        padded = np.pad(
+            self.images, ((0, 0), (2, 2), (2, 2), (0, 0)), mode='edge'
+        )
+        for k in range(4):
+            self.assertTrue(
+                any(
+                    np.array_equal(output[k], padded[k, i : i + 6, j : j + 6])
+                    for i in range(9)
+                    for j in range(11)
+                )
+            )
+
+    def test_custom_transform(self):
+        class CustomFlip(transforms.BaseTransform):
+            def _get_params(self, inputs):
+                image = inputs[self.keys.index('image')]
+                return {'flip': image[0, 0, 0] % 2 == 0}
+
+            def _apply_image(self, image):
+                if self.params['flip']:
+                    return image[:, ::-1]
+                return image
+
+        trans = [CustomFlip(), lambda image: image[1:]]
+        np.testing.assert_array_equal(
+            transforms.BatchCompose(trans)(self.images),
+            self.transform_samples(trans),
+        )
+
+    def test_collate(self):
+        batch_trans = transforms.BatchCompose(
+            [transforms.RandomCrop(8), transforms.ToTensor()]
+        )
+        samples = [
+            (image, np.array([i])) for i, image in enumerate(self.images)
+        ]
+        images, labels = batch_trans.collate(samples)
+        self.assertEqual(images.shape, (4, 3, 8, 8))
+        np.testing.assert_array_equal(labels, [[0], [1], [2], [3]])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -13,12 +13,16 @@
 # limitations under the License.
 
 import collections
+import itertools
+import os
 import re
 import string
 import tarfile
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
+from paddle.dataset.array_cache import cached_arrays, pack_bytes, unpack_bytes
 from paddle.dataset.common import _check_exists_and_download
 from paddle.io import Dataset
 
@@ -27,6 +31,77 @@ __all__ = []
 URL = 'https://dataset.bj.bcebos.com/imdb%2FaclImdb_v1.tar.gz'
 MD5 = '7c2ac02c03563afcf9b574c7e56c153a'
 
+# NOTE: [ streaming tokenization of imdb ]
+# The corpus is read in one streaming pass over the tar file. Documents are
+# grouped into chunks of the same split and label, and tokenized by a process
+# pool. Each chunk returns its own vocabulary, the ids of its tokens into
+# that vocabulary and the counts of the vocabulary, so the counts of chunks
+# are merged into the word dictionary without sending the tokens back, and
+# the ids of documents of the requested mode are mapped to the word
+# dictionary by one lookup table per chunk. The encoded documents are stored
+# as one flat int32 array and an offsets array in an array cache (see
+# NOTE: [ array cache of datasets ]).
+_PATTERN = re.compile(r"aclImdb/((train)|(test))/((pos)|(neg))/.*\.txt$")
+_PUNCTUATION = string.punctuation.encode('latin-1')
+_CHUNK_SIZE = 1000
+_NUM_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _tokenize_chunk(docs):
+    vocab = {}
+    lengths = np.zeros([len(docs)], dtype='int64')
+    ids = []
+    for i, doc in enumerate(docs):
+        # newline and punctuations removal and ad-hoc tokenization.
+        tokens = (
+            doc.rstrip(b'\n\r').translate(None, _PUNCTUATION).lower().split()
+        )
+        lengths[i] = len(tokens)
+        ids.extend(vocab.setdefault(w, len(vocab)) for w in tokens)
+    ids = np.array(ids, dtype='int32')
+    counts = np.bincount(ids, minlength=len(vocab))
+    return list(vocab), ids, lengths, counts
+
+
+def _read_chunks(data_file):
+    # yields (split, label, raw documents) of the same split and label
+    key, docs = None, []
+    with tarfile.open(data_file) as tarf:
+        for tf in tarf:
+            match = _PATTERN.match(tf.name)
+            if match is None:
+                continue
+            member_key = (match.group(1), match.group(4))
+            if docs and (member_key != key or len(docs) >= _CHUNK_SIZE):
+                yield key + (docs,)
+                docs = []
+            key = member_key
+            docs.append(tarf.extractfile(tf).read())
+    if docs:
+        yield key + (docs,)
+
+
+class _Documents:
+    """
+    Documents in CSR layout, indexing one returns an int64 array of word ids.
+    """
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("document index out of range")
+        return self.data[self.offsets[idx] : self.offsets[idx + 1]].astype(
+            'int64'
+        )
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
 
 class Imdb(Dataset):
     """
@@ -39,6 +114,9 @@ class Imdb(Dataset):
         cutoff(int): cutoff number for building word dictionary. Default 150.
         download(bool): whether to download dataset automatically if
             :attr:`data_file` is not set. Default True
+        use_cache(bool): whether to save the word dictionary and encoded
+            documents into a memory mapped cache and load them from it
+            after that. Default False
 
     Returns:
         Dataset: instance of IMDB dataset
@@ -71,7 +149,14 @@ class Imdb(Dataset):
 
     """
 
-    def __init__(self, data_file=None, mode='train', cutoff=150, download=True):
+    def __init__(
+        self,
+        data_file=None,
+        mode='train',
+        cutoff=150,
+        download=True,
+        use_cache=False,
+    ):
         assert mode.lower() in [
             'train',
             'test',
@@ -87,64 +172,91 @@ class Imdb(Dataset):
                 data_file, URL, MD5, 'imdb', download
             )
 
-        # Build a word dictionary from the corpus
-        self.word_idx = self._build_work_dict(cutoff)
+        self.cutoff = cutoff
+        self.use_cache = use_cache
 
-        # read dataset into memory
-        self._load_anno()
+        # build a word dictionary and encode the corpus, or map them
+        # from cache
+        self._parse_dataset()
 
-    def _build_work_dict(self, cutoff):
-        word_freq = collections.defaultdict(int)
-        pattern = re.compile(r"aclImdb/((train)|(test))/((pos)|(neg))/.*\.txt$")
-        for doc in self._tokenize(pattern):
-            for word in doc:
-                word_freq[word] += 1
+    def _parse_dataset(self):
+        if self.use_cache:
+            arrays = cached_arrays(
+                'imdb',
+                [self.data_file],
+                '{}-{}'.format(self.mode, self.cutoff),
+                self._read_arrays,
+            )
+        else:
+            arrays = self._read_arrays()
+        num_words = len(arrays['word_offsets']) - 1
+        self.word_idx = {
+            unpack_bytes(arrays['words'], arrays['word_offsets'], i): i
+            for i in range(num_words)
+        }
+        self.word_idx['<unk>'] = num_words
+        self.docs = _Documents(arrays['docs'], arrays['doc_offsets'])
+        self.labels = arrays['labels']
+
+    def _read_arrays(self):
+        word_freq = collections.Counter()
+        # (labels, vocab, ids, lengths) of chunks of the mode
+        chunks = []
+        with ProcessPoolExecutor(_NUM_WORKERS) as executor:
+            raw_chunks = _read_chunks(self.data_file)
+            # keep a bounded number of chunks in flight
+            pending = collections.deque()
+            while True:
+                for split, label, docs in itertools.islice(
+                    raw_chunks, 2 * _NUM_WORKERS - len(pending)
+                ):
+                    pending.append(
+                        (split, label, executor.submit(_tokenize_chunk, docs))
+                    )
+                if not pending:
+                    break
+                split, label, future = pending.popleft()
+                vocab, ids, lengths, counts = future.result()
+                word_freq.update(dict(zip(vocab, counts.tolist())))
+                if split == self.mode:
+                    chunks.append((label, vocab, ids, lengths))
 
         # Not sure if we should prune less-frequent words here.
-        word_freq = [x for x in word_freq.items() if x[1] > cutoff]
+        word_freq = [x for x in word_freq.items() if x[1] > self.cutoff]
 
         dictionary = sorted(word_freq, key=lambda x: (-x[1], x[0]))
-        words, _ = list(zip(*dictionary))
-        word_idx = dict(list(zip(words, range(len(words)))))
-        word_idx['<unk>'] = len(words)
-        return word_idx
-
-    def _tokenize(self, pattern):
-        data = []
-        with tarfile.open(self.data_file) as tarf:
-            tf = tarf.next()
-            while tf is not None:
-                if bool(pattern.match(tf.name)):
-                    # newline and punctuations removal and ad-hoc tokenization.
-                    data.append(
-                        tarf.extractfile(tf)
-                        .read()
-                        .rstrip(b'\n\r')
-                        .translate(None, string.punctuation.encode('latin-1'))
-                        .lower()
-                        .split()
-                    )
-                tf = tarf.next()
-
-        return data
-
-    def _load_anno(self):
-        pos_pattern = re.compile(r"aclImdb/{}/pos/.*\.txt$".format(self.mode))
-        neg_pattern = re.compile(r"aclImdb/{}/neg/.*\.txt$".format(self.mode))
-
-        UNK = self.word_idx['<unk>']
-
-        self.docs = []
-        self.labels = []
-        for doc in self._tokenize(pos_pattern):
-            self.docs.append([self.word_idx.get(w, UNK) for w in doc])
-            self.labels.append(0)
-        for doc in self._tokenize(neg_pattern):
-            self.docs.append([self.word_idx.get(w, UNK) for w in doc])
-            self.labels.append(1)
+        words = [w for w, _ in dictionary]
+        word_idx = dict(zip(words, range(len(words))))
+        UNK = len(words)
+
+        # pos documents come first, then neg documents
+        chunks.sort(key=lambda c: c[0] != 'pos')
+        docs, lengths, labels = [], [], []
+        for label, vocab, ids, chunk_lengths in chunks:
+            lookup = np.array(
+                [word_idx.get(w, UNK) for w in vocab], dtype='int32'
+            )
+            docs.append(lookup[ids])
+            lengths.append(chunk_lengths)
+            labels.append(
+                np.full([len(chunk_lengths)], label != 'pos', dtype='int64')
+            )
+        lengths = np.concatenate(lengths) if lengths else np.zeros([0], 'int64')
+        doc_offsets = np.zeros([len(lengths) + 1], dtype='int64')
+        np.cumsum(lengths, out=doc_offsets[1:])
+        words_data, word_offsets = pack_bytes(words)
+        return {
+            'words': words_data,
+            'word_offsets': word_offsets,
+            'docs': np.concatenate(docs) if docs else np.zeros([0], 'int32'),
+            'doc_offsets': doc_offsets,
+            'labels': np.concatenate(labels)
+            if labels
+            else np.zeros([0], 'int64'),
+        }
 
     def __getitem__(self, idx):
-        return (np.array(self.docs[idx]), np.array([self.labels[idx]]))
+        return (self.docs[idx], np.array([self.labels[idx]]))
 
     def __len__(self):
         return len(self.docs)
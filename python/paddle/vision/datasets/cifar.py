@@ -14,11 +14,13 @@
 
 import pickle
 import tarfile
+from collections.abc import Sequence
 
 import numpy as np
 from PIL import Image
 
 import paddle
+from paddle.dataset.array_cache import cached_arrays
 from paddle.dataset.common import _check_exists_and_download
 from paddle.io import Dataset
 
@@ -38,6 +40,25 @@ MODE_FLAG_MAP = {
 }
 
 
+class _Samples(Sequence):
+    """
+    Read-only list of (image, label) samples over the image and label
+    arrays, which keeps :code:`Cifar10.data` compatible.
+    """
+
+    def __init__(self, images, labels):
+        self._images = images
+        self._labels = labels
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        return self._images[idx], int(self._labels[idx])
+
+    def __len__(self):
+        return len(self._labels)
+
+
 class Cifar10(Dataset):
     """
     Implementation of `Cifar-10 <https://www.cs.toronto.edu/~kriz/cifar.html>`_
@@ -53,6 +74,9 @@ class Cifar10(Dataset):
             PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
             If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_vision_image_get_image_backend>`,
             default backend is 'pil'. Default: None.
+        use_cache (bool, optional): Whether to save the parsed images and labels
+            into a binary cache file in ~/.cache/paddle/dataset/cifar/cache, which is
+            memory-mapped instead of unpickled when the dataset is created again. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of Cifar10 dataset.
@@ -110,6 +134,7 @@ class Cifar10(Dataset):
         transform=None,
         download=True,
         backend=None,
+        use_cache=False,
     ):
         assert mode.lower() in [
             'train',
@@ -139,8 +164,9 @@ class Cifar10(Dataset):
             )
 
         self.transform = transform
+        self.use_cache = use_cache
 
-        # read dataset into memory
+        # read dataset into memory, or map it from cache
         self._load_data()
 
         self.dtype = paddle.get_default_dtype()
@@ -151,7 +177,23 @@ class Cifar10(Dataset):
         self.flag = MODE_FLAG_MAP[self.mode + '10']
 
     def _load_data(self):
-        self.data = []
+        if self.use_cache:
+            arrays = cached_arrays(
+                'cifar', [self.data_file], self.flag, self._read_arrays
+            )
+        else:
+            arrays = self._read_arrays()
+        self.images = arrays['images']
+        self.labels = arrays['labels']
+
+    @property
+    def data(self):
+        # samples were kept in a list of (image, label) before
+        return _Samples(self.images, self.labels)
+
+    def _read_arrays(self):
+        images = []
+        labels = []
         with tarfile.open(self.data_file, mode='r') as f:
             names = (
                 each_item.name for each_item in f if self.flag in each_item.name
@@ -162,14 +204,19 @@ class Cifar10(Dataset):
             for name in names:
                 batch = pickle.load(f.extractfile(name), encoding='bytes')
 
-                data = batch[b'data']
-                labels = batch.get(b'labels', batch.get(b'fine_labels', None))
-                assert labels is not None
-                for sample, label in zip(data, labels):
-                    self.data.append((sample, label))
+                batch_labels = batch.get(
+                    b'labels', batch.get(b'fine_labels', None)
+                )
+                assert batch_labels is not None
+                images.append(np.asarray(batch[b'data'], dtype=np.uint8))
+                labels.append(np.asarray(batch_labels, dtype='int64'))
+        return {
+            'images': np.concatenate(images),
+            'labels': np.concatenate(labels),
+        }
 
     def __getitem__(self, idx):
-        image, label = self.data[idx]
+        image, label = self.images[idx], self.labels[idx]
         image = np.reshape(image, [3, 32, 32])
         image = image.transpose([1, 2, 0])
 
@@ -184,7 +231,7 @@ class Cifar10(Dataset):
         return image.astype(self.dtype), np.array(label).astype('int64')
 
     def __len__(self):
-        return len(self.data)
+        return len(self.labels)
 
 
 class Cifar100(Cifar10):
@@ -202,6 +249,9 @@ class Cifar100(Cifar10):
             PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
             If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_vision_image_get_image_backend>`,
             default backend is 'pil'. Default: None.
+        use_cache (bool, optional): Whether to save the parsed images and labels
+            into a binary cache file in ~/.cache/paddle/dataset/cifar/cache, which is
+            memory-mapped instead of unpickled when the dataset is created again. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of Cifar100 dataset.
@@ -259,8 +309,11 @@ class Cifar100(Cifar10):
         transform=None,
         download=True,
         backend=None,
+        use_cache=False,
     ):
-        super().__init__(data_file, mode, transform, download, backend)
+        super().__init__(
+            data_file, mode, transform, download, backend, use_cache
+        )
 
     def _init_url_md5_flag(self):
         self.data_url = CIFAR100_URL
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
 import os
 import tarfile
 
@@ -19,6 +20,7 @@ import numpy as np
 from PIL import Image
 
 import paddle
+from paddle.dataset.array_cache import cached_arrays, pack_bytes, unpack_bytes
 from paddle.dataset.common import _check_exists_and_download
 from paddle.io import Dataset
 from paddle.utils import try_import
@@ -57,6 +59,9 @@ class Flowers(Dataset):
             PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
             If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_vision_image_get_image_backend>`,
             default backend is 'pil'. Default: None.
+        use_cache (bool, optional): Whether to save the encoded images of :attr:`mode` and labels
+            into a binary cache file in ~/.cache/paddle/dataset/flowers/cache, which is memory-mapped
+            when the dataset is created again, instead of extracting :attr:`data_file`. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of Flowers dataset.
@@ -116,6 +121,7 @@ class Flowers(Dataset):
         transform=None,
         download=True,
         backend=None,
+        use_cache=False,
     ):
         assert mode.lower() in [
             'train',
@@ -160,6 +166,27 @@ class Flowers(Dataset):
             )
 
         self.transform = transform
+        self.flag = flag
+        self.data_file = data_file
+        self.label_file = label_file
+        self.setid_file = setid_file
+
+        if use_cache:
+            # jpeg files of the mode are read from tar into cache, which
+            # avoids extracting the whole archive, see
+            # NOTE: [ array cache of datasets ]
+            arrays = cached_arrays(
+                'flowers',
+                [data_file, label_file, setid_file],
+                flag,
+                self._read_arrays,
+            )
+            self.data_path = None
+            self.labels = arrays['labels']
+            self.indexes = arrays['indexes']
+            self.images = arrays['images']
+            self.image_offsets = arrays['image_offsets']
+            return
 
         data_tar = tarfile.open(data_file)
         self.data_path = data_file.replace(".tgz", "/")
@@ -167,15 +194,44 @@ class Flowers(Dataset):
             os.mkdir(self.data_path)
         data_tar.extractall(self.data_path)
 
+        self.labels, self.indexes = self._load_labels()
+        self.images = None
+        self.image_offsets = None
+
+    def _load_labels(self):
         scio = try_import('scipy.io')
-        self.labels = scio.loadmat(label_file)['labels'][0]
-        self.indexes = scio.loadmat(setid_file)[flag][0]
+        labels = scio.loadmat(self.label_file)['labels'][0]
+        indexes = scio.loadmat(self.setid_file)[self.flag][0]
+        return labels, indexes
+
+    def _read_arrays(self):
+        labels, indexes = self._load_labels()
+        with tarfile.open(self.data_file) as data_tar:
+            name2mem = {member.name: member for member in data_tar}
+            images = [
+                data_tar.extractfile(
+                    name2mem["jpg/image_%05d.jpg" % index]
+                ).read()
+                for index in indexes
+            ]
+        images, image_offsets = pack_bytes(images)
+        return {
+            'labels': np.asarray(labels),
+            'indexes': np.asarray(indexes),
+            'images': images,
+            'image_offsets': image_offsets,
+        }
 
     def __getitem__(self, idx):
         index = self.indexes[idx]
         label = np.array([self.labels[index - 1]])
-        img_name = "jpg/image_%05d.jpg" % index
-        image = os.path.join(self.data_path, img_name)
+        if self.images is not None:
+            image = io.BytesIO(
+                unpack_bytes(self.images, self.image_offsets, idx)
+            )
+        else:
+            img_name = "jpg/image_%05d.jpg" % index
+            image = os.path.join(self.data_path, img_name)
         if self.backend == 'pil':
             image = Image.open(image)
         elif self.backend == 'cv2':
@@ -12,11 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
 import os
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
+import numpy as np
 from PIL import Image
 
 import paddle
+from paddle.dataset.array_cache import get_cache_path, load_arrays, save_arrays
 from paddle.io import Dataset
 from paddle.utils import try_import
 
@@ -40,7 +46,157 @@ def has_valid_extension(filename, extensions):
     return filename.lower().endswith(extensions)
 
 
-def make_dataset(dir, class_to_idx, extensions, is_valid_file=None):
+# NOTE: [ directory index of folder datasets ]
+# Listing a directory tree with millions of files costs minutes on network
+# filesystems. _DirectoryIndex lists directories in a thread pool, each
+# directory is a task and its subdirectories are submitted when it is
+# listed. With cache_index, the names in each directory are saved with its
+# mtime into an index file, see NOTE: [ array cache of datasets ]. A
+# directory is listed again only if its mtime changed, which happens when
+# entries are added, removed or renamed in it, so creating the dataset
+# again costs a stat for each directory instead of a listing. Directories
+# modified within _MTIME_RESOLUTION of the last scan are always listed, as
+# some filesystems have coarse mtime.
+_MTIME_RESOLUTION_NS = 2 * 10**9
+
+
+def _encode_names(names):
+    # file names can not contain '\0'
+    return np.frombuffer(
+        '\0'.join(names).encode('utf-8', 'surrogateescape'), dtype=np.uint8
+    )
+
+
+def _decode_names(array, count):
+    if count == 0:
+        return []
+    return array.tobytes().decode('utf-8', 'surrogateescape').split('\0')
+
+
+class _DirectoryIndex:
+    def __init__(self, root, cache_index=False, num_workers=None):
+        self.root = root
+        self.index_path = (
+            get_cache_path('folder', [root], 'index') if cache_index else None
+        )
+        self.num_workers = num_workers
+        self.entries = {}
+        self.scan_time = 0
+        if self.index_path is not None:
+            self._load()
+        self.changed = False
+
+    def _load(self):
+        arrays = load_arrays(self.index_path)
+        if arrays is None:
+            return
+        mtimes = arrays['mtimes'].tolist()
+        num_subdirs = arrays['num_subdirs'].tolist()
+        num_files = arrays['num_files'].tolist()
+        dirs = _decode_names(arrays['dirs'], len(mtimes))
+        subdirs = _decode_names(arrays['subdirs'], sum(num_subdirs))
+        files = _decode_names(arrays['files'], sum(num_files))
+        subdir_start, file_start = 0, 0
+        for rel, mtime, subdir_count, file_count in zip(
+            dirs, mtimes, num_subdirs, num_files
+        ):
+            self.entries[rel] = (
+                mtime,
+                subdirs[subdir_start : subdir_start + subdir_count],
+                files[file_start : file_start + file_count],
+            )
+            subdir_start += subdir_count
+            file_start += file_count
+        self.scan_time = int(arrays['scan_time'][0])
+
+    def _list(self, rel):
+        path = os.path.join(self.root, rel)
+        mtime = os.stat(path).st_mtime_ns
+        entry = self.entries.get(rel)
+        if (
+            entry is not None
+            and entry[0] == mtime
+            and mtime < self.scan_time - _MTIME_RESOLUTION_NS
+        ):
+            return entry, False
+
+        subdirs, files = [], []
+        with os.scandir(path) as it:
+            for e in it:
+                # follow symbolic links of directories like os.walk with
+                # followlinks=True
+                if e.is_dir():
+                    subdirs.append(e.name)
+                else:
+                    files.append(e.name)
+        return (mtime, sorted(subdirs), sorted(files)), True
+
+    def walk(self, tops):
+        """
+        Lists the trees of relative paths `tops`, returns a list of sorted
+        [(dir_path, file_names)] for each top.
+        """
+        scan_time = time.time_ns()
+        trees = [{} for _ in tops]
+        with ThreadPoolExecutor(self.num_workers) as pool:
+            # future -> (index of top, relative path of directory)
+            pending = {
+                pool.submit(self._list, top): (i, top)
+                for i, top in enumerate(tops)
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, rel = pending.pop(future)
+                    entry, changed = future.result()
+                    self.changed = self.changed or changed
+                    trees[i][rel] = entry
+                    for subdir in entry[1]:
+                        subdir = os.path.join(rel, subdir)
+                        pending[pool.submit(self._list, subdir)] = (i, subdir)
+
+        entries = {}
+        for tree in trees:
+            entries.update(tree)
+        self.changed = self.changed or entries.keys() != self.entries.keys()
+        self.entries = entries
+        if self.changed:
+            self.scan_time = scan_time
+        return [
+            [
+                (os.path.join(self.root, rel), tree[rel][2])
+                for rel in sorted(tree)
+            ]
+            for tree in trees
+        ]
+
+    def save(self):
+        if self.index_path is None or not self.changed:
+            return
+        dirs = list(self.entries.keys())
+        entries = [self.entries[rel] for rel in dirs]
+        arrays = {
+            'dirs': _encode_names(dirs),
+            'mtimes': np.array([e[0] for e in entries], dtype='int64'),
+            'num_subdirs': np.array([len(e[1]) for e in entries], 'int64'),
+            'num_files': np.array([len(e[2]) for e in entries], 'int64'),
+            'subdirs': _encode_names([n for e in entries for n in e[1]]),
+            'files': _encode_names([n for e in entries for n in e[2]]),
+            'scan_time': np.array([self.scan_time], dtype='int64'),
+        }
+        try:
+            save_arrays(self.index_path, arrays)
+        except OSError as e:
+            warnings.warn(
+                "Failed to write index of {} into {}: {}".format(
+                    self.root, self.index_path, e
+                )
+            )
+
+
+def make_dataset(
+    dir, class_to_idx, extensions, is_valid_file=None, cache_index=False
+):
     images = []
     dir = os.path.expanduser(dir)
 
@@ -49,12 +205,18 @@ def make_dataset(dir, class_to_idx, extensions, is_valid_file=None):
         def is_valid_file(x):
             return has_valid_extension(x, extensions)
 
-    for target in sorted(class_to_idx.keys()):
-        d = os.path.join(dir, target)
-        if not os.path.isdir(d):
-            continue
-        for root, _, fnames in sorted(os.walk(d, followlinks=True)):
-            for fname in sorted(fnames):
+    targets = [
+        target
+        for target in sorted(class_to_idx.keys())
+        if os.path.isdir(os.path.join(dir, target))
+    ]
+    # see NOTE: [ directory index of folder datasets ]
+    index = _DirectoryIndex(dir, cache_index)
+    trees = index.walk(targets)
+    index.save()
+    for target, tree in zip(targets, trees):
+        for root, fnames in tree:
+            for fname in fnames:
                 path = os.path.join(root, fname)
                 if is_valid_file(path):
                     item = (path, class_to_idx[target])
@@ -88,6 +250,13 @@ class DatasetFolder(Dataset):
         is_valid_file (Callable, optional): A function that takes path of a file
             and check if the file is a valid file. Both :attr:`extensions` and
             :attr:`is_valid_file` should not be passed. Default: None.
+        fused_decode (bool, optional): Whether to decode JPEG images at a reduced size when :attr:`transform`
+            starts with ``Resize`` or ``RandomResizedCrop``, the image is downscaled by 1/2, 1/4 or 1/8 in
+            the decoder as long as the resized output keeps its resolution, and the random crop is drawn
+            before decoding. It can not be used with :attr:`loader`. Default: False.
+        cache_index (bool, optional): Whether to save the listing of :attr:`root` into an index file in
+            ~/.cache/paddle/dataset/folder/cache, only the directories modified since then are listed
+            again when the dataset is created again. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of DatasetFolder.
@@ -207,6 +376,8 @@ class DatasetFolder(Dataset):
         extensions=None,
         transform=None,
         is_valid_file=None,
+        fused_decode=False,
+        cache_index=False,
     ):
         self.root = root
         self.transform = transform
@@ -214,7 +385,7 @@ class DatasetFolder(Dataset):
             extensions = IMG_EXTENSIONS
         classes, class_to_idx = self._find_classes(self.root)
         samples = make_dataset(
-            self.root, class_to_idx, extensions, is_valid_file
+            self.root, class_to_idx, extensions, is_valid_file, cache_index
         )
         if len(samples) == 0:
             raise (
@@ -226,6 +397,7 @@ class DatasetFolder(Dataset):
 
         self.loader = default_loader if loader is None else loader
         self.extensions = extensions
+        self._fused_loader = _make_fused_loader(loader, transform, fused_decode)
 
         self.classes = classes
         self.class_to_idx = class_to_idx
@@ -260,9 +432,12 @@ class DatasetFolder(Dataset):
             tuple: (sample, target) where target is class_index of the target class.
         """
         path, target = self.samples[index]
-        sample = self.loader(path)
-        if self.transform is not None:
-            sample = self.transform(sample)
+        if self._fused_loader is not None:
+            sample = self._fused_loader(path)
+        else:
+            sample = self.loader(path)
+            if self.transform is not None:
+                sample = self.transform(sample)
 
         return sample, target
 
@@ -303,6 +478,127 @@ def default_loader(path):
         return pil_loader(path)
 
 
+def _reduced_scale(size, min_size):
+    # the largest JPEG DCT scaling denominator, with which the decoded image
+    # is still not smaller than min_size
+    w, h = size
+    min_w, min_h = min_size
+    for scale in (8, 4, 2):
+        if w // scale >= min_w and h // scale >= min_h:
+            return scale
+    return 1
+
+
+def _make_fused_loader(loader, transform, fused_decode):
+    if not fused_decode:
+        return None
+    if loader is not None:
+        raise ValueError(
+            "fused_decode only works with the default loader, but got "
+            "loader={}".format(loader)
+        )
+    return _FusedImageLoader(transform)
+
+
+class _FusedImageLoader:
+    """
+    Loads an image and applies :attr:`transform` on it, if the transform
+    starts with Resize or RandomResizedCrop, JPEG images are decoded at the
+    smallest 1/2, 1/4 or 1/8 scale which still provides the resolution of
+    the resized output.
+
+    For RandomResizedCrop, the crop is drawn from the size in the header
+    before decoding, and only the cropped region decides the scale, then
+    the region is cropped from the reduced image and resized.
+    """
+
+    def __init__(self, transform):
+        from paddle.vision.transforms import Compose, RandomResizedCrop, Resize
+
+        if transform is None:
+            transforms = []
+        elif isinstance(transform, Compose):
+            transforms = list(transform.transforms)
+        else:
+            transforms = [transform]
+
+        self.resize = None
+        self.crop = None
+        if transforms and isinstance(transforms[0], RandomResizedCrop):
+            self.crop = transforms.pop(0)
+        elif transforms and isinstance(transforms[0], Resize):
+            self.resize = transforms[0]
+        self.transform = Compose(transforms) if transforms else None
+
+    def _min_size(self, size, crop):
+        if self.crop is not None:
+            # the crop (i, j, h, w) is resized to self.crop.size
+            th, tw = self.crop.size
+            return (
+                math.ceil(tw * size[0] / crop[3]),
+                math.ceil(th * size[1] / crop[2]),
+            )
+        if self.resize is not None:
+            if isinstance(self.resize.size, int):
+                return self.resize.size, self.resize.size
+            th, tw = self.resize.size
+            return tw, th
+        return size
+
+    def _decode(self, path, image, scale, backend):
+        if backend == 'cv2':
+            cv2 = try_import('cv2')
+            flags = {
+                1: cv2.IMREAD_COLOR,
+                2: cv2.IMREAD_REDUCED_COLOR_2,
+                4: cv2.IMREAD_REDUCED_COLOR_4,
+                8: cv2.IMREAD_REDUCED_COLOR_8,
+            }
+            image = cv2.imread(path, flags[scale])
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        if scale > 1:
+            w, h = image.size
+            image.draft('RGB', (w // scale, h // scale))
+        return image.convert('RGB')
+
+    def __call__(self, path):
+        from paddle.vision import get_image_backend
+        from paddle.vision.transforms import functional as F
+
+        backend = get_image_backend()
+        with open(path, 'rb') as f:
+            # only the header is read by open
+            image = Image.open(f)
+            size = image.size
+            crop = None
+            if self.crop is not None:
+                crop = self.crop._dynamic_get_param(image)
+            scale = 1
+            if image.format == 'JPEG':
+                scale = _reduced_scale(size, self._min_size(size, crop))
+            image = self._decode(path, image, scale, backend)
+
+        if crop is not None:
+            i, j, h, w = crop
+            if scale > 1:
+                # map the crop into the reduced image
+                if backend == 'cv2':
+                    reduced_h, reduced_w = image.shape[:2]
+                else:
+                    reduced_w, reduced_h = image.size
+                scale_w = reduced_w / size[0]
+                scale_h = reduced_h / size[1]
+                i, j = int(i * scale_h), int(j * scale_w)
+                h = max(min(round(h * scale_h), reduced_h - i), 1)
+                w = max(min(round(w * scale_w), reduced_w - j), 1)
+            image = F.crop(image, i, j, h, w)
+            image = F.resize(image, self.crop.size, self.crop.interpolation)
+
+        if self.transform is not None:
+            image = self.transform(image)
+        return image
+
+
 class ImageFolder(Dataset):
     """A generic data loader where the samples are arranged in this way:
 
@@ -324,6 +620,13 @@ class ImageFolder(Dataset):
         is_valid_file (Callable, optional): A function that takes path of a file
             and check if the file is a valid file. Both :attr:`extensions` and
             :attr:`is_valid_file` should not be passed. Default: None.
+        fused_decode (bool, optional): Whether to decode JPEG images at a reduced size when :attr:`transform`
+            starts with ``Resize`` or ``RandomResizedCrop``, the image is downscaled by 1/2, 1/4 or 1/8 in
+            the decoder as long as the resized output keeps its resolution, and the random crop is drawn
+            before decoding. It can not be used with :attr:`loader`. Default: False.
+        cache_index (bool, optional): Whether to save the listing of :attr:`root` into an index file in
+            ~/.cache/paddle/dataset/folder/cache, only the directories modified since then are listed
+            again when the dataset is created again. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of ImageFolder.
@@ -430,6 +733,8 @@ class ImageFolder(Dataset):
         extensions=None,
         transform=None,
         is_valid_file=None,
+        fused_decode=False,
+        cache_index=False,
     ):
         self.root = root
         if extensions is None:
@@ -443,8 +748,14 @@ class ImageFolder(Dataset):
             def is_valid_file(x):
                 return has_valid_extension(x, extensions)
 
-        for root, _, fnames in sorted(os.walk(path, followlinks=True)):
-            for fname in sorted(fnames):
+        # see NOTE: [ directory index of folder datasets ]
+        tree = []
+        if os.path.isdir(path):
+            index = _DirectoryIndex(path, cache_index)
+            (tree,) = index.walk([''])
+            index.save()
+        for root, fnames in tree:
+            for fname in fnames:
                 f = os.path.join(root, fname)
                 if is_valid_file(f):
                     samples.append(f)
@@ -461,6 +772,7 @@ class ImageFolder(Dataset):
         self.extensions = extensions
         self.samples = samples
         self.transform = transform
+        self._fused_loader = _make_fused_loader(loader, transform, fused_decode)
 
     def __getitem__(self, index):
         """
@@ -471,9 +783,12 @@ class ImageFolder(Dataset):
             sample of specific index.
         """
         path = self.samples[index]
-        sample = self.loader(path)
-        if self.transform is not None:
-            sample = self.transform(sample)
+        if self._fused_loader is not None:
+            sample = self._fused_loader(path)
+        else:
+            sample = self.loader(path)
+            if self.transform is not None:
+                sample = self.transform(sample)
         return [sample]
 
     def __len__(self):
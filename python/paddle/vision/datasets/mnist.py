@@ -19,12 +19,33 @@ import numpy as np
 from PIL import Image
 
 import paddle
+from paddle.dataset.array_cache import cached_arrays
 from paddle.dataset.common import _check_exists_and_download
+from paddle.fluid.dataloader.collate import default_collate_fn
 from paddle.io import Dataset
 
 __all__ = []
 
 
+class _LazyImages:
+    """
+    uint8 images which are converted to float32 when indexed, so that
+    `MNIST.images` keeps returning float32 samples without holding a float32
+    copy of the dataset.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return _LazyImages(self.data[idx])
+        return self.data[idx].astype('float32')
+
+    def __len__(self):
+        return len(self.data)
+
+
 class MNIST(Dataset):
     """
     Implementation of `MNIST <http://yann.lecun.com/exdb/mnist/>`_ dataset.
@@ -42,6 +63,9 @@ class MNIST(Dataset):
             PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
             If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_vision_image_get_image_backend>`,
             default backend is 'pil'. Default: None.
+        use_cache (bool, optional): Whether to save the parsed images and labels
+            into a binary cache file in ~/.cache/paddle/dataset/mnist/cache, which is
+            memory-mapped instead of parsed when the dataset is created again. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of MNIST dataset.
@@ -109,6 +133,7 @@ class MNIST(Dataset):
         transform=None,
         download=True,
         backend=None,
+        use_cache=False,
     ):
         assert mode.lower() in [
             'train',
@@ -161,68 +186,74 @@ class MNIST(Dataset):
             )
 
         self.transform = transform
+        self.use_cache = use_cache
 
-        # read dataset into memory
+        # read dataset into memory, or map it from cache
         self._parse_dataset()
 
         self.dtype = paddle.get_default_dtype()
 
-    def _parse_dataset(self, buffer_size=100):
-        self.images = []
-        self.labels = []
+    def _parse_dataset(self):
+        if self.use_cache:
+            arrays = cached_arrays(
+                self.NAME,
+                [self.image_path, self.label_path],
+                self.mode,
+                self._read_arrays,
+            )
+        else:
+            arrays = self._read_arrays()
+        # images are kept as one uint8 array and converted per sample
+        self.images = _LazyImages(arrays['images'])
+        self.labels = arrays['labels']
+
+    def _uint8_images(self):
+        if isinstance(self.images, _LazyImages):
+            return self.images.data
+        return self.images
+
+    def _read_arrays(self):
         with gzip.GzipFile(self.image_path, 'rb') as image_file:
             img_buf = image_file.read()
-            with gzip.GzipFile(self.label_path, 'rb') as label_file:
-                lab_buf = label_file.read()
-
-                step_label = 0
-                offset_img = 0
-                # read from Big-endian
-                # get file info from magic byte
-                # image file : 16B
-                magic_byte_img = '>IIII'
-                magic_img, image_num, rows, cols = struct.unpack_from(
-                    magic_byte_img, img_buf, offset_img
-                )
-                offset_img += struct.calcsize(magic_byte_img)
-
-                offset_lab = 0
-                # label file : 8B
-                magic_byte_lab = '>II'
-                magic_lab, label_num = struct.unpack_from(
-                    magic_byte_lab, lab_buf, offset_lab
-                )
-                offset_lab += struct.calcsize(magic_byte_lab)
-
-                while True:
-                    if step_label >= label_num:
-                        break
-                    fmt_label = '>' + str(buffer_size) + 'B'
-                    labels = struct.unpack_from(fmt_label, lab_buf, offset_lab)
-                    offset_lab += struct.calcsize(fmt_label)
-                    step_label += buffer_size
-
-                    fmt_images = '>' + str(buffer_size * rows * cols) + 'B'
-                    images_temp = struct.unpack_from(
-                        fmt_images, img_buf, offset_img
-                    )
-                    images = np.reshape(
-                        images_temp, (buffer_size, rows * cols)
-                    ).astype('float32')
-                    offset_img += struct.calcsize(fmt_images)
-
-                    for i in range(buffer_size):
-                        self.images.append(images[i, :])
-                        self.labels.append(
-                            np.array([labels[i]]).astype('int64')
-                        )
+        with gzip.GzipFile(self.label_path, 'rb') as label_file:
+            lab_buf = label_file.read()
+
+        # read from Big-endian
+        # get file info from magic byte
+        # image file : 16B
+        magic_byte_img = '>IIII'
+        magic_img, image_num, rows, cols = struct.unpack_from(
+            magic_byte_img, img_buf, 0
+        )
+        # label file : 8B
+        magic_byte_lab = '>II'
+        magic_lab, label_num = struct.unpack_from(magic_byte_lab, lab_buf, 0)
+
+        # pixels and labels are single bytes, so they are read by one
+        # frombuffer instead of unpacking them sample by sample, images are
+        # a view of the decompressed buffer
+        images = np.frombuffer(
+            img_buf,
+            dtype=np.uint8,
+            count=image_num * rows * cols,
+            offset=struct.calcsize(magic_byte_img),
+        ).reshape([image_num, rows * cols])
+        labels = np.frombuffer(
+            lab_buf,
+            dtype=np.uint8,
+            count=label_num,
+            offset=struct.calcsize(magic_byte_lab),
+        ).reshape([label_num, 1])
+        return {'images': images, 'labels': labels.astype('int64')}
 
     def __getitem__(self, idx):
-        image, label = self.images[idx], self.labels[idx]
+        image, label = self._uint8_images()[idx], self.labels[idx]
         image = np.reshape(image, [28, 28])
 
         if self.backend == 'pil':
-            image = Image.fromarray(image.astype('uint8'), mode='L')
+            image = Image.fromarray(image.astype('uint8', copy=False), mode='L')
+        elif self.transform is not None:
+            image = image.astype('float32')
 
         if self.transform is not None:
             image = self.transform(image)
@@ -232,6 +263,19 @@ class MNIST(Dataset):
 
         return image.astype(self.dtype), label.astype('int64')
 
+    def __getitems__(self, indices):
+        # only samples of cv2 backend without transform are fetched by
+        # indexing in batch, e.g. subclasses overriding __getitem__ are not
+        if (
+            type(self).__getitem__ is not MNIST.__getitem__
+            or self.backend == 'pil'
+            or self.transform is not None
+        ):
+            return default_collate_fn([self[idx] for idx in indices])
+        indices = np.asarray(indices, dtype='int64')
+        images = self._uint8_images()[indices].reshape([-1, 28, 28])
+        return [images.astype(self.dtype), self.labels[indices]]
+
     def __len__(self):
         return len(self.labels)
 
@@ -253,6 +297,9 @@ class FashionMNIST(MNIST):
             PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
             If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_vision_image_get_image_backend>`,
             default backend is 'pil'. Default: None.
+        use_cache (bool, optional): Whether to save the parsed images and labels
+            into a binary cache file in ~/.cache/paddle/dataset/fashion-mnist/cache, which is
+            memory-mapped instead of parsed when the dataset is created again. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of FashionMNIST dataset.
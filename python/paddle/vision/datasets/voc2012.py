@@ -19,6 +19,7 @@ import numpy as np
 from PIL import Image
 
 import paddle
+from paddle.dataset.array_cache import cached_arrays, pack_bytes, unpack_bytes
 from paddle.dataset.common import _check_exists_and_download
 from paddle.io import Dataset
 
@@ -50,6 +51,9 @@ class VOC2012(Dataset):
             PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
             If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_vision_image_get_image_backend>`,
             default backend is 'pil'. Default: None.
+        use_cache (bool, optional): Whether to save the encoded images and labels of :attr:`mode`
+            into a binary cache file in ~/.cache/paddle/dataset/voc2012/cache, which is memory-mapped
+            when the dataset is created again, instead of reading :attr:`data_file`. Default: False.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of VOC2012 dataset.
@@ -110,6 +114,7 @@ class VOC2012(Dataset):
         transform=None,
         download=True,
         backend=None,
+        use_cache=False,
     ):
         assert mode.lower() in [
             'train',
@@ -138,13 +143,40 @@ class VOC2012(Dataset):
                 data_file, VOC_URL, VOC_MD5, CACHE_DIR, download
             )
         self.transform = transform
+        self.use_cache = use_cache
 
-        # read dataset into memory
+        # read dataset into memory, or map it from cache
         self._load_anno()
 
         self.dtype = paddle.get_default_dtype()
 
     def _load_anno(self):
+        if self.use_cache:
+            arrays = cached_arrays(
+                CACHE_DIR, [self.data_file], self.flag, self._read_arrays
+            )
+            self.data_tar = None
+            self.images = arrays['images']
+            self.image_offsets = arrays['image_offsets']
+            self.label_images = arrays['label_images']
+            self.label_offsets = arrays['label_offsets']
+            self._set_files(
+                [
+                    unpack_bytes(arrays['ids'], arrays['id_offsets'], i)
+                    for i in range(len(arrays['id_offsets']) - 1)
+                ]
+            )
+        else:
+            self._open_anno()
+            self.images = None
+
+    def _set_files(self, ids):
+        # member names of images and labels in data_file
+        self.ids = ids
+        self.data = [DATA_FILE.format(i.decode('utf-8')) for i in ids]
+        self.labels = [LABEL_FILE.format(i.decode('utf-8')) for i in ids]
+
+    def _open_anno(self):
         self.name2mem = {}
         self.data_tar = tarfile.open(self.data_file)
         for ele in self.data_tar.getmembers():
@@ -152,23 +184,39 @@ class VOC2012(Dataset):
 
         set_file = SET_FILE.format(self.flag)
         sets = self.data_tar.extractfile(self.name2mem[set_file])
+        self._set_files([line.strip() for line in sets])
 
-        self.data = []
-        self.labels = []
-
-        for line in sets:
-            line = line.strip()
-            data = DATA_FILE.format(line.decode('utf-8'))
-            label = LABEL_FILE.format(line.decode('utf-8'))
-            self.data.append(data)
-            self.labels.append(label)
+    def _read_arrays(self):
+        self._open_anno()
+        try:
+            images, image_offsets = pack_bytes(
+                [self._read_member(name) for name in self.data]
+            )
+            label_images, label_offsets = pack_bytes(
+                [self._read_member(name) for name in self.labels]
+            )
+            ids, id_offsets = pack_bytes(self.ids)
+        finally:
+            self.data_tar.close()
+        return {
+            'ids': ids,
+            'id_offsets': id_offsets,
+            'images': images,
+            'image_offsets': image_offsets,
+            'label_images': label_images,
+            'label_offsets': label_offsets,
+        }
+
+    def _read_member(self, name):
+        return self.data_tar.extractfile(self.name2mem[name]).read()
 
     def __getitem__(self, idx):
-        data_file = self.data[idx]
-        label_file = self.labels[idx]
-
-        data = self.data_tar.extractfile(self.name2mem[data_file]).read()
-        label = self.data_tar.extractfile(self.name2mem[label_file]).read()
+        if self.images is not None:
+            data = unpack_bytes(self.images, self.image_offsets, idx)
+            label = unpack_bytes(self.label_images, self.label_offsets, idx)
+        else:
+            data = self._read_member(self.data[idx])
+            label = self._read_member(self.labels[idx])
         data = Image.open(io.BytesIO(data))
         label = Image.open(io.BytesIO(label))
 
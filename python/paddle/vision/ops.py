@@ -1870,9 +1870,11 @@ def nms(
 
     If scores are provided, input boxes will be sorted by their scores firstly.
 
-    If category_idxs and categories are provided, NMS will be performed with a batched style,
+    If category_idxs is provided, NMS will be performed with a batched style,
     which means NMS will be applied to each category respectively and results of each category
-    will be concated and sorted by scores.
+    will be concated and sorted by scores. All categories are computed by one call of the NMS kernel,
+    boxes of a batch of images can also be computed in one call by concatenating them and using
+    ``image_id * num_categories + category_id`` as category_idxs.
 
     If K is provided, only the first k elements will be returned. Otherwise, all box indices sorted by scores will be returned.
 
@@ -1887,7 +1889,8 @@ def nms(
             shape of [num_boxes]. The data type is float32 or float64. Default: None.
         category_idxs(Tensor, optional): Category indices corresponding to boxes.
             it's a 1D-Tensor with shape of [num_boxes]. The data type is int64. Default: None.
-        categories(List, optional): A list of unique id of all categories. The data type is int64. Default: None.
+        categories(List, optional): A list of unique id of all categories. The data type is int64. If it is provided, only boxes
+            belonging to these categories are kept. Default: None, which means all categories in category_idxs.
         top_k(int64, optional): The top K boxes who has higher score and kept by NMS preds to
             consider. top_k should be smaller equal than num_boxes. Default: None.
 
@@ -1961,62 +1964,40 @@ def nms(
         assert (
             top_k <= scores.shape[0]
         ), "top_k should be smaller equal than the number of boxes"
-    assert (
-        categories is not None
-    ), "if category_idxs is given, categories which is a list of unique id of all categories is necessary"
 
-    mask = paddle.zeros_like(scores, dtype=paddle.int32)
-
-    for category_id in categories:
-        cur_category_boxes_idxs = paddle.where(category_idxs == category_id)[0]
-        shape = cur_category_boxes_idxs.shape[0]
-        cur_category_boxes_idxs = paddle.reshape(
-            cur_category_boxes_idxs, [shape]
-        )
-        if shape == 0:
-            continue
-        elif shape == 1:
-            mask[cur_category_boxes_idxs] = 1
-            continue
-        cur_category_boxes = boxes[cur_category_boxes_idxs]
-        cur_category_scores = scores[cur_category_boxes_idxs]
-        cur_category_sorted_indices = paddle.argsort(
-            cur_category_scores, descending=True
-        )
-        cur_category_sorted_boxes = cur_category_boxes[
-            cur_category_sorted_indices
-        ]
-
-        cur_category_keep_boxes_sub_idxs = cur_category_sorted_indices[
-            _nms(cur_category_sorted_boxes, iou_threshold)
-        ]
-
-        updates = paddle.ones_like(
-            cur_category_boxes_idxs[cur_category_keep_boxes_sub_idxs],
-            dtype=paddle.int32,
-        )
-        mask = paddle.scatter(
-            mask,
-            cur_category_boxes_idxs[cur_category_keep_boxes_sub_idxs],
-            updates,
-            overwrite=True,
+    if in_dygraph_mode() and boxes.shape[0] == 0:
+        return paddle.zeros([0], dtype='int64')
+
+    # NOTE: boxes of each category are moved by an offset larger than the
+    # range of all coordinates, so that boxes of different categories never
+    # overlap, and NMS of all categories is done by one call of the kernel
+    # instead of a loop over categories. Boxes are shifted in float64, the
+    # offsets of float32 are too coarse to keep the IoU of shifted boxes.
+    boxes_fp64 = boxes.astype('float64')
+    min_coordinate = paddle.min(boxes_fp64)
+    coordinate_range = paddle.max(boxes_fp64) - min_coordinate + 1
+    offsets = (category_idxs - paddle.min(category_idxs)).astype(
+        'float64'
+    ) * coordinate_range
+    shifted_boxes = boxes_fp64 - min_coordinate + offsets.unsqueeze(1)
+
+    sorted_global_indices = paddle.argsort(scores, descending=True)
+    keep_boxes_idxs = sorted_global_indices[
+        _nms(shifted_boxes[sorted_global_indices], iou_threshold)
+    ]
+
+    if categories is not None:
+        # boxes not belonging to given categories are dropped
+        categories = paddle.assign(np.asarray(categories).astype('int64'))
+        keep_categories = category_idxs[keep_boxes_idxs].astype('int64')
+        in_categories = paddle.any(
+            keep_categories.unsqueeze(1) == categories.unsqueeze(0), axis=1
         )
-    keep_boxes_idxs = paddle.where(mask)[0]
-    shape = keep_boxes_idxs.shape[0]
-    keep_boxes_idxs = paddle.reshape(keep_boxes_idxs, [shape])
-    sorted_sub_indices = paddle.argsort(
-        scores[keep_boxes_idxs], descending=True
-    )
+        keep_boxes_idxs = paddle.masked_select(keep_boxes_idxs, in_categories)
 
     if top_k is None:
-        return keep_boxes_idxs[sorted_sub_indices]
-
-    if in_dygraph_mode():
-        top_k = shape if shape < top_k else top_k
-        _, topk_sub_indices = paddle.topk(scores[keep_boxes_idxs], top_k)
-        return keep_boxes_idxs[topk_sub_indices]
-
-    return keep_boxes_idxs[sorted_sub_indices][:top_k]
+        return keep_boxes_idxs
+    return keep_boxes_idxs[:top_k]
 
 
 def generate_proposals(
@@ -14,6 +14,7 @@
 
 from .transforms import BaseTransform  # noqa: F401
 from .transforms import Compose  # noqa: F401
+from .transforms import BatchCompose  # noqa: F401
 from .transforms import Resize  # noqa: F401
 from .transforms import RandomResizedCrop  # noqa: F401
 from .transforms import CenterCrop  # noqa: F401
@@ -54,6 +55,7 @@ from .functional import erase  # noqa: F401
 __all__ = [  # noqa
     'BaseTransform',
     'Compose',
+    'BatchCompose',
     'Resize',
     'RandomResizedCrop',
     'CenterCrop',
@@ -21,6 +21,7 @@ from collections.abc import Iterable, Sequence
 import numpy as np
 
 import paddle
+from paddle.fluid.dataloader.collate import default_collate_fn
 
 from . import functional as F
 
@@ -130,6 +131,173 @@ class Compose:
         return format_string
 
 
+class BatchCompose:
+    """
+    Composes several transforms together and applies them on a batch of
+    images at once. Random parameters are drawn for all samples of the batch
+    by numpy, and transforms which support batch mode (RandomCrop, CenterCrop,
+    RandomHorizontalFlip, RandomVerticalFlip, Normalize, ToTensor) transform
+    the whole batch with vectorized operations, other transforms are applied
+    sample by sample. A ToTensor followed by a Normalize is fused into one
+    pass over the batch.
+
+    It is used as the ``collate_fn`` of :ref:`api_paddle_io_DataLoader` by
+    :attr:`collate`, which transforms the batch after collating, so that the
+    dataset only needs to return uint8 images of the same shape.
+
+    Args:
+        transforms (list|tuple): List/Tuple of transforms to compose.
+        index (int|str, optional): Index or key of images field in the collated
+            batch. Default: 0.
+        collate_fn (callable, optional): Function to collate samples before
+            transforming, default ``paddle.io.DataLoader`` collate function will
+            be used if it is None. Default: None.
+
+    Shape:
+        - images(np.ndarray): The input images with shape (N x H x W x C).
+        - output(np.ndarray): The transformed images, transforms return
+          ``np.ndarray`` instead of ``paddle.Tensor`` in batch mode, which is
+          converted to ``paddle.Tensor`` by DataLoader.
+
+    Returns:
+        A callable object of BatchCompose.
+
+    Examples:
+
+        .. code-block:: python
+
+            import numpy as np
+            import paddle
+            from paddle.vision.transforms import (
+                BatchCompose, Normalize, RandomCrop, RandomHorizontalFlip,
+                ToTensor
+            )
+
+            transform = BatchCompose(
+                [
+                    RandomCrop(24, padding=2),
+                    RandomHorizontalFlip(),
+                    ToTensor(),
+                    Normalize(mean=[0.5, 0.5, 0.5], std=[0.5, 0.5, 0.5]),
+                ]
+            )
+
+            images = np.random.randint(0, 256, (8, 28, 28, 3), dtype=np.uint8)
+            print(transform(images).shape)
+            # (8, 3, 24, 24)
+
+            class RandomDataset(paddle.io.Dataset):
+                def __getitem__(self, idx):
+                    image = np.random.randint(0, 256, (28, 28, 3), dtype=np.uint8)
+                    return image, np.array([idx % 10])
+
+                def __len__(self):
+                    return 16
+
+            loader = paddle.io.DataLoader(
+                RandomDataset(), batch_size=8, collate_fn=transform.collate
+            )
+            for images, labels in loader:
+                print(images.shape)
+                # [8, 3, 24, 24]
+    """
+
+    def __init__(self, transforms, index=0, collate_fn=None):
+        self.transforms = transforms
+        self.index = index
+        self.collate_fn = collate_fn
+        self._stages = self._fuse(transforms)
+
+    @staticmethod
+    def _fuse(transforms):
+        stages = []
+        for t in transforms:
+            if (
+                isinstance(t, Normalize)
+                and stages
+                and isinstance(stages[-1], ToTensor)
+                and stages[-1].data_format == t.data_format
+            ):
+                stages[-1] = _ToTensorNormalize(stages[-1], t)
+            else:
+                stages.append(t)
+        return stages
+
+    def __call__(self, images):
+        for f in self._stages:
+            try:
+                if isinstance(f, BaseTransform):
+                    images = f._apply_batch(images)
+                else:
+                    # plain callables are applied sample by sample
+                    images = np.stack(
+                        [np.asarray(f(image)) for image in images]
+                    )
+            except Exception as e:
+                stack_info = traceback.format_exc()
+                print(
+                    "fail to perform batch transform [{}] with error: "
+                    "{} and stack:\n{}".format(f, e, str(stack_info))
+                )
+                raise e
+        return images
+
+    def collate(self, batch):
+        """
+        Collates a list of samples and transforms the images field of it.
+        """
+        collate_fn = self.collate_fn or default_collate_fn
+        batch = collate_fn(batch)
+        if isinstance(batch, np.ndarray):
+            return self(batch)
+        batch = dict(batch) if isinstance(batch, dict) else list(batch)
+        batch[self.index] = self(batch[self.index])
+        return batch
+
+    def __repr__(self):
+        format_string = self.__class__.__name__ + '('
+        for t in self.transforms:
+            format_string += '\n'
+            format_string += '    {0}'.format(t)
+        format_string += '\n)'
+        return format_string
+
+
+def _pad_batch(images, padding, fill=0, padding_mode='constant'):
+    # same padding arguments as F.pad, on images with shape (N, H, W, C)
+    if isinstance(padding, numbers.Number):
+        padding = (padding,) * 4
+    elif len(padding) == 2:
+        padding = (padding[0], padding[1], padding[0], padding[1])
+    pad_left, pad_top, pad_right, pad_bottom = (int(p) for p in padding)
+    if padding_mode != 'constant':
+        return np.pad(
+            images,
+            ((0, 0), (pad_top, pad_bottom), (pad_left, pad_right), (0, 0)),
+            mode=padding_mode,
+        )
+    n, h, w, c = images.shape
+    padded = np.empty(
+        [n, h + pad_top + pad_bottom, w + pad_left + pad_right, c],
+        dtype=images.dtype,
+    )
+    # fill may be a value for each channel
+    padded[...] = np.asarray(fill, dtype=images.dtype)
+    padded[:, pad_top : pad_top + h, pad_left : pad_left + w] = images
+    return padded
+
+
+def _crop_batch(images, top, left, height, width):
+    # crop a (height, width) patch at (top[k], left[k]) of each image k,
+    # copying slices is much faster than gathering pixels by fancy index
+    cropped = np.empty(
+        (len(images), height, width) + images.shape[3:], dtype=images.dtype
+    )
+    for k, (i, j) in enumerate(zip(top, left)):
+        cropped[k] = images[k, i : i + height, j : j + width]
+    return cropped
+
+
 class BaseTransform:
     """
     Base class of all transforms used in computer vision.
@@ -292,6 +460,23 @@ class BaseTransform:
     def _apply_mask(self, mask):
         raise NotImplementedError
 
+    def _apply_batch(self, images):
+        """Apply transform on a batch of images, used by ``BatchCompose``"""
+        self.params = self._get_batch_params(images)
+        return self._apply_batch_image(images)
+
+    def _get_batch_params(self, images):
+        pass
+
+    def _apply_batch_image(self, images):
+        # transforms without batch mode are applied sample by sample, with
+        # the params of each sample
+        outputs = []
+        for image in images:
+            self.params = self._get_params((image,))
+            outputs.append(np.asarray(self._apply_image(image)))
+        return np.stack(outputs)
+
 
 class ToTensor(BaseTransform):
     """Convert a ``PIL.Image`` or ``numpy.ndarray`` to ``paddle.Tensor``.
@@ -358,6 +543,16 @@ class ToTensor(BaseTransform):
         """
         return F.to_tensor(img, self.data_format)
 
+    def _apply_batch_image(self, images):
+        images = np.asarray(images)
+        if images.ndim == 3:
+            images = images[..., np.newaxis]
+        if self.data_format == 'CHW':
+            images = images.transpose((0, 3, 1, 2))
+        if images.dtype == np.uint8:
+            return np.multiply(images, np.float32(1 / 255.0), dtype='float32')
+        return np.ascontiguousarray(images)
+
 
 class Resize(BaseTransform):
     """Resize the input Image to the given size.
@@ -672,6 +867,13 @@ class CenterCrop(BaseTransform):
     def _apply_image(self, img):
         return F.center_crop(img, self.size)
 
+    def _apply_batch_image(self, images):
+        h, w = images.shape[1:3]
+        th, tw = self.size
+        i = int(round((h - th) / 2.0))
+        j = int(round((w - tw) / 2.0))
+        return images[:, i : i + th, j : j + tw]
+
 
 class RandomHorizontalFlip(BaseTransform):
     """Horizontally flip the input data randomly with a given probability.
@@ -726,6 +928,15 @@ class RandomHorizontalFlip(BaseTransform):
             lambda: img,
         )
 
+    def _get_batch_params(self, images):
+        return np.random.random(len(images)) < self.prob
+
+    def _apply_batch_image(self, images):
+        flip = self.params
+        images = np.array(images)
+        images[flip] = images[flip, :, ::-1]
+        return images
+
 
 class RandomVerticalFlip(BaseTransform):
     """Vertically flip the input data randomly with a given probability.
@@ -781,6 +992,15 @@ class RandomVerticalFlip(BaseTransform):
             lambda: img,
         )
 
+    def _get_batch_params(self, images):
+        return np.random.random(len(images)) < self.prob
+
+    def _apply_batch_image(self, images):
+        flip = self.params
+        images = np.array(images)
+        images[flip] = images[flip, ::-1]
+        return images
+
 
 class Normalize(BaseTransform):
     """Normalize the input data with mean and standard deviation.
@@ -844,6 +1064,71 @@ class Normalize(BaseTransform):
             img, self.mean, self.std, self.data_format, self.to_rgb
         )
 
+    def _apply_batch_image(self, images):
+        images = np.asarray(images)
+        shape = [1, -1, 1, 1] if self.data_format == 'CHW' else [1, 1, 1, -1]
+        mean = np.float32(np.array(self.mean).reshape(shape))
+        std = np.float32(np.array(self.std).reshape(shape))
+        if self.to_rgb:
+            channel_axis = 1 if self.data_format == 'CHW' else -1
+            images = np.flip(images, axis=channel_axis)
+        return (images - mean) / std
+
+
+class _ToTensorNormalize(BaseTransform):
+    """
+    ToTensor followed by Normalize in batch mode, the scaling of ToTensor
+    and the normalization are folded into one ``x * scale + bias`` for each
+    channel, which is computed into the transposed output in one pass.
+    """
+
+    def __init__(self, to_tensor, normalize):
+        super().__init__()
+        self.to_tensor = to_tensor
+        self.normalize = normalize
+
+    def _apply_image(self, img):
+        return self.normalize(self.to_tensor(img))
+
+    def _apply_batch_image(self, images):
+        images = np.asarray(images)
+        if images.ndim == 3:
+            images = images[..., np.newaxis]
+        num_channels = images.shape[-1]
+        mean = np.array(self.normalize.mean, dtype='float64')
+        std = np.array(self.normalize.std, dtype='float64')
+        if len(mean) != num_channels or len(std) != num_channels:
+            return self.normalize._apply_batch(
+                self.to_tensor._apply_batch(images)
+            )
+
+        scale = 1.0 / std
+        if images.dtype == np.uint8:
+            scale /= 255.0
+        bias = -mean / std
+        n, h, w, c = images.shape
+        if self.to_tensor.data_format == 'CHW':
+            output = np.empty([n, c, h, w], dtype='float32')
+            output_channels = [output[:, k] for k in range(c)]
+        else:
+            output = np.empty([n, h, w, c], dtype='float32')
+            output_channels = [output[..., k] for k in range(c)]
+        for k, output_channel in enumerate(output_channels):
+            source = c - 1 - k if self.normalize.to_rgb else k
+            np.multiply(
+                images[..., source],
+                np.float32(scale[k]),
+                out=output_channel,
+                casting='unsafe',
+            )
+            output_channel += np.float32(bias[k])
+        return output
+
+    def __repr__(self):
+        return '{}({}, {})'.format(
+            self.__class__.__name__, self.to_tensor, self.normalize
+        )
+
 
 class Transpose(BaseTransform):
     """Transpose input data to a target format.
@@ -1285,6 +1570,33 @@ class RandomCrop(BaseTransform):
 
         return F.crop(img, i, j, h, w)
 
+    def _apply_batch_image(self, images):
+        images = np.asarray(images)
+        if self.padding is not None:
+            images = _pad_batch(
+                images, self.padding, self.fill, self.padding_mode
+            )
+
+        h, w = images.shape[1:3]
+        # pad the width if needed
+        if self.pad_if_needed and w < self.size[1]:
+            images = _pad_batch(
+                images, (self.size[1] - w, 0), self.fill, self.padding_mode
+            )
+        # pad the height if needed
+        if self.pad_if_needed and h < self.size[0]:
+            images = _pad_batch(
+                images, (0, self.size[0] - h), self.fill, self.padding_mode
+            )
+
+        h, w = images.shape[1:3]
+        th, tw = self.size
+        if h == th and w == tw:
+            return images
+        top = np.random.randint(0, h - th + 1, size=len(images))
+        left = np.random.randint(0, w - tw + 1, size=len(images))
+        return _crop_batch(images, top, left, th, tw)
+
 
 class Pad(BaseTransform):
     """Pads the given CV Image on all sides with the given "pad" value.